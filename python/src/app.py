@@ -1,109 +1,306 @@
+import asyncio
+import json
 import os
-from typing import Any, Dict
-
-from fastapi import FastAPI
-from fastapi.responses import JSONResponse
-from .endpoints.status import check_status
-from .endpoints.health import check_health
-from .endpoints.db_query import db_query as run_db_query
-from .endpoints.db_insert import db_insert as run_db_insert
-from .endpoints.db_update import db_update as run_db_update
-from .endpoints.db_delete import db_delete as run_db_delete
-from .endpoints.db_nl_query import db_nl_query as run_db_nl_query
-from .endpoints.flows_trigger_json import trigger_flow_json as run_trigger_flow_json
-from .endpoints.flows_metrics import get_flows_metrics as run_get_flows_metrics
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from .async_client import close_async_clients
+from .batch_trigger import DEFAULT_CONCURRENCY as DEFAULT_TRIGGER_CONCURRENCY, TriggerBatchReport, iter_triggers, trigger_batch
+from .latency import get_latency_recorder
+from .nl_cache import warm_nl_cache
+from .outbox import OutboxDispatcher, close_outboxes
+from .pagination import DEFAULT_PAGE_SIZE, aiter_query_pages
+from .retention import RetentionScheduler
+from .tracker import WorkflowTracker
+from .trigger_scheduler import get_trigger_scheduler
+from .webhooks import InvalidCallbackError, WebhookVerificationError, handle_completion
+from .returning import ReturnMode
+from .endpoints.status import check_status_async
+from .endpoints.health import check_health_async
+from .endpoints.db_query import db_query_async as run_db_query
+from .endpoints.db_insert import db_insert_async as run_db_insert
+from .endpoints.db_update import db_update_async as run_db_update
+from .endpoints.db_delete import OLD_COMPLETED_TASKS, db_delete_async as run_db_delete
+from .endpoints.db_nl_query import WARMUP_QUESTIONS, db_nl_query_async as run_db_nl_query
+from .endpoints.flows_trigger_json import queue_ecommerce_order, trigger_flow_json_async as run_trigger_flow_json
+from .endpoints.flows_metrics import get_flows_metrics_async as run_get_flows_metrics
 from .endpoints.flows_file import (
-    trigger_flow_with_file as run_trigger_flow_with_file,
-    trigger_flow_with_url as run_trigger_flow_with_url,
+    trigger_flow_with_file_async as run_trigger_flow_with_file,
+    trigger_flow_with_url_async as run_trigger_flow_with_url,
 )
-app = FastAPI(title="WorqHat Python Examples")
+
+
+# Scheduled purges are opt-in: set WORQHAT_RETENTION_ENABLED=1
+retention = RetentionScheduler([OLD_COMPLETED_TASKS])
+# Sends queued triggers from the local outbox; set WORQHAT_OUTBOX_ENABLED=1
+outbox_dispatcher = OutboxDispatcher()
+# One shared poller for every analytics_id this process is waiting on. When
+# completion webhooks are configured, set WORQHAT_TRACKER_POLL=0 to rely on them alone.
+tracker = WorkflowTracker(poll=os.environ.get("WORQHAT_TRACKER_POLL", "1") == "1")
+# Longest a GET /flows/track request may hold its connection
+MAX_TRACK_WAIT = float(os.environ.get("WORQHAT_TRACK_MAX_WAIT", "30"))
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # NL warmup is opt-in: set WORQHAT_NL_WARMUP_ENABLED=1, and optionally
+    # WORQHAT_NL_WARMUP_FILE to a JSON list of {"question", "table"}
+    _app.state.nl_warmup = None
+    if os.environ.get("WORQHAT_NL_WARMUP_ENABLED") == "1":
+        # A missing or malformed file shows up in the report rather than stopping startup
+        _app.state.nl_warmup = await warm_nl_cache(os.environ.get("WORQHAT_NL_WARMUP_FILE") or WARMUP_QUESTIONS)
+    if os.environ.get("WORQHAT_RETENTION_ENABLED") == "1":
+        retention.start()
+    if os.environ.get("WORQHAT_OUTBOX_ENABLED") == "1":
+        outbox_dispatcher.start()
+    # Idle until something is tracked
+    tracker.start()
+    yield
+    await tracker.stop()
+    await retention.stop()
+    await outbox_dispatcher.stop()
+    close_outboxes()
+    # Release pooled async connections on shutdown
+    await close_async_clients()
+
+
+app = FastAPI(title="WorqHat Python Examples", lifespan=lifespan)
+
+
+async def ndjson_rows(pages: AsyncIterator[List[Any]]) -> AsyncIterator[str]:
+    """Encode rows as NDJSON as each page arrives; a failure becomes a final error line."""
+    try:
+        async for page in pages:
+            yield "".join(json.dumps(jsonable_encoder(row)) + "\n" for row in page)
+    except Exception as e:
+        yield json.dumps({"error": str(e)}) + "\n"
 
 
 @app.get("/status")
-def status() -> Any:
+async def status() -> Any:
     try:
-        return JSONResponse(content=check_status())
+        return JSONResponse(content=jsonable_encoder(await check_status_async()))
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 
 @app.get("/health")
-def health() -> Any:
+async def health() -> Any:
     try:
-        return JSONResponse(content=check_health())
+        return JSONResponse(content=jsonable_encoder(await check_health_async()))
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 
 @app.get("/db/query")
-def db_query() -> Any:
+async def db_query(stream: bool = False, page_size: int = DEFAULT_PAGE_SIZE) -> Any:
     try:
-        query = "SELECT * FROM customer_management_data WHERE customer_type = 'individual' LIMIT 10"
-        return JSONResponse(content=run_db_query(query))
+        query = "SELECT * FROM customer_management_data WHERE customer_type = 'individual'"
+        if stream:
+            # ?stream=true emits every matching row, one JSON row per line, keyed by documentId so pages never overlap
+            pages = aiter_query_pages(query, page_size=page_size, key_column="documentId")
+            return StreamingResponse(ndjson_rows(pages), media_type="application/x-ndjson")
+        return JSONResponse(content=jsonable_encoder(await run_db_query(f"{query} LIMIT 10")))
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 
 @app.get("/db/insert")
-def db_insert() -> Any:
+async def db_insert() -> Any:
     try:
-        return JSONResponse(content=run_db_insert())
+        return JSONResponse(content=jsonable_encoder(await run_db_insert()))
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 
 @app.get("/db/update")
-def db_update() -> Any:
+async def db_update(returning: ReturnMode = "rows") -> Any:
     try:
-        return JSONResponse(content=run_db_update())
+        # ?returning=count or ?returning=ids skips sending back every updated record
+        return JSONResponse(content=jsonable_encoder(await run_db_update(returning)))
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 
 @app.get("/db/delete")
-def db_delete() -> Any:
+async def db_delete(returning: ReturnMode = "rows") -> Any:
     try:
-        return JSONResponse(content=run_db_delete())
+        return JSONResponse(content=jsonable_encoder(await run_db_delete(returning)))
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 
 @app.get("/db/nl-query")
-def db_nl_query() -> Any:
+async def db_nl_query() -> Any:
     try:
-        return JSONResponse(content=run_db_nl_query())
+        return JSONResponse(content=jsonable_encoder(await run_db_nl_query()))
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 
+@app.get("/db/nl-query/warmup")
+async def db_nl_query_warmup() -> Any:
+    return JSONResponse(content=jsonable_encoder(getattr(app.state, "nl_warmup", None)))
+
+
 @app.get("/flows/trigger-json")
-def flows_trigger_json() -> Any:
+async def flows_trigger_json() -> Any:
+    try:
+        return JSONResponse(content=jsonable_encoder(await run_trigger_flow_json()))
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+
+@app.get("/flows/trigger-json/outbox")
+async def flows_trigger_json_outbox() -> Any:
+    if not outbox_dispatcher.running:
+        # Nothing would ever send the queued trigger
+        return JSONResponse(status_code=503, content={"error": "Outbox dispatcher is not running; set WORQHAT_OUTBOX_ENABLED=1"})
+    try:
+        # Returns once the trigger is committed locally; the dispatcher sends it
+        outbox_id = queue_ecommerce_order()
+        outbox_dispatcher.wake()
+        return JSONResponse(content={"outbox_id": outbox_id})
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+
+@app.get("/flows/outbox")
+async def flows_outbox() -> Any:
     try:
-        return JSONResponse(content=run_trigger_flow_json())
+        return JSONResponse(content=jsonable_encoder({
+            **outbox_dispatcher.outbox.stats(),
+            "dispatched": {
+                "sent": outbox_dispatcher.sent,
+                "retried": outbox_dispatcher.retried,
+                "dead": outbox_dispatcher.dead,
+            },
+        }))
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 
+class BulkTrigger(BaseModel):
+    workflow_id: str
+    payload: Dict[str, Any]
+
+
+async def ndjson_triggers(triggers: List[BulkTrigger], concurrency: int, track: bool) -> AsyncIterator[str]:
+    """One line per trigger as it settles, then a final ``{"summary": ...}`` line."""
+    report = TriggerBatchReport()
+    pairs = ((trigger.workflow_id, trigger.payload) for trigger in triggers)
+    async for result in iter_triggers(pairs, concurrency=concurrency, report=report):
+        if track and result.analytics_id:
+            tracker.track(result.analytics_id, result.workflow_id)
+        yield json.dumps(jsonable_encoder(result)) + "\n"
+    yield json.dumps({"summary": report.summary()}) + "\n"
+
+
+@app.post("/flows/trigger-json/bulk")
+async def flows_trigger_json_bulk(
+    triggers: List[BulkTrigger],
+    stream: bool = True,
+    concurrency: int = DEFAULT_TRIGGER_CONCURRENCY,
+    track: bool = False,
+) -> Any:
+    try:
+        if stream:
+            # analytics_ids arrive as NDJSON while the rest of the batch is still running
+            return StreamingResponse(ndjson_triggers(triggers, concurrency, track), media_type="application/x-ndjson")
+        report = await trigger_batch(((t.workflow_id, t.payload) for t in triggers), concurrency=concurrency)
+        if track:
+            for result in report.results:
+                if result.analytics_id:
+                    tracker.track(result.analytics_id, result.workflow_id)
+        return JSONResponse(content=jsonable_encoder({"summary": report.summary(), "results": report.results}))
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"error": str(e)})
+
+
+@app.get("/flows/track/{analytics_id}")
+async def flows_track(analytics_id: str, wait: float = 0.0) -> Any:
+    # Only runs this process triggered (or was told about) can be looked up, so
+    # arbitrary ids can't fill the tracker
+    run = tracker.get(analytics_id)
+    if run is None:
+        return JSONResponse(status_code=404, content={"error": f"Run {analytics_id} is not tracked"})
+    # ?wait=30 holds the request until the run finishes or 30s pass, at most MAX_TRACK_WAIT
+    wait = min(max(wait, 0.0), MAX_TRACK_WAIT)
+    if wait > 0 and not run.done:
+        try:
+            run = await tracker.wait(analytics_id, timeout=wait)
+        except asyncio.TimeoutError:
+            pass
+    return JSONResponse(content=jsonable_encoder(run))
+
+
+@app.post("/webhooks/workflow-complete")
+async def workflow_complete(request: Request) -> Any:
+    secret = os.environ.get("WORQHAT_WEBHOOK_SECRET")
+    if not secret:
+        return JSONResponse(status_code=503, content={"error": "WORQHAT_WEBHOOK_SECRET is not set"})
+    try:
+        # Resolves anyone waiting on this analytics_id in this process
+        resolved = handle_completion(await request.body(), request.headers, secret, tracker)
+    except WebhookVerificationError as e:
+        return JSONResponse(status_code=401, content={"error": str(e)})
+    except InvalidCallbackError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+    return JSONResponse(content={"resolved": resolved})
+
+
+@app.get("/flows/tracker")
+async def flows_tracker() -> Any:
+    return JSONResponse(content=jsonable_encoder(tracker.stats()))
+
+
+@app.get("/flows/scheduler")
+async def flows_scheduler() -> Any:
+    return JSONResponse(content=jsonable_encoder(get_trigger_scheduler().stats()))
+
+
 @app.get("/flows/metrics")
-def flows_metrics() -> Any:
+async def flows_metrics() -> Any:
     try:
-        return JSONResponse(content=run_get_flows_metrics())
+        return JSONResponse(content=jsonable_encoder(await run_get_flows_metrics()))
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 
 @app.get("/flows/file-url")
-def flows_file_url() -> Any:
+async def flows_file_url() -> Any:
     try:
-        return JSONResponse(content=run_trigger_flow_with_url())
+        return JSONResponse(content=jsonable_encoder(await run_trigger_flow_with_url()))
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
 
 
 @app.get("/flows/file-upload")
-def flows_file_upload() -> Any:
+async def flows_file_upload() -> Any:
     try:
         # Place an image at python/src/image.png to test file upload
-        return JSONResponse(content=run_trigger_flow_with_file())
+        return JSONResponse(content=jsonable_encoder(await run_trigger_flow_with_file()))
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
+
+
+@app.get("/retention/runs")
+async def retention_runs() -> Any:
+    return JSONResponse(content=jsonable_encoder({
+        "window": retention.window,
+        "stats": retention.stats(),
+        "runs": list(retention.history),
+    }))
+
+
+@app.get("/metrics/latency")
+async def latency_metrics(table: Optional[str] = None) -> Any:
+    # Per table and operation: wall, server and overhead ms, payload bytes
+    stats = get_latency_recorder().snapshot()
+    if table is not None:
+        stats = {name: value for name, value in stats.items() if table.lower() in name.lower().split(",")}
+    return JSONResponse(content=jsonable_encoder(stats))
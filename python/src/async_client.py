@@ -0,0 +1,168 @@
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    from worqhat import AsyncWorqhat
+except ImportError as e:
+    raise RuntimeError("The 'worqhat' package is required. Install with `pip install worqhat`.") from e
+
+from .client_pool import base_url_for, resolve_credentials
+from .latency import record_cache_hit, record_call, record_failure
+from .query_cache import get_query_cache, params_key
+from .query_template import QueryTemplate, compile_query
+
+
+class AsyncClient:
+    """Awaitable facade over the WorqHat operations used by the examples.
+
+    Every call goes through the SDK's native async transport, so an in-flight
+    request only holds an event-loop task instead of a threadpool worker.
+    Read queries are served from a per-credentials :class:`QueryCache`, which
+    writes made through this client invalidate by table.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, environment: Optional[str] = None) -> None:
+        api_key, environment = resolve_credentials(api_key, environment)
+        self.api_key = api_key
+        self.environment = environment
+        self._client = AsyncWorqhat(api_key=api_key, base_url=base_url_for(environment))
+        self.cache = get_query_cache(api_key, environment)
+
+    # Database
+
+    async def execute_query(
+        self,
+        query: Union[str, QueryTemplate],
+        params: Optional[Union[Dict[str, Any], List[Any]]] = None,
+        use_cache: bool = True,
+    ) -> Any:
+        # Params are checked against the compiled template before any network call
+        template = query if isinstance(query, QueryTemplate) else compile_query(query)
+        bound = template.bind(params)
+        if not template.is_read:
+            # Raw writes sent through execute_query invalidate what they touch, or everything if unsure
+            try:
+                return await self._execute_query(bound.query, bound.params, template.tables)
+            finally:
+                if template.tables_known:
+                    self.cache.invalidate(*template.tables)
+                else:
+                    self.cache.invalidate_all()
+        if not (use_cache and self.cache.enabled and template.tables and template.tables_known):
+            return await self._execute_query(bound.query, bound.params, template.tables)
+
+        key = (bound.fingerprint, params_key(bound.params))
+        found, value = self.cache.get(key)
+        if found:
+            record_cache_hit("execute_query", template.tables)
+            return value
+        generations = self.cache.snapshot(template.tables)
+        response = await self._execute_query(bound.query, bound.params, template.tables)
+        self.cache.put(key, response, generations)
+        return response
+
+    async def _execute_query(
+        self, query: str, params: Optional[Union[Dict[str, Any], List[Any]]], tables: Iterable[str] = ()
+    ) -> Any:
+        request = {"query": query} if params is None else {"query": query, "params": params}
+        started = time.perf_counter()
+        try:
+            response = await self._client.db.execute_query(**request)
+        except Exception:
+            record_failure("execute_query", tables)
+            raise
+        record_call("execute_query", tables, started, response, request)
+        return response
+
+    async def insert_record(self, table: str, data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> Any:
+        try:
+            return await self._client.db.insert_record(table=table, data=data)
+        finally:
+            self.cache.invalidate(table)
+
+    async def update_records(self, table: str, where: Dict[str, Any], data: Dict[str, Any]) -> Any:
+        try:
+            return await self._client.db.update_records(table=table, where=where, data=data)
+        finally:
+            self.cache.invalidate(table)
+
+    async def delete_records(self, table: str, where: Dict[str, Any]) -> Any:
+        try:
+            return await self._client.db.delete_records(table=table, where=where)
+        finally:
+            self.cache.invalidate(table)
+
+    async def process_nl_query(self, question: str, table: str) -> Any:
+        request = {"question": question, "table": table}
+        started = time.perf_counter()
+        try:
+            response = await self._client.db.process_nl_query(**request)
+        except Exception:
+            record_failure("process_nl_query", [table])
+            raise
+        record_call("process_nl_query", [table], started, response, request)
+        return response
+
+    # Workflows
+
+    async def trigger_with_payload(self, workflow_id: str, body: Dict[str, Any]) -> Any:
+        return await self._client.flows.trigger_with_payload(workflow_id, body=body)
+
+    async def trigger_with_file(self, workflow_id: str, payload: Dict[str, Any]) -> Any:
+        return await self._client.flows.trigger_with_file(workflow_id, payload)
+
+    async def get_metrics(self, **filters: Any) -> Any:
+        return await self._client.flows.get_metrics(**filters)
+
+    # Storage
+
+    async def upload_file(self, file: Any, path: str) -> Any:
+        return await self._client.storage.upload_file(file=file, path=path)
+
+    async def retrieve_file_by_id(self, file_id: str) -> Any:
+        return await self._client.storage.retrieve_file_by_id(file_id)
+
+    async def retrieve_file_by_path(self, filepath: str) -> Any:
+        return await self._client.storage.retrieve_file_by_path(filepath=filepath)
+
+    async def delete_file_by_id(self, file_id: str) -> Any:
+        return await self._client.storage.delete_file_by_id(file_id)
+
+    # Server
+
+    async def check_health(self) -> Any:
+        return await self._client.health.check()
+
+    async def get_server_info(self) -> Any:
+        return await self._client.get_server_info()
+
+    async def aclose(self) -> None:
+        close = getattr(self._client, "close", None)
+        if close is not None:
+            await close()
+
+
+# Async clients are tied to the event loop that created their connections, so
+# they are kept apart from the sync registry and closed on app shutdown.
+_async_clients: Dict[Tuple[Optional[str], str], AsyncClient] = {}
+
+
+def get_async_client(api_key: Optional[str] = None, environment: Optional[str] = None) -> AsyncClient:
+    """Return the shared AsyncClient for (api_key, environment), creating it on first use."""
+    key = resolve_credentials(api_key, environment)
+    client = _async_clients.get(key)
+    if client is None:
+        client = AsyncClient(api_key=key[0], environment=key[1])
+        _async_clients[key] = client
+    return client
+
+
+async def close_async_clients() -> None:
+    """Close every pooled async client and empty the registry."""
+    clients = list(_async_clients.values())
+    _async_clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception:
+            pass
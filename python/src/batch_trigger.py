@@ -0,0 +1,180 @@
+import asyncio
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from worqhat import APIConnectionError
+
+from .async_client import AsyncClient
+from .trigger_scheduler import get_trigger_scheduler
+
+DEFAULT_CONCURRENCY = int(os.environ.get("WORQHAT_TRIGGER_CONCURRENCY", "32"))
+DEFAULT_MAX_RETRIES = int(os.environ.get("WORQHAT_TRIGGER_MAX_RETRIES", "3"))
+DEFAULT_RETRY_DELAY = 0.25
+MAX_RETRY_DELAY = 8.0
+# Statuses worth retrying; anything else 4xx is the request's own fault
+RETRY_STATUSES = frozenset({408, 409, 425, 429})
+
+
+def is_transient(error: BaseException) -> bool:
+    """Connection failures, timeouts, throttling and 5xx responses are worth retrying."""
+    if isinstance(error, (APIConnectionError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status_code", None)
+    return isinstance(status, int) and (status in RETRY_STATUSES or status >= 500)
+
+
+def analytics_id_of(response: Any) -> Optional[str]:
+    if isinstance(response, dict):
+        return response.get("analytics_id") or response.get("analyticsId")
+    return getattr(response, "analytics_id", None)
+
+
+@dataclass
+class TriggerResult:
+    # Position of the trigger in the input
+    index: int
+    workflow_id: str
+    ok: bool = False
+    analytics_id: Optional[str] = None
+    attempts: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+    # Whether the last failure was one worth retrying later
+    transient: bool = False
+
+
+@dataclass
+class TriggerBatchReport:
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    # Attempts beyond the first, across all triggers
+    retries: int = 0
+    seconds: float = 0.0
+    # Only filled by trigger_batch; streaming callers see each result as it settles
+    results: List[TriggerResult] = field(default_factory=list)
+
+    @property
+    def triggers_per_second(self) -> float:
+        return self.succeeded / self.seconds if self.seconds else 0.0
+
+    @property
+    def analytics_ids(self) -> List[str]:
+        return [result.analytics_id for result in self.results if result.ok and result.analytics_id]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retries": self.retries,
+            "seconds": round(self.seconds, 3),
+            "triggers_per_second": round(self.triggers_per_second, 1),
+        }
+
+
+async def _trigger(
+    client: AsyncClient,
+    index: int,
+    workflow_id: str,
+    payload: Dict[str, Any],
+    max_retries: int,
+    retry_delay: float,
+) -> TriggerResult:
+    result = TriggerResult(index=index, workflow_id=workflow_id)
+    started = time.perf_counter()
+    for attempt in range(max_retries + 1):
+        result.attempts += 1
+        try:
+            response = await client.trigger_with_payload(workflow_id, payload)
+        except Exception as e:
+            result.error = str(e)
+            result.transient = is_transient(e)
+            if attempt == max_retries or not result.transient:
+                break
+            # Full jitter keeps a burst of throttled triggers from retrying in lockstep
+            await asyncio.sleep(random.uniform(0, min(retry_delay * 2 ** attempt, MAX_RETRY_DELAY)))
+            continue
+        result.ok = True
+        result.error = None
+        result.transient = False
+        result.analytics_id = analytics_id_of(response)
+        break
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+async def iter_triggers(
+    triggers: Iterable[Tuple[str, Dict[str, Any]]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+    client: Optional[AsyncClient] = None,
+    report: Optional[TriggerBatchReport] = None,
+) -> AsyncIterator[TriggerResult]:
+    """Trigger ``(workflow_id, payload)`` pairs with at most ``concurrency`` in flight.
+
+    Results are yielded as each trigger settles, which may be out of input
+    order (``TriggerResult.index`` gives the position). ``triggers`` is read
+    lazily, one pair per free slot, so a generator of millions of orders is
+    never held in memory. Transient failures are retried with jittered
+    exponential backoff; other errors fail the trigger at once. ``report`` is
+    kept up to date as results come in. Closing the iterator early cancels the
+    triggers still in flight.
+
+    Without a ``client`` the triggers go through the shared scheduler as
+    ``low`` priority, so a bulk batch only takes capacity interactive
+    triggers don't need.
+    """
+    client = client or get_trigger_scheduler().with_priority("low")
+    report = report if report is not None else TriggerBatchReport()
+    source = enumerate(triggers)
+    pending: Set["asyncio.Task[TriggerResult]"] = set()
+    started = time.perf_counter()
+
+    def fill() -> None:
+        while len(pending) < max(1, concurrency):
+            item = next(source, None)
+            if item is None:
+                return
+            index, (workflow_id, payload) = item
+            report.total += 1
+            pending.add(asyncio.ensure_future(_trigger(client, index, workflow_id, payload, max_retries, retry_delay)))
+
+    try:
+        fill()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.difference_update(done)
+            fill()
+            for task in done:
+                result = task.result()
+                report.retries += result.attempts - 1
+                if result.ok:
+                    report.succeeded += 1
+                else:
+                    report.failed += 1
+                report.seconds = time.perf_counter() - started
+                yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        report.seconds = time.perf_counter() - started
+
+
+async def trigger_batch(
+    triggers: Iterable[Tuple[str, Dict[str, Any]]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+    client: Optional[AsyncClient] = None,
+) -> TriggerBatchReport:
+    """Run :func:`iter_triggers` to the end; results are in input order."""
+    report = TriggerBatchReport()
+    async for result in iter_triggers(triggers, concurrency, max_retries, retry_delay, client, report):
+        report.results.append(result)
+    report.results.sort(key=lambda result: result.index)
+    return report
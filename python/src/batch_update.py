@@ -0,0 +1,138 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .async_client import AsyncClient, get_async_client
+from .diff_update import invalidate_snapshots
+from .fanout import DEFAULT_CONCURRENCY
+from .pagination import rows_of
+from .query_cache import params_key
+from .query_template import QueryTemplate, compile_query
+from .returning import quote_identifier
+
+# Most keys sent in one `WHERE key IN (...)` statement
+DEFAULT_MAX_KEYS = int(os.environ.get("WORQHAT_UPDATE_BATCH_KEYS", "500"))
+
+
+@dataclass
+class RowUpdateResult:
+    key: Any
+    ok: bool = False
+    # Index into BatchUpdateReport.groups of the change set this row belonged to
+    group: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchUpdateReport:
+    table: str
+    results: List[RowUpdateResult] = field(default_factory=list)
+    groups: List[Dict[str, Any]] = field(default_factory=list)
+    calls: int = 0
+    seconds: float = 0.0
+
+    @property
+    def updated(self) -> int:
+        return sum(1 for result in self.results if result.ok)
+
+    @property
+    def failed(self) -> List[RowUpdateResult]:
+        return [result for result in self.results if not result.ok]
+
+
+def group_updates(updates: Iterable[Tuple[Any, Dict[str, Any]]]) -> List[Tuple[Dict[str, Any], List[Any]]]:
+    """Group ``(key, changes)`` pairs by identical change set, in first-seen order.
+
+    If a key appears more than once, its last change set wins.
+    """
+    latest: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+    for key, changes in updates:
+        if not changes:
+            raise ValueError(f"Empty change set for key {key!r}")
+        latest[params_key(key)] = (key, changes)
+
+    groups: Dict[str, Tuple[Dict[str, Any], List[Any]]] = {}
+    for key, changes in latest.values():
+        groups.setdefault(params_key(changes), (changes, []))[1].append(key)
+    return list(groups.values())
+
+
+def update_in_statement(
+    table: str, key_column: str, changes: Dict[str, Any], keys: List[Any]
+) -> Tuple[QueryTemplate, Dict[str, Any]]:
+    """``UPDATE table SET ... WHERE key IN (...) RETURNING key`` as a template and its params."""
+    params: Dict[str, Any] = {}
+    assignments = []
+    for i, (column, value) in enumerate(changes.items()):
+        params[f"set_{i}"] = value
+        assignments.append(f"{quote_identifier(column)} = {{set_{i}}}")
+    for i, key in enumerate(keys):
+        params[f"key_{i}"] = key
+    key_sql = quote_identifier(key_column)
+    placeholders = ", ".join(f"{{key_{i}}}" for i in range(len(keys)))
+    query = compile_query(
+        f"UPDATE {quote_identifier(table)} SET {', '.join(assignments)} "
+        f"WHERE {key_sql} IN ({placeholders}) RETURNING {key_sql}"
+    )
+    return query, params
+
+
+async def batch_update(
+    table: str,
+    updates: Iterable[Tuple[Any, Dict[str, Any]]],
+    key_column: str = "documentId",
+    max_keys: int = DEFAULT_MAX_KEYS,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    client: Optional[AsyncClient] = None,
+) -> BatchUpdateReport:
+    """Apply per-row ``(key, changes)`` updates with as few calls as possible.
+
+    Rows sharing an identical change set are updated together with one
+    ``WHERE key IN (...)`` statement (split every ``max_keys`` keys), and the
+    statements run ``concurrency`` at a time. Each statement returns the keys it
+    matched, so every row gets its own result: updated, not found, or the error
+    of its statement.
+    """
+    if max_keys <= 0:
+        raise ValueError("max_keys must be positive")
+    client = client or get_async_client()
+    report = BatchUpdateReport(table=table)
+    started = time.perf_counter()
+
+    calls: List[Tuple[int, Dict[str, Any], List[Any]]] = []
+    for index, (changes, keys) in enumerate(group_updates(updates)):
+        report.groups.append(changes)
+        for start in range(0, len(keys), max_keys):
+            calls.append((index, changes, keys[start:start + max_keys]))
+
+    slots = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(group: int, changes: Dict[str, Any], keys: List[Any]) -> List[RowUpdateResult]:
+        async with slots:
+            try:
+                query, params = update_in_statement(table, key_column, changes, keys)
+                response = await client.execute_query(query, params)
+            except Exception as e:
+                return [RowUpdateResult(key=key, group=group, error=str(e)) for key in keys]
+        matched = {
+            params_key(row.get(key_column) if isinstance(row, dict) else getattr(row, key_column, None))
+            for row in rows_of(response)
+        }
+        return [
+            RowUpdateResult(key=key, group=group, ok=True)
+            if params_key(key) in matched
+            else RowUpdateResult(key=key, group=group, error="No matching row")
+            for key in keys
+        ]
+
+    try:
+        for results in await asyncio.gather(*(run(*call) for call in calls)):
+            report.results.extend(results)
+    finally:
+        # Snapshots of these rows no longer match what the table holds
+        invalidate_snapshots(table)
+    report.calls = len(calls)
+    report.seconds = time.perf_counter() - started
+    return report
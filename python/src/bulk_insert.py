@@ -0,0 +1,233 @@
+import asyncio
+import itertools
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from .async_client import AsyncClient, get_async_client
+from .insert_batcher import document_id_of, records_of
+
+DEFAULT_CONCURRENCY = int(os.environ.get("WORQHAT_BULK_CONCURRENCY", "4"))
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_RETRY_DELAY = 0.5
+
+
+@dataclass
+class ChunkResult:
+    index: int
+    start: int
+    size: int
+    ok: bool = False
+    attempts: int = 0
+    seconds: float = 0.0
+    payload_bytes: int = 0
+    document_ids: List[Any] = field(default_factory=list)
+    error: Optional[str] = None
+    # Only failed chunks keep their rows, so they can be retried later
+    rows: Optional[List[Dict[str, Any]]] = field(default=None, repr=False)
+
+
+@dataclass
+class BulkInsertReport:
+    """Running totals of a bulk insert.
+
+    Failed chunks are always kept (with their rows, for :func:`retry_failed`);
+    every chunk, with its ``document_ids``, only with ``keep_chunks=True``, so
+    a long load holds no per-chunk state once a chunk has settled.
+    """
+
+    table: str
+    chunks: List[ChunkResult] = field(default_factory=list)
+    failed_chunks: List[ChunkResult] = field(default_factory=list)
+    chunk_count: int = 0
+    rows_inserted: int = 0
+    rows_failed: int = 0
+    seconds: float = 0.0
+
+    def record(self, chunk: ChunkResult) -> None:
+        """Count a chunk that has just settled."""
+        if chunk.ok:
+            self.rows_inserted += chunk.size
+        else:
+            self.rows_failed += chunk.size
+            self.failed_chunks.append(chunk)
+
+    def record_retry(self, chunk: ChunkResult) -> None:
+        """Move a failed chunk that went through on retry over to the inserted rows."""
+        if chunk.ok and chunk in self.failed_chunks:
+            self.failed_chunks.remove(chunk)
+            self.rows_failed -= chunk.size
+            self.rows_inserted += chunk.size
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_inserted / self.seconds if self.seconds else 0.0
+
+
+class ChunkSizer:
+    """Picks the next chunk size from observed latency and payload size.
+
+    Per-row time and bytes are tracked as moving averages; the next chunk is
+    sized to land near ``target_seconds`` and under ``max_payload_bytes``, and
+    grows by at most 2x per step. A failed chunk halves the size.
+    """
+
+    def __init__(
+        self,
+        initial: int = 500,
+        min_size: int = 50,
+        max_size: int = 5000,
+        target_seconds: float = 2.0,
+        max_payload_bytes: int = 4 * 1024 * 1024,
+        smoothing: float = 0.3,
+    ) -> None:
+        self.size = max(min_size, min(initial, max_size))
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_seconds
+        self.max_payload_bytes = max_payload_bytes
+        self.smoothing = smoothing
+        self.seconds_per_row: Optional[float] = None
+        self.bytes_per_row: Optional[float] = None
+
+    def _average(self, current: Optional[float], sample: float) -> float:
+        return sample if current is None else current + self.smoothing * (sample - current)
+
+    def record(self, rows: int, seconds: float, payload_bytes: int, ok: bool) -> None:
+        if rows <= 0:
+            return
+        if not ok:
+            self.size = max(self.min_size, self.size // 2)
+            return
+        self.seconds_per_row = self._average(self.seconds_per_row, seconds / rows)
+        self.bytes_per_row = self._average(self.bytes_per_row, payload_bytes / rows)
+        limits = [self.size * 2, self.max_size]
+        if self.seconds_per_row > 0:
+            limits.append(int(self.target_seconds / self.seconds_per_row))
+        if self.bytes_per_row > 0:
+            limits.append(int(self.max_payload_bytes / self.bytes_per_row))
+        self.size = max(self.min_size, min(limits))
+
+
+async def _send_chunk(
+    client: AsyncClient,
+    table: str,
+    chunk: ChunkResult,
+    rows: List[Dict[str, Any]],
+    sizer: ChunkSizer,
+    max_retries: int,
+    retry_delay: float,
+) -> None:
+    chunk.payload_bytes = len(json.dumps(rows, default=str))
+    for attempt in range(max_retries + 1):
+        chunk.attempts += 1
+        started = time.perf_counter()
+        try:
+            response = await client.insert_record(table, rows)
+        except Exception as e:
+            chunk.seconds = time.perf_counter() - started
+            chunk.error = str(e)
+            sizer.record(len(rows), chunk.seconds, chunk.payload_bytes, ok=False)
+            if attempt < max_retries:
+                await asyncio.sleep(min(retry_delay * 2 ** attempt, 8.0))
+            continue
+        chunk.seconds = time.perf_counter() - started
+        sizer.record(len(rows), chunk.seconds, chunk.payload_bytes, ok=True)
+        chunk.ok = True
+        chunk.error = None
+        chunk.rows = None
+        chunk.document_ids = [document_id_of(record) for record in records_of(response)]
+        return
+    chunk.rows = rows
+
+
+async def bulk_insert(
+    table: str,
+    rows: Iterable[Dict[str, Any]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    client: Optional[AsyncClient] = None,
+    sizer: Optional[ChunkSizer] = None,
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+    on_chunk: Optional[Callable[[ChunkResult], None]] = None,
+    keep_chunks: bool = False,
+) -> BulkInsertReport:
+    """Insert ``rows`` into ``table`` in adaptively sized chunks, ``concurrency`` at a time.
+
+    ``rows`` is consumed lazily: a chunk is only read from it once a sending slot
+    is free, so at most ``concurrency`` chunks are held in memory. Each chunk is
+    retried on its own; chunks that still fail keep their rows on the report
+    for :func:`retry_failed`. ``on_chunk`` is called as each chunk settles,
+    which may be out of input order, and is where its ``document_ids`` can be
+    read unless ``keep_chunks`` keeps every chunk on the report.
+    """
+    client = client or get_async_client()
+    sizer = sizer or ChunkSizer()
+    report = BulkInsertReport(table=table)
+    slots = asyncio.Semaphore(max(1, concurrency))
+    # Only chunks still sending; finished tasks drop out as they complete
+    pending: Set["asyncio.Task[None]"] = set()
+    errors: List[BaseException] = []
+    source = iter(rows)
+    started = time.perf_counter()
+    offset = 0
+
+    async def run(chunk: ChunkResult, batch: List[Dict[str, Any]]) -> None:
+        try:
+            await _send_chunk(client, table, chunk, batch, sizer, max_retries, retry_delay)
+            report.record(chunk)
+            if on_chunk is not None:
+                on_chunk(chunk)
+        finally:
+            slots.release()
+
+    def finished(task: "asyncio.Task[None]") -> None:
+        pending.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            errors.append(task.exception())
+
+    for index in itertools.count():
+        await slots.acquire()
+        batch = list(itertools.islice(source, sizer.size))
+        if not batch:
+            slots.release()
+            break
+        chunk = ChunkResult(index=index, start=offset, size=len(batch))
+        report.chunk_count += 1
+        if keep_chunks:
+            report.chunks.append(chunk)
+        offset += len(batch)
+        task = asyncio.ensure_future(run(chunk, batch))
+        pending.add(task)
+        task.add_done_callback(finished)
+
+    await asyncio.gather(*pending)
+    report.seconds = time.perf_counter() - started
+    if errors:
+        raise errors[0]
+    return report
+
+
+async def retry_failed(
+    report: BulkInsertReport,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    client: Optional[AsyncClient] = None,
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+) -> BulkInsertReport:
+    """Resend only the chunks of ``report`` that failed, updating them in place."""
+    client = client or get_async_client()
+    sizer = ChunkSizer()
+    slots = asyncio.Semaphore(max(1, concurrency))
+    started = time.perf_counter()
+
+    async def run(chunk: ChunkResult) -> None:
+        async with slots:
+            await _send_chunk(client, report.table, chunk, chunk.rows or [], sizer, max_retries, retry_delay)
+        report.record_retry(chunk)
+
+    await asyncio.gather(*(run(chunk) for chunk in list(report.failed_chunks) if chunk.rows))
+    report.seconds += time.perf_counter() - started
+    return report
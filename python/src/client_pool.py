@@ -0,0 +1,63 @@
+import atexit
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+try:
+    from worqhat import Worqhat
+except ImportError as e:
+    raise RuntimeError("The 'worqhat' package is required. Install with `pip install worqhat`.") from e
+
+# Long-lived clients keyed by (api_key, environment). Reusing one client keeps its
+# underlying HTTP connection pool (and the TLS sessions in it) warm between calls.
+_clients: Dict[Tuple[Optional[str], str], Worqhat] = {}
+_lock = threading.Lock()
+
+
+def resolve_credentials(api_key: Optional[str], environment: Optional[str]) -> Tuple[Optional[str], str]:
+    """Fill in credentials from the environment the same way the examples do."""
+    if api_key is None:
+        api_key = os.environ.get("WORQHAT_API_KEY")
+    if environment is None:
+        environment = os.environ.get("WORQHAT_ENVIRONMENT", "production")
+    return api_key, environment
+
+
+def base_url_for(environment: str) -> Optional[str]:
+    """API base URL for ``environment`` from ``WORQHAT_<ENVIRONMENT>_BASE_URL``.
+
+    The SDK has no notion of environments, only a base URL; None leaves it on
+    its own default (``WORQHAT_BASE_URL`` or the public API).
+    """
+    return os.environ.get(f"WORQHAT_{environment.upper()}_BASE_URL")
+
+
+def get_client(api_key: Optional[str] = None, environment: Optional[str] = None) -> Worqhat:
+    """Return the shared Worqhat client for (api_key, environment), creating it on first use."""
+    key = resolve_credentials(api_key, environment)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = Worqhat(api_key=key[0], base_url=base_url_for(key[1]))
+            _clients[key] = client
+        return client
+
+
+def close_clients() -> None:
+    """Close every pooled client and empty the registry."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        close = getattr(client, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+
+
+atexit.register(close_clients)
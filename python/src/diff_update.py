@@ -0,0 +1,213 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from .async_client import AsyncClient, get_async_client
+from .client_pool import get_client
+from .pagination import rows_of
+from .query_cache import invalidate_query_caches, params_key
+from .query_template import QueryTemplate, compile_query
+from .returning import quote_identifier, where_clause
+
+DEFAULT_SNAPSHOT_TTL = float(os.environ.get("WORQHAT_SNAPSHOT_TTL", "300"))
+DEFAULT_SNAPSHOT_SIZE = int(os.environ.get("WORQHAT_SNAPSHOT_SIZE", "10000"))
+
+
+def snapshot_key(table: str, where: Dict[str, Any]) -> Tuple[str, str]:
+    return table.lower(), params_key(where)
+
+
+class SnapshotStore:
+    """Last known column values per ``(table, where)``, with a TTL and an LRU bound.
+
+    A snapshot only knows the columns this process last wrote or read, and
+    writes made elsewhere are invisible to it, so the TTL bounds how long a
+    diff update can wrongly skip a column someone else changed.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_SNAPSHOT_TTL,
+        max_entries: int = DEFAULT_SNAPSHOT_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, table: str, where: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        key = snapshot_key(table, where)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= self._clock():
+                self._entries.pop(key, None)
+                return None
+            self._entries.move_to_end(key)
+            return dict(entry[0])
+
+    def merge(self, table: str, where: Dict[str, Any], values: Dict[str, Any]) -> None:
+        """Record that the row(s) matching ``where`` now hold ``values``."""
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        key = snapshot_key(table, where)
+        with self._lock:
+            entry = self._entries.get(key)
+            current = dict(entry[0]) if entry is not None and entry[1] > self._clock() else {}
+            current.update(values)
+            self._entries[key] = (current, self._clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(
+        self,
+        table: str,
+        where: Optional[Dict[str, Any]] = None,
+        keep: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Forget one snapshot, or every snapshot of ``table`` except the one for ``keep``."""
+        with self._lock:
+            if where is not None:
+                self._entries.pop(snapshot_key(table, where), None)
+                return
+            kept = snapshot_key(table, keep) if keep is not None else None
+            for key in [key for key in self._entries if key[0] == table.lower() and key != kept]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_store = SnapshotStore()
+
+
+def get_snapshot_store() -> SnapshotStore:
+    return _store
+
+
+def clear_snapshots() -> None:
+    _store.clear()
+
+
+def invalidate_snapshots(table: str) -> None:
+    """Forget every snapshot of ``table``; called by writes that bypass the diff."""
+    _store.invalidate(table)
+
+
+_MISSING = object()
+
+
+def changed_columns(snapshot: Optional[Dict[str, Any]], desired: Dict[str, Any]) -> Dict[str, Any]:
+    """Columns of ``desired`` whose value differs from (or is unknown to) ``snapshot``."""
+    snapshot = snapshot or {}
+    return {column: value for column, value in desired.items() if snapshot.get(column, _MISSING) != value}
+
+
+@dataclass
+class DiffUpdateResult:
+    table: str
+    # Columns actually sent; empty when the update was skipped
+    changes: Dict[str, Any] = field(default_factory=dict)
+    skipped: bool = False
+    response: Any = None
+
+
+def _load_statement(table: str, where: Dict[str, Any], columns: List[str]) -> Tuple[QueryTemplate, Dict[str, Any]]:
+    params: Dict[str, Any] = {}
+    selected = ", ".join(quote_identifier(column) for column in columns)
+    query = compile_query(f"SELECT {selected} FROM {quote_identifier(table)} WHERE {where_clause(where, params)}")
+    return query, params
+
+
+def _common_values(rows: List[Any], columns: List[str]) -> Dict[str, Any]:
+    """Values every matching row agrees on; columns that differ between rows are left out."""
+    if not rows:
+        return {}
+    values: Dict[str, Any] = {}
+    for column in columns:
+        seen = {params_key(row.get(column) if isinstance(row, dict) else getattr(row, column, None)) for row in rows}
+        if len(seen) == 1:
+            first = rows[0]
+            values[column] = first.get(column) if isinstance(first, dict) else getattr(first, column, None)
+    return values
+
+
+def diff_update(
+    table: str,
+    where: Dict[str, Any],
+    desired: Dict[str, Any],
+    load_missing: bool = False,
+    store: Optional[SnapshotStore] = None,
+    client: Any = None,
+) -> DiffUpdateResult:
+    """Bring the row(s) matching ``where`` to ``desired``, sending only the columns that changed.
+
+    Changes are computed against the local snapshot; if nothing differs, no call
+    is made. Without a snapshot the full ``desired`` state is sent, unless
+    ``load_missing`` reads the current values first (one read instead of a write
+    when the state already matches).
+    """
+    store = store if store is not None else get_snapshot_store()
+    client = client or get_client()
+    snapshot = store.get(table, where)
+    if snapshot is None and load_missing:
+        query, params = _load_statement(table, where, list(desired))
+        bound = query.bind(params)
+        snapshot = _common_values(rows_of(client.db.execute_query(query=bound.query, params=bound.params)), list(desired))
+        store.merge(table, where, snapshot)
+
+    changes = changed_columns(snapshot, desired)
+    if not changes:
+        return DiffUpdateResult(table=table, skipped=True)
+    try:
+        response = client.db.update_records(table=table, where=dict(where), data=changes)
+    except Exception:
+        # The write may or may not have landed; don't trust the snapshot
+        store.invalidate(table, where)
+        raise
+    finally:
+        invalidate_query_caches(table)
+    store.merge(table, where, changes)
+    # Other filters may match the rows just written, so their snapshots are stale
+    store.invalidate(table, keep=where)
+    return DiffUpdateResult(table=table, changes=changes, response=response)
+
+
+async def diff_update_async(
+    table: str,
+    where: Dict[str, Any],
+    desired: Dict[str, Any],
+    load_missing: bool = False,
+    store: Optional[SnapshotStore] = None,
+    client: Optional[AsyncClient] = None,
+) -> DiffUpdateResult:
+    """Async counterpart of :func:`diff_update`."""
+    store = store if store is not None else get_snapshot_store()
+    client = client or get_async_client()
+    snapshot = store.get(table, where)
+    if snapshot is None and load_missing:
+        query, params = _load_statement(table, where, list(desired))
+        snapshot = _common_values(rows_of(await client.execute_query(query, params, use_cache=False)), list(desired))
+        store.merge(table, where, snapshot)
+
+    changes = changed_columns(snapshot, desired)
+    if not changes:
+        return DiffUpdateResult(table=table, skipped=True)
+    try:
+        response = await client.update_records(table, dict(where), changes)
+    except Exception:
+        store.invalidate(table, where)
+        raise
+    store.merge(table, where, changes)
+    # Other filters may match the rows just written, so their snapshots are stale
+    store.invalidate(table, keep=where)
+    return DiffUpdateResult(table=table, changes=changes, response=response)
@@ -1,57 +1,65 @@
-import os
-from worqhat import Worqhat
+from datetime import datetime, timedelta
+from typing import Any, Dict
 
+from ..mass_delete import DeleteProgress, mass_delete
+from ..retention import RetentionPolicy, RetentionRun, run_policy
+from ..returning import ReturnMode, delete_records, delete_records_async
+
+# Completed low-priority tasks are kept for 30 days
+OLD_COMPLETED_TASKS = RetentionPolicy(
+    table="tasks",
+    timestamp_column="completedAt",
+    max_age=timedelta(days=30),
+    where={"status": "completed", "priority": "low"},
+)
 
-def delete_inactive_users() -> None:
-    """Delete inactive users."""
-    # Initialize the client with your API key
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),  # Using environment variables for security
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
 
+def delete_inactive_users(returning: ReturnMode = "rows") -> Any:
+    """Delete inactive users."""
     try:
-        response = client.db.delete_records(
+        response = delete_records(
             table="users",  # The table to delete from
             where={
                 # The condition to match records
                 "status": "inactive",
             },
+            returning=returning,  # "rows", "ids" or "count"
         )
 
         # Handle the successful response
+        if returning != "rows":
+            print(f"Deleted {response['deleted_count']} inactive users")
+            return response
         print(f"Deleted {response.deleted_count} inactive users")
         print(f"Message: {response.message}")
+        return response
     except Exception as e:
         # Handle any errors
         print(f"Error deleting users: {str(e)}")
 
 
-def delete_old_completed_tasks() -> None:
-    """Delete old completed tasks with multiple conditions."""
-    # Initialize the client with your API key
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
+def old_tasks_filter() -> Dict[str, Any]:
+    """``delete_records`` arguments for tasks past OLD_COMPLETED_TASKS' 30-day cutoff."""
+    return {
+        "where": dict(OLD_COMPLETED_TASKS.where),
+        "condition": OLD_COMPLETED_TASKS.condition(),
+        "condition_params": {"cutoff": OLD_COMPLETED_TASKS.cutoff(datetime.now())},
+    }
 
-    try:
-        # Get date from 30 days ago
-        from datetime import datetime, timedelta
-        thirty_days_ago = (datetime.now() - timedelta(days=30)).isoformat()
 
-        response = client.db.delete_records(
+def delete_old_completed_tasks(returning: ReturnMode = "rows") -> Any:
+    """Delete completed low-priority tasks older than 30 days."""
+    try:
+        # delete_records only matches on equality, so the age cutoff goes in as a SQL condition
+        response = delete_records(
             table="tasks",  # The table to delete from
-            where={
-                # Multiple conditions to match records
-                "status": "completed",
-                "priority": "low",
-            },
+            returning=returning,  # "rows", "ids" or "count"
+            **old_tasks_filter(),
         )
 
         # Handle the successful response
-        print(f"Deleted {response.deleted_count} old completed tasks")
-        print(f"Message: {response.message}")
+        print(f"Deleted {response['deleted_count']} old completed tasks")
+        return response
     except Exception as e:
         print(f"Error deleting tasks: {str(e)}")
 
@@ -61,3 +69,41 @@ def db_delete() -> None:
     delete_inactive_users()
     delete_old_completed_tasks()
 
+
+async def db_delete_async(returning: ReturnMode = "rows") -> Dict[str, Any]:
+    """Run all delete examples without blocking the event loop."""
+    results: Dict[str, Any] = {}
+    results["delete_inactive_users"] = await delete_records_async(
+        "users", {"status": "inactive"}, returning=returning
+    )
+    results["delete_old_completed_tasks"] = await delete_records_async(
+        "tasks", returning=returning, **old_tasks_filter()
+    )
+    return results
+
+
+async def purge_inactive_users(dry_run: bool = False) -> DeleteProgress:
+    """Delete inactive users in small throttled batches instead of one huge delete."""
+    def report(progress: DeleteProgress) -> None:
+        print(f"Deleted {progress.deleted} inactive users so far "
+              f"({progress.rows_per_second:.0f} rows/s, cursor {progress.cursor})")
+
+    progress = await mass_delete("users", {"status": "inactive"}, dry_run=dry_run, on_progress=report)
+    if dry_run:
+        print(f"{progress.matched} inactive users would be deleted")
+    else:
+        print(f"Deleted {progress.deleted} inactive users in {progress.batches} batches")
+    return progress
+
+
+async def purge_old_completed_tasks(dry_run: bool = False) -> RetentionRun:
+    """Delete completed low-priority tasks older than 30 days, in throttled batches."""
+    run = await run_policy(OLD_COMPLETED_TASKS, dry_run=dry_run)
+    if run.error:
+        print(f"Error purging tasks: {run.error}")
+    elif dry_run:
+        print(f"{run.matched} tasks completed before {run.cutoff.isoformat()} would be deleted")
+    else:
+        print(f"Deleted {run.deleted} tasks completed before {run.cutoff.isoformat()} "
+              f"({run.rows_per_second:.0f} rows/s)")
+    return run
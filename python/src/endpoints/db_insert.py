@@ -1,109 +1,157 @@
-import os
-from worqhat import Worqhat
-
-
-def create_user() -> None:
+import asyncio
+from typing import Any, Dict, Iterable, List
+
+from ..async_client import get_async_client
+from ..client_pool import get_client
+from ..bulk_insert import BulkInsertReport, bulk_insert
+from ..fanout import gather_concurrently, run_concurrently
+from ..ids import new_id, with_document_ids
+from ..query_cache import invalidate_query_caches
+from ..insert_batcher import InsertBatcher
+
+NEW_USER = {
+    "name": "John Doe",
+    "email": "john@example.com",
+    "role": "user",
+    "active": True
+}
+
+PREMIUM_WIDGET = {
+    "name": "Premium Widget",
+    "price": 99.99,
+    "inStock": True,
+    "category": "electronics"
+}
+
+SAMPLE_PRODUCTS = [
+    {
+        "name": "Basic Widget",
+        "price": 19.99,
+        "inStock": True,
+        "category": "essentials"
+    },
+    {
+        "name": "Standard Widget",
+        "price": 49.99,
+        "inStock": True,
+        "category": "essentials"
+    },
+    {
+        "name": "Premium Widget",
+        "price": 99.99,
+        "inStock": False,
+        "category": "premium"
+    }
+]
+
+
+def create_user() -> Any:
     """Create a new user record."""
-    # Initialize the client with your API key
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),  # Using environment variables for security
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
+    # Get the shared client for your API key
+    client = get_client()
 
     try:
         response = client.db.insert_record(
             table="users",          # The table to insert into
-            data={                  # The data to insert
-                "name": "John Doe",
-                "email": "john@example.com",
-                "role": "user",
-                "active": True
-            }
+            data=dict(NEW_USER)     # The data to insert
         )
+        invalidate_query_caches("users")
 
         # Handle the successful response
         print(f"User created with ID: {response.data.get('documentId')}")
         print(f"Created user: {response.data}")
+        return response
     except Exception as e:
         # Handle any errors
         print(f"Error creating user: {str(e)}")
 
 
-def create_product_with_custom_id() -> None:
+def create_product_with_custom_id() -> Any:
     """Create a product with custom document ID."""
-    import time
-
-    # Initialize the client with your API key
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
+    # Get the shared client for your API key
+    client = get_client()
 
     # Generate a custom ID
-    custom_id = f"prod_{int(time.time())}"  # Using timestamp for unique ID
+    custom_id = new_id("prod_")  # Time-ordered ULID, unique even for concurrent inserts
 
     try:
         response = client.db.insert_record(
             table="products",       # The table to insert into
             data={                  # The data to insert
                 "documentId": custom_id,  # Specify your own document ID
-                "name": "Premium Widget",
-                "price": 99.99,
-                "inStock": True,
-                "category": "electronics"
+                **PREMIUM_WIDGET,
             }
         )
+        invalidate_query_caches("products")
 
         # Handle the successful response
         print(f"Product created with custom ID: {response.data.get('documentId')}")
         print(f"Created product: {response.data}")
+        return response
     except Exception as e:
         print(f"Error creating product: {str(e)}")
 
 
-def create_multiple_products() -> None:
+def create_multiple_products() -> Any:
     """Create multiple products in batch."""
-    # Initialize the client with your API key
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
+    # Get the shared client for your API key
+    client = get_client()
 
     try:
         response = client.db.insert_record(
             table="products",       # The table to insert into
-            data=[                  # Array of data objects to insert
-                {
-                    "name": "Basic Widget",
-                    "price": 19.99,
-                    "inStock": True,
-                    "category": "essentials"
-                },
-                {
-                    "name": "Standard Widget",
-                    "price": 49.99,
-                    "inStock": True,
-                    "category": "essentials"
-                },
-                {
-                    "name": "Premium Widget",
-                    "price": 99.99,
-                    "inStock": False,
-                    "category": "premium"
-                }
-            ]
+            data=[dict(product) for product in SAMPLE_PRODUCTS]  # Array of data objects to insert
         )
+        invalidate_query_caches("products")
 
         # Handle the successful response
         print(f"Inserted {len(response.data)} products")
         print(f"Created products: {response.data}")
+        return response
     except Exception as e:
         print(f"Error creating products: {str(e)}")
 
 
-def db_insert() -> None:
-    """Run all insert examples."""
-    create_user()
-    create_product_with_custom_id()
-    create_multiple_products()
-
+def db_insert() -> Dict[str, Any]:
+    """Run all insert examples concurrently."""
+    return run_concurrently({
+        "create_user": create_user,
+        "create_product_with_custom_id": create_product_with_custom_id,
+        "create_multiple_products": create_multiple_products,
+    }, none_is_error=True)
+
+
+async def db_insert_async() -> Dict[str, Any]:
+    """Run all insert examples concurrently on the event loop."""
+    client = get_async_client()
+    return await gather_concurrently({
+        "create_user": lambda: client.insert_record("users", dict(NEW_USER)),
+        "create_product_with_custom_id": lambda: client.insert_record(
+            "products", {"documentId": new_id("prod_"), **PREMIUM_WIDGET}
+        ),
+        "create_multiple_products": lambda: client.insert_record(
+            "products", [dict(product) for product in SAMPLE_PRODUCTS]
+        ),
+    })
+
+
+async def create_users_batched(users: Iterable[Dict[str, Any]]) -> List[Any]:
+    """Insert users one call per row, letting the micro-batcher coalesce them into list inserts."""
+    batcher = InsertBatcher()
+    try:
+        # Each insert resolves to that user's documentId once its batch lands
+        return await asyncio.gather(*(batcher.insert("users", user) for user in users))
+    finally:
+        await batcher.aclose()
+
+
+async def bulk_insert_products(products: Iterable[Dict[str, Any]]) -> BulkInsertReport:
+    """Insert a large (possibly generated) product feed in parallel, adaptively sized chunks."""
+    # IDs are assigned locally, so a retried chunk resends the same documentIds
+    report = await bulk_insert("products", with_document_ids(products, "prod_"))
+
+    print(f"Inserted {report.rows_inserted} products in {report.chunk_count} chunks "
+          f"({report.rows_per_second:.0f} rows/s)")
+    for chunk in report.failed_chunks:
+        print(f"Chunk {chunk.index} (rows {chunk.start}-{chunk.start + chunk.size - 1}) failed: {chunk.error}")
+    return report
@@ -1,18 +1,23 @@
-import os
-from worqhat import Worqhat
+from typing import Any, Dict
 
+from ..nl_cache import nl_query, nl_query_async
 
-def count_active_users() -> None:
-    """Count active users using natural language query."""
-    # Initialize the client with your API key
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),  # Using environment variables for security
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
+COUNT_ACTIVE_USERS_QUESTION = "How many active users do we have?"
+SALES_ANALYSIS_QUESTION = "What were the top 3 product categories by revenue last quarter?"
+
+# Asked at startup so their SQL is cached before the first request
+WARMUP_QUESTIONS = [
+    (COUNT_ACTIVE_USERS_QUESTION, "users"),
+    (SALES_ANALYSIS_QUESTION, "sales"),
+]
 
+
+def count_active_users() -> Any:
+    """Count active users using natural language query."""
     try:
-        response = client.db.process_nl_query(
-            question="How many active users do we have?",
+        # Repeat questions reuse the SQL generated the first time
+        response = nl_query(
+            question=COUNT_ACTIVE_USERS_QUESTION,
             table="users",
         )
 
@@ -20,22 +25,17 @@ def count_active_users() -> None:
         print(f"Result: {response.data}")
         print(f"Generated SQL: {response.sql}")
         print(f"Query execution time: {response.execution_time} ms")
+        return response
     except Exception as e:
         # Handle any errors
         print(f"Error executing query: {str(e)}")
 
 
-def analyze_sales_data() -> None:
+def analyze_sales_data() -> Any:
     """Analyze sales data using natural language query."""
-    # Initialize the client with your API key
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
-
     try:
-        response = client.db.process_nl_query(
-            question="What were the top 3 product categories by revenue last quarter?",
+        response = nl_query(
+            question=SALES_ANALYSIS_QUESTION,
             table="sales",
         )
 
@@ -43,6 +43,7 @@ def analyze_sales_data() -> None:
         print("Analysis results:")
         print(response.data)
         print(f"Generated SQL: {response.sql}")
+        return response
     except Exception as e:
         print(f"Error analyzing sales data: {str(e)}")
 
@@ -51,3 +52,11 @@ def db_nl_query() -> None:
     """Run all natural language query examples."""
     count_active_users()
     analyze_sales_data()
+
+
+async def db_nl_query_async() -> Dict[str, Any]:
+    """Run all natural language query examples without blocking the event loop."""
+    results: Dict[str, Any] = {}
+    results["count_active_users"] = await nl_query_async(COUNT_ACTIVE_USERS_QUESTION, "users")
+    results["analyze_sales_data"] = await nl_query_async(SALES_ANALYSIS_QUESTION, "sales")
+    return results
@@ -1,96 +1,143 @@
-import os
-from worqhat import Worqhat
-
-
-def fetch_active_users() -> None:
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..async_client import get_async_client
+from ..client_pool import get_client
+from ..fanout import gather_concurrently, run_concurrently
+from ..pagination import DEFAULT_PAGE_SIZE, iter_query_pages
+from ..query_template import QueryTemplate
+
+ACTIVE_USERS_QUERY = QueryTemplate(
+    "SELECT * FROM users WHERE status = {status} LIMIT {limit}",
+    types={"status": str, "limit": int},
+)
+ACTIVE_USERS_PARAMS = {
+    "status": "active",
+    "limit": 10,
+}
+
+# Complex SQL query with positional parameters
+SALES_REPORT_QUERY = QueryTemplate("""
+        SELECT
+            category,
+            COUNT(*) as order_count,
+            SUM(quantity) as total_items,
+            SUM(price * quantity) as total_revenue
+        FROM orders
+        WHERE order_date >= $1
+        GROUP BY category
+        ORDER BY total_revenue DESC
+    """, types={1: str})
+SALES_REPORT_PARAMS = ["2025-01-01"]
+
+SEARCH_USERS_QUERY = QueryTemplate(
+    "SELECT * FROM users WHERE status = {status} AND created_at >= {created_after} ORDER BY {sort_by} LIMIT {limit}",
+    types={"status": str, "created_after": str, "sort_by": str, "limit": int},
+)
+SEARCH_USERS_PARAMS = {
+    "status": "active",
+    "created_after": "2025-01-01",
+    "sort_by": "created_at",
+    "limit": 50,
+}
+
+# Unbounded variant used for page-by-page streaming
+USERS_BY_STATUS_QUERY = QueryTemplate(
+    "SELECT * FROM users WHERE status = {status}",
+    types={"status": str},
+)
+
+
+def fetch_active_users() -> Any:
     """Execute SQL query with named parameters."""
-    # Initialize the client with your API key
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),  # Using environment variables for security
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
+    # Get the shared client for your API key
+    client = get_client()
 
     try:
+        bound = ACTIVE_USERS_QUERY.bind(ACTIVE_USERS_PARAMS)
         response = client.db.execute_query(
-            query="SELECT * FROM users WHERE status = {status} LIMIT {limit}",
-            params={
-                "status": "active",
-                "limit": 10,
-            },
+            query=bound.query,
+            params=bound.params,
         )
 
         # Handle the successful response
         print(f"Found {len(response.data)} active users")
         print(f"Query execution time: {response.execution_time} ms")
         print(f"Results: {response.data}")
+        return response
     except Exception as e:
         # Handle any errors
         print(f"Error executing query: {str(e)}")
 
 
-def generate_sales_report() -> None:
+def generate_sales_report() -> Any:
     """Execute complex SQL query with positional parameters."""
-    # Initialize the client with your API key
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
-
-    # Complex SQL query with positional parameters
-    query = """
-        SELECT
-            category,
-            COUNT(*) as order_count,
-            SUM(quantity) as total_items,
-            SUM(price * quantity) as total_revenue
-        FROM orders
-        WHERE order_date >= $1
-        GROUP BY category
-        ORDER BY total_revenue DESC
-    """
+    # Get the shared client for your API key
+    client = get_client()
 
     # Execute the query with positional parameters
     try:
+        bound = SALES_REPORT_QUERY.bind(SALES_REPORT_PARAMS)
         response = client.db.execute_query(
-            query=query,
-            params=["2025-01-01"],
+            query=bound.query,
+            params=bound.params,
         )
 
         # Handle the successful response
         print("Sales report generated successfully")
         print(f"Report data: {response.data}")
+        return response
     except Exception as e:
         print(f"Error generating sales report: {str(e)}")
 
 
-def search_users() -> None:
+def search_users() -> Any:
     """Search users with named parameters."""
-    # Initialize the client with your API key
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
+    # Get the shared client for your API key
+    client = get_client()
 
     try:
+        bound = SEARCH_USERS_QUERY.bind(SEARCH_USERS_PARAMS)
         response = client.db.execute_query(
-            query="SELECT * FROM users WHERE status = {status} AND created_at >= {created_after} ORDER BY {sort_by} LIMIT {limit}",
-            params={
-                "status": "active",
-                "created_after": "2025-01-01",
-                "sort_by": "created_at",
-                "limit": 50,
-            },
+            query=bound.query,
+            params=bound.params,
         )
 
         print("Search completed successfully")
         print(f"Results: {response.data}")
+        return response
     except Exception as e:
         print(f"Error searching users: {str(e)}")
 
 
-def db_query() -> None:
-    """Run all query examples."""
-    fetch_active_users()
-    generate_sales_report()
-    search_users()
-
+def stream_active_users(page_size: int = DEFAULT_PAGE_SIZE) -> int:
+    """Walk every active user page by page instead of loading the whole table."""
+    total = 0
+    try:
+        # Keyset pagination on id; the next page is fetched while this one is handled
+        for page in iter_query_pages(USERS_BY_STATUS_QUERY, {"status": "active"}, page_size=page_size, key_column="id"):
+            total += len(page)
+            print(f"Fetched {len(page)} active users ({total} so far)")
+    except Exception as e:
+        print(f"Error streaming users: {str(e)}")
+    return total
+
+
+def db_query() -> Dict[str, Any]:
+    """Run all query examples concurrently."""
+    return run_concurrently({
+        "fetch_active_users": fetch_active_users,
+        "generate_sales_report": generate_sales_report,
+        "search_users": search_users,
+    }, none_is_error=True)
+
+
+async def db_query_async(query: Optional[str] = None) -> Dict[str, Any]:
+    """Run all query examples (plus ``query`` when given) concurrently on the event loop."""
+    client = get_async_client()
+    calls: Dict[str, Callable[[], Awaitable[Any]]] = {}
+    if query is not None:
+        calls["query"] = lambda: client.execute_query(query)
+    calls["fetch_active_users"] = lambda: client.execute_query(ACTIVE_USERS_QUERY, ACTIVE_USERS_PARAMS)
+    calls["generate_sales_report"] = lambda: client.execute_query(SALES_REPORT_QUERY, SALES_REPORT_PARAMS)
+    calls["search_users"] = lambda: client.execute_query(SEARCH_USERS_QUERY, SEARCH_USERS_PARAMS)
+    return await gather_concurrently(calls)
@@ -1,69 +1,122 @@
-import os
-from worqhat import Worqhat
+from typing import Any, Dict, Iterable, Tuple
 
+from ..batch_update import BatchUpdateReport, batch_update
+from ..diff_update import DiffUpdateResult, diff_update
+from ..returning import ReturnMode, update_records, update_records_async
 
-def update_user_status() -> None:
-    """Update user status with multiple where conditions."""
-    # Initialize the client with your API key
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),  # Using environment variables for security
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
+# Which records to update
+USER_STATUS_WHERE = {
+    "id": "123",  # Find records with id = 123
+    "email": "user@example.com",  # AND email = user@example.com
+}
+# New values to set
+USER_STATUS_DATA = {
+    "status": "active",  # Change status to active
+    "name": "Updated Name",  # Update the name
+}
+
+INACTIVE_USERS_WHERE = {
+    "status": "inactive",  # Find ALL records with status = inactive
+}
+INACTIVE_USERS_DATA = {
+    "status": "active",  # Change status to active
+    "updatedBy": "system",  # Add audit information
+}
 
+
+def update_user_status(returning: ReturnMode = "rows") -> Any:
+    """Update user status with multiple where conditions."""
     try:
-        response = client.db.update_records(
+        response = update_records(
             table="users",  # The table to update
-            where={
-                # Which records to update
-                "id": "123",  # Find records with id = 123
-                "email": "user@example.com",  # AND email = user@example.com
-            },
-            data={
-                # New values to set
-                "status": "active",  # Change status to active
-                "name": "Updated Name",  # Update the name
-            },
+            where=dict(USER_STATUS_WHERE),
+            data=dict(USER_STATUS_DATA),
+            returning=returning,  # "rows", "ids" or "count"
         )
 
         # Handle the successful response
+        if returning != "rows":
+            print(f"Updated {response['count']} records")
+            return response
         print(f"Updated {response.count} records")
         print(f"Updated records: {response.data}")
+        return response
     except Exception as e:
         # Handle any errors
         print(f"Error updating records: {str(e)}")
 
 
-def update_inactive_users() -> None:
-    """Update all inactive users to active."""
-    # Initialize the client with your API key
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
+def update_inactive_users(returning: ReturnMode = "rows") -> Any:
+    """Update all inactive users to active.
 
+    This can touch a lot of rows; pass ``returning="count"`` (or ``"ids"``) to
+    skip sending every updated record back.
+    """
     try:
-        response = client.db.update_records(
+        response = update_records(
             table="users",  # The table to update
-            where={
-                # Which records to update
-                "status": "inactive",  # Find ALL records with status = inactive
-            },
-            data={
-                # New values to set
-                "status": "active",  # Change status to active
-                "updatedBy": "system",  # Add audit information
-            },
+            where=dict(INACTIVE_USERS_WHERE),
+            data=dict(INACTIVE_USERS_DATA),
+            returning=returning,  # "rows", "ids" or "count"
         )
 
         # Handle the successful response
+        if returning != "rows":
+            print(f"Updated {response['count']} inactive users to active status")
+            return response
         print(f"Updated {response.count} inactive users to active status")
         print(f"First few updated records: {response.data[:3] if response.data else []}")
+        return response
     except Exception as e:
         print(f"Error updating users: {str(e)}")
 
 
+def sync_user_status() -> DiffUpdateResult:
+    """Re-assert the desired user state, sending only columns that actually changed."""
+    try:
+        result = diff_update(
+            table="users",
+            where=dict(USER_STATUS_WHERE),
+            desired=dict(USER_STATUS_DATA),
+            load_missing=True,  # Read the row once instead of blindly writing it
+        )
+
+        if result.skipped:
+            print("User already up to date, no update sent")
+        else:
+            print(f"Updated columns: {sorted(result.changes)}")
+        return result
+    except Exception as e:
+        print(f"Error syncing user: {str(e)}")
+
+
 def db_update() -> None:
     """Run all update examples."""
     update_user_status()
     update_inactive_users()
 
+
+async def db_update_async(returning: ReturnMode = "rows") -> Dict[str, Any]:
+    """Run all update examples without blocking the event loop."""
+    results: Dict[str, Any] = {}
+    results["update_user_status"] = await update_records_async(
+        "users", dict(USER_STATUS_WHERE), dict(USER_STATUS_DATA), returning=returning
+    )
+    results["update_inactive_users"] = await update_records_async(
+        "users", dict(INACTIVE_USERS_WHERE), dict(INACTIVE_USERS_DATA), returning=returning
+    )
+    return results
+
+
+async def update_user_tiers(tiers: Iterable[Tuple[str, Dict[str, Any]]]) -> BatchUpdateReport:
+    """Apply per-user changes, e.g. [("doc_1", {"tier": "gold"}), ("doc_2", {"tier": "silver"})].
+
+    Users getting the same changes share one update call.
+    """
+    report = await batch_update("users", tiers)
+
+    print(f"Updated {report.updated} users with {report.calls} calls "
+          f"({len(report.groups)} distinct change sets) in {report.seconds:.1f}s")
+    for result in report.failed:
+        print(f"User {result.key} not updated: {result.error}")
+    return report
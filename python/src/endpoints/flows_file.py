@@ -1,27 +1,54 @@
-import os
-from worqhat import Worqhat
-
-
-def process_document(file_path: str) -> None:
+from typing import Any, Dict
+
+from ..client_pool import get_client
+from ..fanout import gather_concurrently, run_concurrently
+from ..trigger_scheduler import get_trigger_scheduler, priority_of
+
+DOCUMENT_WORKFLOW_ID = "document-processing-workflow-id"
+IMAGE_WORKFLOW_ID = "image-analysis-workflow-id"
+
+# Additional fields go directly on the payload
+DOCUMENT_FIELDS = {
+    "documentType": "contract",
+    "priority": "high",
+    "department": "legal",
+}
+
+REMOTE_IMAGE_PAYLOAD = {
+    "url": "https://storage.example.com/products/laptop-x1.jpg",
+    "imageType": "product",
+    "category": "electronics",
+    "productId": "PROD-12345",
+}
+
+DOCUMENT_PARAMS = {
+    "customerId": "CID-12345",
+    "department": "legal",
+    "requireSignature": True,
+    "processingMode": "detailed",
+    "documentType": "contract",
+    "priority": "high",
+}
+
+# Use a sample file path - in real usage, this would be passed as parameter
+SAMPLE_FILE_PATH = "./contract.pdf"  # This file may not exist, but shows the pattern
+
+
+def process_document(file_path: str) -> Any:
     """Process a document using workflow with file upload."""
-    # Initialize the client
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
+    # Get the shared client
+    client = get_client()
 
     try:
         # Open the file in binary mode
         with open(file_path, 'rb') as file:
             # Trigger the workflow
             response = client.flows.trigger_with_file(
-                "document-processing-workflow-id",
+                DOCUMENT_WORKFLOW_ID,
                 {
                     "file": file,
                     # Additional fields go directly on the payload
-                    "documentType": "contract",
-                    "priority": "high",
-                    "department": "legal",
+                    **DOCUMENT_FIELDS,
                 },
             )
 
@@ -32,25 +59,16 @@ def process_document(file_path: str) -> None:
         # Handle the error appropriately
 
 
-def process_remote_image() -> None:
+def process_remote_image() -> Any:
     """Process a remote image using workflow with URL."""
-    # Initialize the client
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
+    # Get the shared client
+    client = get_client()
 
     try:
         # Trigger the workflow with a URL
         response = client.flows.trigger_with_file(
-            "image-analysis-workflow-id",
-            {
-                "url": "https://storage.example.com/products/laptop-x1.jpg",
-                # Additional fields go directly on the payload
-                "imageType": "product",
-                "category": "electronics",
-                "productId": "PROD-12345",
-            },
+            IMAGE_WORKFLOW_ID,
+            dict(REMOTE_IMAGE_PAYLOAD),
         )
 
         print(f"Image analysis started! Tracking ID: {response.analytics_id}")
@@ -60,28 +78,20 @@ def process_remote_image() -> None:
         # Handle the error appropriately
 
 
-def process_document_with_params(file_path: str) -> None:
+def process_document_with_params(file_path: str) -> Any:
     """Process a document with additional parameters."""
-    # Initialize the client
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
+    # Get the shared client
+    client = get_client()
 
     try:
         with open(file_path, 'rb') as file:
             # Trigger the workflow with file and additional parameters
             response = client.flows.trigger_with_file(
-                "document-processing-workflow-id",
+                DOCUMENT_WORKFLOW_ID,
                 {
                     "file": file,
                     # Additional parameters
-                    "customerId": "CID-12345",
-                    "department": "legal",
-                    "requireSignature": True,
-                    "processingMode": "detailed",
-                    "documentType": "contract",
-                    "priority": "high",
+                    **DOCUMENT_PARAMS,
                 },
             )
 
@@ -91,21 +101,47 @@ def process_document_with_params(file_path: str) -> None:
         print(f"Error processing document: {str(e)}")
 
 
-def trigger_flow_with_file() -> None:
-    """Run all file-based workflow trigger examples."""
-    # Use a sample file path - in real usage, this would be passed as parameter
-    sample_file_path = "./contract.pdf"  # This file may not exist, but shows the pattern
-
-    try:
-        process_document(sample_file_path)
-    except FileNotFoundError:
-        print("Sample file not found, skipping document processing example")
-
-    process_remote_image()
-    process_document_with_params(sample_file_path)
+def trigger_flow_with_file() -> Dict[str, Any]:
+    """Run all file-based workflow trigger examples concurrently."""
+    # A missing sample file only fails its own entry
+    return run_concurrently({
+        "process_document": lambda: process_document(SAMPLE_FILE_PATH),
+        "process_remote_image": process_remote_image,
+        "process_document_with_params": lambda: process_document_with_params(SAMPLE_FILE_PATH),
+    }, none_is_error=True)
 
 
 def trigger_flow_with_url() -> None:
     """Trigger workflow with URL (backward compatibility)."""
     process_remote_image()
 
+
+async def process_document_async(file_path: str, fields: Dict[str, Any] = DOCUMENT_FIELDS) -> Any:
+    """Trigger the document workflow with a local file, scheduled by the fields' ``priority``."""
+    with open(file_path, 'rb') as file:
+        return await get_trigger_scheduler().trigger(
+            DOCUMENT_WORKFLOW_ID,
+            {"file": file, **fields},
+            priority_of(fields),
+            with_file=True,
+        )
+
+
+async def process_remote_image_async() -> Any:
+    """Trigger the image workflow with a remote URL through the trigger scheduler."""
+    return await get_trigger_scheduler().trigger_with_file(IMAGE_WORKFLOW_ID, dict(REMOTE_IMAGE_PAYLOAD))
+
+
+async def trigger_flow_with_file_async() -> Dict[str, Any]:
+    """Run all file-based workflow trigger examples concurrently on the event loop."""
+    # A missing sample file only fails its own entry
+    return await gather_concurrently({
+        "process_document": lambda: process_document_async(SAMPLE_FILE_PATH),
+        "process_remote_image": process_remote_image_async,
+        "process_document_with_params": lambda: process_document_async(SAMPLE_FILE_PATH, DOCUMENT_PARAMS),
+    })
+
+
+async def trigger_flow_with_url_async() -> Dict[str, Any]:
+    """Trigger workflow with URL (backward compatibility) without blocking the event loop."""
+    return {"process_remote_image": await process_remote_image_async()}
@@ -1,14 +1,14 @@
-import os
-from worqhat import Worqhat
+from typing import Any, Dict
 
+from ..async_client import get_async_client
+from ..client_pool import get_client
+from ..fanout import gather_concurrently, run_concurrently
 
-def get_workflow_metrics() -> None:
+
+def get_workflow_metrics() -> Any:
     """Get workflow metrics with specific date range and status filter."""
-    # Initialize the client with your API key
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),  # Using environment variables for security
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
+    # Get the shared client for your API key
+    client = get_client()
 
     try:
         response = client.workflows.get_metrics(
@@ -28,18 +28,16 @@ def get_workflow_metrics() -> None:
             print(f"  Executions: {workflow.executions}")
             print(f"  Success Rate: {workflow.success_rate}%")
             print(f"  Most Common Error: {workflow.most_common_error or 'None'}")
+        return response
     except Exception as e:
         # Handle any errors
         print(f"Error getting workflow metrics: {str(e)}")
 
 
-def get_all_workflow_metrics() -> None:
+def get_all_workflow_metrics() -> Any:
     """Get workflow metrics with default date range."""
-    # Initialize the client with your API key
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
+    # Get the shared client for your API key
+    client = get_client()
 
     try:
         # No parameters means use the default date range (current month)
@@ -50,12 +48,25 @@ def get_all_workflow_metrics() -> None:
         print(f"Total Executions: {response.metrics.total_executions}")
         print(f"Success Rate: {response.metrics.success_rate}%")
         print(f"Error Rate: {response.metrics.error_rate}%")
+        return response
     except Exception as e:
         print(f"Error getting workflow metrics: {str(e)}")
 
 
-def get_flows_metrics() -> None:
-    """Run all workflow metrics examples."""
-    get_workflow_metrics()
-    get_all_workflow_metrics()
+def get_flows_metrics() -> Dict[str, Any]:
+    """Run all workflow metrics examples concurrently."""
+    return run_concurrently({
+        "get_workflow_metrics": get_workflow_metrics,
+        "get_all_workflow_metrics": get_all_workflow_metrics,
+    }, none_is_error=True)
+
 
+async def get_flows_metrics_async() -> Dict[str, Any]:
+    """Run all workflow metrics examples concurrently on the event loop."""
+    client = get_async_client()
+    return await gather_concurrently({
+        "get_workflow_metrics": lambda: client.get_metrics(
+            start_date="2025-07-01", end_date="2025-07-24", status="completed"
+        ),
+        "get_all_workflow_metrics": lambda: client.get_metrics(),
+    })
@@ -1,120 +1,165 @@
-import os
-from worqhat import Worqhat
-
-
-def onboard_new_customer() -> None:
-    """Trigger customer onboarding workflow with customer data."""
-    # Initialize the WorqHat client
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),  # Always use environment variables for security
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
-
-    # Customer data to be processed by the workflow
-    customer_data = {
-        "name": "Jane Smith",
-        "email": "jane.smith@example.com",
-        "plan": "premium",
-        "company": "Acme Inc.",
-        "preferences": {
-            "notifications": True,
-            "newsletter": False,
-            "productUpdates": True,
+from typing import Any, Dict, Iterable
+
+from ..batch_trigger import TriggerBatchReport, is_transient, trigger_batch
+from ..client_pool import get_client
+from ..fanout import gather_concurrently, run_concurrently
+from ..idempotency import trigger_once, trigger_once_async
+from ..outbox import get_outbox
+from ..trigger_scheduler import get_trigger_scheduler
+
+ONBOARDING_WORKFLOW_ID = "workflow-id-for-customer-onboarding"
+ORDER_WORKFLOW_ID = "order-processing-workflow-id"
+ANALYSIS_WORKFLOW_ID = "data-analysis-workflow-id"
+
+# Customer data to be processed by the workflow
+CUSTOMER_DATA = {
+    "name": "Jane Smith",
+    "email": "jane.smith@example.com",
+    "plan": "premium",
+    "company": "Acme Inc.",
+    "preferences": {
+        "notifications": True,
+        "newsletter": False,
+        "productUpdates": True,
+    },
+}
+
+ORDER_DATA = {
+    "orderId": "ORD-12345",
+    "customer": {
+        "id": "CUST-789",
+        "name": "Alex Johnson",
+        "email": "alex@example.com",
+    },
+    "items": [
+        {"productId": "PROD-001", "quantity": 2, "price": 29.99},
+        {"productId": "PROD-042", "quantity": 1, "price": 49.99},
+    ],
+    "shipping": {
+        "method": "express",
+        "address": {
+            "street": "123 Main St",
+            "city": "Boston",
+            "state": "MA",
+            "zip": "02108",
         },
-    }
+    },
+    "payment": {
+        "method": "credit_card",
+        "transactionId": "TXN-5678",
+    },
+}
+
+ANALYSIS_DATA = {
+    "datasetId": "DS-456",
+    "analysisParameters": {
+        "timeRange": {"start": "2025-01-01", "end": "2025-07-31"},
+        "metrics": ["revenue", "user_growth", "conversion_rate"],
+        "segmentation": ["region", "device_type", "user_tier"],
+        "comparisonPeriod": "previous_quarter",
+    },
+    "outputFormat": "pdf",
+    "notifyEmail": "reports@yourcompany.com",
+}
+
+
+def onboard_new_customer() -> Any:
+    """Trigger customer onboarding workflow with customer data."""
+    # Get the shared WorqHat client
+    client = get_client()
 
     try:
         # Trigger the onboarding workflow with customer data
         response = client.flows.trigger_with_payload(
-            "workflow-id-for-customer-onboarding",
-            body=customer_data,
+            ONBOARDING_WORKFLOW_ID,
+            body=CUSTOMER_DATA,
         )
 
         print(f"Onboarding workflow started! Tracking ID: {response.analytics_id}")
 
         # You can store this analytics_id to check the status later
+        return response
     except Exception as error:
         print(f"Error triggering onboarding workflow: {error}")
         # Handle the error appropriately
 
 
-def process_ecommerce_order() -> None:
+def process_ecommerce_order() -> Any:
     """Trigger order processing workflow with order data."""
-    # Initialize the WorqHat client
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
-
     try:
-        # Trigger the order processing workflow with order data
-        response = client.flows.trigger_with_payload(
-            "order-processing-workflow-id",
-            body={
-                "orderId": "ORD-12345",
-                "customer": {
-                    "id": "CUST-789",
-                    "name": "Alex Johnson",
-                    "email": "alex@example.com",
-                },
-                "items": [
-                    {"productId": "PROD-001", "quantity": 2, "price": 29.99},
-                    {"productId": "PROD-042", "quantity": 1, "price": 49.99},
-                ],
-                "shipping": {
-                    "method": "express",
-                    "address": {
-                        "street": "123 Main St",
-                        "city": "Boston",
-                        "state": "MA",
-                        "zip": "02108",
-                    },
-                },
-                "payment": {
-                    "method": "credit_card",
-                    "transactionId": "TXN-5678",
-                },
-            },
+        # Keyed by orderId, so a retried order reuses the first run instead of starting another
+        result = trigger_once(
+            ORDER_WORKFLOW_ID,
+            ORDER_DATA,
+            key=f"order:{ORDER_DATA['orderId']}",
         )
 
-        print(f"Order processing workflow started! Tracking ID: {response.analytics_id}")
+        if result.duplicate:
+            print(f"Order already being processed! Tracking ID: {result.analytics_id}")
+        else:
+            print(f"Order processing workflow started! Tracking ID: {result.analytics_id}")
+        return result
     except Exception as error:
         print(f"Error triggering order processing workflow: {error}")
+        if is_transient(error):
+            # Hand it to the outbox so the dispatcher retries it instead of dropping the order
+            queue_ecommerce_order()
+
 
+def queue_ecommerce_order(order: Dict[str, Any] = ORDER_DATA) -> int:
+    """Queue the order processing workflow in the local outbox instead of calling the API inline."""
+    # The outbox dispatcher sends it (and retries it) in the background
+    outbox_id = get_outbox().enqueue(ORDER_WORKFLOW_ID, order)
+    print(f"Order processing workflow queued! Outbox ID: {outbox_id}")
+    return outbox_id
 
-def trigger_data_analysis() -> None:
+
+def trigger_data_analysis() -> Any:
     """Trigger data analysis workflow with analysis parameters."""
-    # Initialize the WorqHat client
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),  # Defaults to production
-    )
+    # Get the shared WorqHat client
+    client = get_client()
 
     try:
         # Trigger the data analysis workflow with analysis parameters
         response = client.flows.trigger_with_payload(
-            "data-analysis-workflow-id",
-            body={
-                "datasetId": "DS-456",
-                "analysisParameters": {
-                    "timeRange": {"start": "2025-01-01", "end": "2025-07-31"},
-                    "metrics": ["revenue", "user_growth", "conversion_rate"],
-                    "segmentation": ["region", "device_type", "user_tier"],
-                    "comparisonPeriod": "previous_quarter",
-                },
-                "outputFormat": "pdf",
-                "notifyEmail": "reports@yourcompany.com",
-            },
+            ANALYSIS_WORKFLOW_ID,
+            body=ANALYSIS_DATA,
         )
 
         print(f"Data analysis workflow started! Tracking ID: {response.analytics_id}")
+        return response
     except Exception as error:
         print(f"Error triggering data analysis workflow: {error}")
 
 
-def trigger_flow_json() -> None:
-    """Run all workflow trigger examples."""
-    onboard_new_customer()
-    process_ecommerce_order()
-    trigger_data_analysis()
-
+def trigger_flow_json() -> Dict[str, Any]:
+    """Run all workflow trigger examples concurrently."""
+    return run_concurrently({
+        "onboard_new_customer": onboard_new_customer,
+        "process_ecommerce_order": process_ecommerce_order,
+        "trigger_data_analysis": trigger_data_analysis,
+    }, none_is_error=True)
+
+
+async def trigger_flow_json_async() -> Dict[str, Any]:
+    """Run all workflow trigger examples concurrently on the event loop.
+
+    Triggers go through the shared scheduler: onboarding is latency-sensitive
+    and jumps the queue, bulk analysis only takes capacity nobody else needs.
+    """
+    scheduler = get_trigger_scheduler()
+    return await gather_concurrently({
+        "onboard_new_customer": lambda: scheduler.trigger(ONBOARDING_WORKFLOW_ID, CUSTOMER_DATA, "high"),
+        "process_ecommerce_order": lambda: trigger_once_async(
+            ORDER_WORKFLOW_ID, ORDER_DATA, key=f"order:{ORDER_DATA['orderId']}", client=scheduler
+        ),
+        "trigger_data_analysis": lambda: scheduler.trigger(ANALYSIS_WORKFLOW_ID, ANALYSIS_DATA, "low"),
+    })
+
+
+async def process_ecommerce_orders_async(orders: Iterable[Dict[str, Any]]) -> TriggerBatchReport:
+    """Trigger the order processing workflow once per order, many at a time."""
+    report = await trigger_batch((ORDER_WORKFLOW_ID, order) for order in orders)
+    print(f"Triggered {report.succeeded} order workflows ({report.failed} failed) "
+          f"at {report.triggers_per_second:.0f}/s")
+    return report
@@ -1,3 +1,4 @@
+from ..async_client import get_async_client
 from ..client import client
 
 
@@ -5,3 +6,7 @@ def check_health():
     """Call WorqHat health endpoint."""
     return client.health.check()
 
+
+async def check_health_async():
+    """Call WorqHat health endpoint without blocking the event loop."""
+    return await get_async_client().check_health()
@@ -1,3 +1,4 @@
+from ..async_client import get_async_client
 from ..client import client
 
 
@@ -5,3 +6,7 @@ def check_status():
     """Fetch WorqHat server info."""
     return client.get_server_info()
 
+
+async def check_status_async():
+    """Fetch WorqHat server info without blocking the event loop."""
+    return await get_async_client().get_server_info()
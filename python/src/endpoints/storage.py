@@ -1,13 +1,9 @@
-import os
-from worqhat import Worqhat
+from ..client_pool import get_client
 
 
 def upload_document() -> None:
     """Upload a file with an auto-generated path."""
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),
-    )
+    client = get_client()
     try:
         # Assuming 'document.pdf' exists in the current directory for testing
         with open('document.pdf', 'rb') as file:
@@ -28,10 +24,7 @@ def upload_document() -> None:
 
 def upload_invoice() -> None:
     """Upload an invoice to an organized path structure."""
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),
-    )
+    client = get_client()
     try:
         # Assuming 'invoice_001.pdf' exists in the current directory for testing
         with open('invoice_001.pdf', 'rb') as file:
@@ -50,10 +43,7 @@ def upload_invoice() -> None:
 
 def fetch_file_by_id(file_id: str) -> None:
     """Fetch a file from storage using its unique ID."""
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),
-    )
+    client = get_client()
     try:
         response = client.storage.retrieve_file_by_id(file_id)
 
@@ -70,10 +60,7 @@ def fetch_file_by_id(file_id: str) -> None:
 
 def fetch_file_by_path(filepath: str) -> None:
     """Fetch a file from storage using its path."""
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),
-    )
+    client = get_client()
     try:
         response = client.storage.retrieve_file_by_path(filepath=filepath)
 
@@ -90,10 +77,7 @@ def fetch_file_by_path(filepath: str) -> None:
 
 def delete_file_by_id(file_id: str) -> None:
     """Delete a file from storage using its unique ID."""
-    client = Worqhat(
-        api_key=os.environ.get("WORQHAT_API_KEY"),
-        environment=os.environ.get("WORQHAT_ENVIRONMENT", "production"),
-    )
+    client = get_client()
     try:
         response = client.storage.delete_file_by_id(file_id)
 
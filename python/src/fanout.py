@@ -0,0 +1,65 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# Upper bound on sub-calls a single aggregate keeps in flight at once.
+DEFAULT_CONCURRENCY = int(os.environ.get("WORQHAT_FANOUT_CONCURRENCY", "8"))
+
+
+# Reported for calls that returned None when ``none_is_error`` is set
+NO_RESULT_ERROR = "No result; the call handled its own error"
+
+
+def _error(e: Exception) -> Dict[str, str]:
+    return {"error": str(e)}
+
+
+def run_concurrently(
+    calls: Dict[str, Callable[[], Any]],
+    limit: Optional[int] = None,
+    none_is_error: bool = False,
+) -> Dict[str, Any]:
+    """Run independent blocking calls on a bounded thread pool.
+
+    Results come back keyed by name in the order ``calls`` was given. A call that
+    raises is reported as ``{"error": ...}`` without affecting its siblings.
+    The sync example helpers catch their own exceptions and return None, so
+    pass ``none_is_error=True`` to report a None result as an error too.
+    """
+    if not calls:
+        return {}
+    workers = max(1, min(limit or DEFAULT_CONCURRENCY, len(calls)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {name: pool.submit(call) for name, call in calls.items()}
+        results: Dict[str, Any] = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+                if results[name] is None and none_is_error:
+                    results[name] = {"error": NO_RESULT_ERROR}
+            except Exception as e:
+                results[name] = _error(e)
+        return results
+
+
+async def gather_concurrently(
+    calls: Dict[str, Callable[[], Awaitable[Any]]],
+    limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Await independent coroutines with at most ``limit`` in flight.
+
+    The async counterpart of :func:`run_concurrently`: ordered results, and
+    per-call errors captured as ``{"error": ...}``.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit or DEFAULT_CONCURRENCY))
+
+    async def run(call: Callable[[], Awaitable[Any]]) -> Any:
+        async with semaphore:
+            try:
+                return await call()
+            except Exception as e:
+                return _error(e)
+
+    outcomes = await asyncio.gather(*(run(call) for call in calls.values()))
+    return dict(zip(calls.keys(), outcomes))
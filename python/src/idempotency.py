@@ -0,0 +1,195 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .async_client import AsyncClient, get_async_client
+from .batch_trigger import analytics_id_of
+from .client_pool import get_client
+
+DEFAULT_IDEMPOTENCY_TTL = float(os.environ.get("WORQHAT_IDEMPOTENCY_TTL", "3600"))
+DEFAULT_IDEMPOTENCY_SIZE = int(os.environ.get("WORQHAT_IDEMPOTENCY_SIZE", "10000"))
+
+
+def _file_digest(file: Any) -> str:
+    """Hash a file's content without moving its read position."""
+    digest = hashlib.sha256()
+    position = file.tell()
+    try:
+        for block in iter(lambda: file.read(1 << 16), b""):
+            digest.update(block if isinstance(block, bytes) else block.encode("utf-8"))
+    finally:
+        file.seek(position)
+    return digest.hexdigest()
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return {"sha256": hashlib.sha256(value).hexdigest()}
+    if hasattr(value, "read") and hasattr(value, "seek") and hasattr(value, "tell"):
+        return {"sha256": _file_digest(value)}
+    return str(value)
+
+
+def idempotency_key(workflow_id: str, payload: Dict[str, Any]) -> str:
+    """``workflow_id`` plus a hash of the payload as canonical JSON (files hashed by content)."""
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=_canonical)
+    return f"{workflow_id}:{hashlib.sha256(body.encode('utf-8')).hexdigest()}"
+
+
+class IdempotencyStore:
+    """Recently triggered idempotency keys and their ``analytics_id``, with a TTL and an LRU bound.
+
+    Only successful triggers are remembered, so a failed trigger can be
+    retried. The store is per process: it stops duplicates from retries and
+    repeated requests here, not across machines.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_IDEMPOTENCY_TTL,
+        max_entries: int = DEFAULT_IDEMPOTENCY_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()
+        # Triggers in flight per key, so concurrent duplicates share one call
+        self._inflight: Dict[str, "asyncio.Future[Optional[str]]"] = {}
+        self._lock = threading.Lock()
+        self.duplicates = 0
+
+    def get(self, key: str) -> Tuple[bool, Optional[str]]:
+        """``(found, analytics_id)`` for ``key``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= self._clock():
+                self._entries.pop(key, None)
+                return False, None
+            self._entries.move_to_end(key)
+            self.duplicates += 1
+            return True, entry[0]
+
+    def put(self, key: str, analytics_id: Optional[str]) -> None:
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (analytics_id, self._clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._inflight.clear()
+            self.duplicates = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_store = IdempotencyStore()
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    return _store
+
+
+def clear_idempotency() -> None:
+    _store.clear()
+
+
+@dataclass
+class TriggerOnceResult:
+    analytics_id: Optional[str]
+    key: str
+    # True when an earlier trigger with the same key was reused
+    duplicate: bool = False
+    # The SDK response; None for duplicates
+    response: Any = None
+
+
+def trigger_once(
+    workflow_id: str,
+    payload: Dict[str, Any],
+    key: Optional[str] = None,
+    with_file: bool = False,
+    client: Any = None,
+    store: Optional[IdempotencyStore] = None,
+) -> TriggerOnceResult:
+    """Trigger a workflow unless the same key was triggered within the store's TTL.
+
+    ``key`` defaults to :func:`idempotency_key` of the workflow and payload; pass
+    a business key (e.g. ``"order:ORD-12345"``) when payloads can differ
+    between retries. ``with_file`` uses ``trigger_with_file`` instead of
+    ``trigger_with_payload``.
+    """
+    key = key or idempotency_key(workflow_id, payload)
+    store = store if store is not None else get_idempotency_store()
+    found, analytics_id = store.get(key)
+    if found:
+        return TriggerOnceResult(analytics_id, key, duplicate=True)
+    client = client or get_client()
+    if with_file:
+        response = client.flows.trigger_with_file(workflow_id, payload)
+    else:
+        response = client.flows.trigger_with_payload(workflow_id, body=payload)
+    analytics_id = analytics_id_of(response)
+    store.put(key, analytics_id)
+    return TriggerOnceResult(analytics_id, key, response=response)
+
+
+async def trigger_once_async(
+    workflow_id: str,
+    payload: Dict[str, Any],
+    key: Optional[str] = None,
+    with_file: bool = False,
+    client: Optional[AsyncClient] = None,
+    store: Optional[IdempotencyStore] = None,
+) -> TriggerOnceResult:
+    """Async counterpart of :func:`trigger_once`; concurrent calls with one key share a single trigger."""
+    key = key or idempotency_key(workflow_id, payload)
+    store = store if store is not None else get_idempotency_store()
+    found, analytics_id = store.get(key)
+    if found:
+        return TriggerOnceResult(analytics_id, key, duplicate=True)
+    inflight = store._inflight.get(key)
+    if inflight is not None:
+        analytics_id = await asyncio.shield(inflight)
+        with store._lock:
+            store.duplicates += 1
+        return TriggerOnceResult(analytics_id, key, duplicate=True)
+
+    future: "asyncio.Future[Optional[str]]" = asyncio.get_running_loop().create_future()
+    store._inflight[key] = future
+    try:
+        client = client or get_async_client()
+        if with_file:
+            response = await client.trigger_with_file(workflow_id, payload)
+        else:
+            response = await client.trigger_with_payload(workflow_id, payload)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Waiters see the error; nobody else has to retrieve it
+        future.exception()
+        raise
+    finally:
+        store._inflight.pop(key, None)
+    analytics_id = analytics_id_of(response)
+    store.put(key, analytics_id)
+    future.set_result(analytics_id)
+    return TriggerOnceResult(analytics_id, key, response=response)
@@ -0,0 +1,177 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Protocol
+
+# "ulid" (default) or "snowflake"; see get_id_generator().
+DEFAULT_SCHEME = os.environ.get("WORQHAT_ID_SCHEME", "ulid")
+
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+# Every pair of base32 digits, so 10 bits are encoded per lookup
+_PAIRS = [a + b for a in _CROCKFORD for b in _CROCKFORD]
+_RANDOM_BITS = 80
+_RANDOM_LIMIT = 1 << _RANDOM_BITS
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def _encode_time(ms: int) -> str:
+    """48-bit millisecond timestamp as 10 Crockford base32 digits."""
+    return (_CROCKFORD[(ms >> 45) & 31] + _PAIRS[(ms >> 35) & 1023] + _PAIRS[(ms >> 25) & 1023]
+            + _PAIRS[(ms >> 15) & 1023] + _PAIRS[(ms >> 5) & 1023] + _CROCKFORD[ms & 31])
+
+
+def _encode_random(r: int) -> str:
+    """80 random bits as 16 Crockford base32 digits."""
+    return (_PAIRS[r >> 70] + _PAIRS[(r >> 60) & 1023] + _PAIRS[(r >> 50) & 1023] + _PAIRS[(r >> 40) & 1023]
+            + _PAIRS[(r >> 30) & 1023] + _PAIRS[(r >> 20) & 1023] + _PAIRS[(r >> 10) & 1023] + _PAIRS[r & 1023])
+
+
+class IdGenerator(Protocol):
+    def new_id(self) -> str: ...
+
+    def new_ids(self, count: int) -> List[str]: ...
+
+
+class UlidGenerator:
+    """Monotonic ULIDs: 48-bit millisecond time + 80 random bits, 26 characters.
+
+    IDs sort by creation time. Within one millisecond the random part is
+    incremented instead of redrawn, so IDs from this generator are strictly
+    increasing even under heavy concurrency. Separate processes draw their own
+    80 random bits per millisecond, which makes a cross-process clash
+    negligible without any coordination.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._reset()
+        if hasattr(os, "register_at_fork"):
+            # A forked child must not continue the parent's sequence
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._last_ms = -1
+        self._random = 0
+        self._prefix = ""
+
+    def _next(self, count: int) -> List[str]:
+        ids: List[str] = []
+        with self._lock:
+            ms = _now_ms()
+            if ms > self._last_ms:
+                self._last_ms = ms
+                self._prefix = _encode_time(ms)
+                # Leave headroom so a burst within one millisecond rarely overflows
+                self._random = int.from_bytes(os.urandom(10), "big") >> 1
+            else:
+                self._random += 1
+            prefix, r = self._prefix, self._random
+            for _ in range(count):
+                if r >= _RANDOM_LIMIT:
+                    # Random part exhausted: borrow the next millisecond
+                    self._last_ms += 1
+                    self._prefix = prefix = _encode_time(self._last_ms)
+                    r = int.from_bytes(os.urandom(10), "big") >> 1
+                ids.append(prefix + _encode_random(r))
+                r += 1
+            self._random = r - 1
+        return ids
+
+    def new_id(self) -> str:
+        return self._next(1)[0]
+
+    def new_ids(self, count: int) -> List[str]:
+        """Reserve ``count`` consecutive IDs under a single lock acquisition."""
+        return self._next(count) if count > 0 else []
+
+
+class SnowflakeGenerator:
+    """Snowflake-style 64-bit IDs: 41-bit ms since ``epoch_ms``, 10-bit worker, 12-bit sequence.
+
+    IDs are shorter than ULIDs and numeric, but are only unique across processes
+    if every process gets its own ``worker_id`` (0-1023), e.g. via
+    ``WORQHAT_ID_WORKER``. Up to 4096 IDs per millisecond per worker; past that
+    the generator borrows the next millisecond rather than sleeping.
+    """
+
+    EPOCH_MS = 1_704_067_200_000  # 2024-01-01T00:00:00Z
+
+    def __init__(self, worker_id: Optional[int] = None, epoch_ms: int = EPOCH_MS) -> None:
+        if worker_id is None:
+            worker_id = int(os.environ.get("WORQHAT_ID_WORKER", str(os.getpid())))
+        self.worker_id = worker_id & 1023
+        self.epoch_ms = epoch_ms
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._sequence = 0
+
+    def _next(self, count: int) -> List[str]:
+        ids: List[str] = []
+        with self._lock:
+            ms = _now_ms() - self.epoch_ms
+            if ms > self._last_ms:
+                self._last_ms, self._sequence = ms, 0
+            for _ in range(count):
+                if self._sequence > 4095:
+                    self._last_ms += 1
+                    self._sequence = 0
+                ids.append(str((self._last_ms << 22) | (self.worker_id << 12) | self._sequence))
+                self._sequence += 1
+        return ids
+
+    def new_id(self) -> str:
+        return self._next(1)[0]
+
+    def new_ids(self, count: int) -> List[str]:
+        return self._next(count) if count > 0 else []
+
+
+_GENERATORS = {"ulid": UlidGenerator, "snowflake": SnowflakeGenerator}
+_generator: Optional[IdGenerator] = None
+_generator_lock = threading.Lock()
+
+
+def get_id_generator() -> IdGenerator:
+    """Return the process-wide generator, built from ``WORQHAT_ID_SCHEME`` on first use."""
+    global _generator
+    if _generator is None:
+        with _generator_lock:
+            if _generator is None:
+                if DEFAULT_SCHEME not in _GENERATORS:
+                    raise ValueError(f"Unknown WORQHAT_ID_SCHEME {DEFAULT_SCHEME!r}; expected one of {sorted(_GENERATORS)}")
+                _generator = _GENERATORS[DEFAULT_SCHEME]()
+    return _generator
+
+
+def set_id_generator(generator: Optional[IdGenerator]) -> None:
+    """Swap in a custom generator (or ``None`` to fall back to the default)."""
+    global _generator
+    with _generator_lock:
+        _generator = generator
+
+
+def new_id(prefix: str = "") -> str:
+    """A new documentId, e.g. ``new_id("prod_")`` -> ``"prod_01J9Z3..."``."""
+    return prefix + get_id_generator().new_id()
+
+
+def new_ids(count: int, prefix: str = "") -> List[str]:
+    return [prefix + value for value in get_id_generator().new_ids(count)]
+
+
+def with_document_ids(rows: Iterable[Dict[str, Any]], prefix: str = "", block: int = 256) -> Iterator[Dict[str, Any]]:
+    """Yield ``rows`` with a locally generated ``documentId`` on any row that lacks one.
+
+    IDs are reserved ``block`` at a time, so large generators stay cheap and lazy.
+    """
+    pending: List[str] = []
+    for row in rows:
+        if row.get("documentId") is None:
+            if not pending:
+                pending = new_ids(block, prefix)
+                pending.reverse()
+            row = {**row, "documentId": pending.pop()}
+        yield row
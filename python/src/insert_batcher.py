@@ -0,0 +1,110 @@
+import asyncio
+import os
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .async_client import AsyncClient, get_async_client
+
+DEFAULT_MAX_ROWS = int(os.environ.get("WORQHAT_INSERT_BATCH_ROWS", "100"))
+DEFAULT_MAX_DELAY_MS = float(os.environ.get("WORQHAT_INSERT_BATCH_DELAY_MS", "50"))
+
+
+def document_id_of(record: Any) -> Any:
+    """documentId of an inserted record (SDK model or plain dict)."""
+    if isinstance(record, dict):
+        return record.get("documentId")
+    return getattr(record, "documentId", None)
+
+
+def records_of(response: Any) -> List[Any]:
+    data = response.get("data") if isinstance(response, dict) else getattr(response, "data", None)
+    if data is None:
+        return []
+    return data if isinstance(data, list) else [data]
+
+
+class InsertBatcher:
+    """Write-behind micro-batcher for single-row ``insert_record`` calls.
+
+    Rows are queued per table and sent as one list insert when ``max_rows`` are
+    waiting or ``max_delay_ms`` has passed since the first queued row, whichever
+    comes first. Each caller gets a future resolving to its own row's
+    ``documentId``; if a batch fails, every row in it fails with that error.
+    """
+
+    def __init__(
+        self,
+        client: Optional[AsyncClient] = None,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        max_delay_ms: float = DEFAULT_MAX_DELAY_MS,
+    ) -> None:
+        if max_rows <= 0:
+            raise ValueError("max_rows must be positive")
+        self._client = client
+        self.max_rows = max_rows
+        self.max_delay = max_delay_ms / 1000.0
+        self._pending: Dict[str, List[Tuple[Dict[str, Any], "asyncio.Future[Any]"]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._flushes: Set["asyncio.Task[None]"] = set()
+        self.batches_sent = 0
+        self.rows_sent = 0
+
+    @property
+    def client(self) -> AsyncClient:
+        if self._client is None:
+            self._client = get_async_client()
+        return self._client
+
+    def submit(self, table: str, row: Dict[str, Any]) -> "asyncio.Future[Any]":
+        """Queue ``row`` for ``table`` and return a future for its documentId."""
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[Any]" = loop.create_future()
+        queue = self._pending.setdefault(table, [])
+        queue.append((row, future))
+        if len(queue) >= self.max_rows:
+            self._start_flush(table)
+        elif table not in self._timers:
+            self._timers[table] = loop.call_later(self.max_delay, self._start_flush, table)
+        return future
+
+    async def insert(self, table: str, row: Dict[str, Any]) -> Any:
+        """Queue ``row`` and wait for its documentId."""
+        return await self.submit(table, row)
+
+    def _start_flush(self, table: str) -> None:
+        timer = self._timers.pop(table, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(table, None)
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._send(table, batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _send(self, table: str, batch: List[Tuple[Dict[str, Any], "asyncio.Future[Any]"]]) -> None:
+        try:
+            response = await self.client.insert_record(table, [row for row, _ in batch])
+            records = records_of(response)
+            if len(records) != len(batch):
+                raise RuntimeError(f"Batch insert into {table} returned {len(records)} records for {len(batch)} rows")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.batches_sent += 1
+        self.rows_sent += len(batch)
+        # The API returns inserted records in request order
+        for (_, future), record in zip(batch, records):
+            if not future.done():
+                future.set_result(document_id_of(record))
+
+    async def flush(self, table: Optional[str] = None) -> None:
+        """Send queued rows now (for one table or all) and wait for in-flight batches."""
+        for name in [table] if table is not None else list(self._pending):
+            self._start_flush(name)
+        if self._flushes:
+            await asyncio.gather(*list(self._flushes), return_exceptions=True)
+
+    async def aclose(self) -> None:
+        await self.flush()
@@ -0,0 +1,240 @@
+import bisect
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# Upper bounds of the histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+SIZE_BUCKETS_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+ENABLED = os.environ.get("WORQHAT_LATENCY_METRICS", "1") != "0"
+# Share of calls whose payloads are re-serialized to measure their size; off by default
+PAYLOAD_SAMPLE_RATE = float(os.environ.get("WORQHAT_LATENCY_PAYLOAD_SAMPLE", "0"))
+
+
+class Histogram:
+    """Fixed-bucket histogram with count/sum/min/max and bucket-interpolated quantiles."""
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                low = self.bounds[index - 1] if index > 0 else 0.0
+                high = self.bounds[index] if index < len(self.bounds) else self.max
+                value = low + (high - low) * (rank - seen) / count
+                return min(max(value, self.min), self.max)
+            seen += count
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": {
+                **{f"le_{bound}": count for bound, count in zip(self.bounds, self.counts)},
+                "inf": self.counts[-1],
+            },
+        }
+
+
+_SERIES = {
+    "wall_ms": LATENCY_BUCKETS_MS,
+    "server_ms": LATENCY_BUCKETS_MS,
+    "overhead_ms": LATENCY_BUCKETS_MS,
+    "request_bytes": SIZE_BUCKETS_BYTES,
+    "response_bytes": SIZE_BUCKETS_BYTES,
+}
+
+
+class _CallStats:
+    def __init__(self) -> None:
+        self.series = {name: Histogram(bounds) for name, bounds in _SERIES.items()}
+        self.errors = 0
+        self.cache_hits = 0
+
+
+class LatencyRecorder:
+    """Per ``(operation, table)`` histograms of where the time of a WorqHat call goes.
+
+    For every call it records client wall time, the server-reported execution
+    time, their difference (network, SQL generation, JSON encode/decode and SDK
+    parsing) and, when known or sampled, request/response payload sizes. Calls answered from a local
+    cache are only counted, since they never reach the network.
+    """
+
+    def __init__(self) -> None:
+        self._stats: Dict[Tuple[str, str], _CallStats] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, operation: str, table: str) -> _CallStats:
+        key = (operation, table)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats.setdefault(key, _CallStats())
+        return stats
+
+    def record(
+        self,
+        operation: str,
+        table: str,
+        wall_ms: float,
+        server_ms: Optional[float] = None,
+        request_bytes: Optional[int] = None,
+        response_bytes: Optional[int] = None,
+    ) -> None:
+        with self._lock:
+            series = self._get(operation, table).series
+            series["wall_ms"].observe(wall_ms)
+            if server_ms is not None:
+                series["server_ms"].observe(server_ms)
+                series["overhead_ms"].observe(max(0.0, wall_ms - server_ms))
+            if request_bytes is not None:
+                series["request_bytes"].observe(request_bytes)
+            if response_bytes is not None:
+                series["response_bytes"].observe(response_bytes)
+
+    def record_error(self, operation: str, table: str) -> None:
+        with self._lock:
+            self._get(operation, table).errors += 1
+
+    def record_cache_hit(self, operation: str, table: str) -> None:
+        with self._lock:
+            self._get(operation, table).cache_hits += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """``{table: {operation: {"errors", "cache_hits", <series>: summary}}}``."""
+        with self._lock:
+            result: Dict[str, Dict[str, Any]] = {}
+            for (operation, table), stats in sorted(self._stats.items()):
+                result.setdefault(table, {})[operation] = {
+                    "errors": stats.errors,
+                    "cache_hits": stats.cache_hits,
+                    **{name: histogram.summary() for name, histogram in stats.series.items()},
+                }
+            return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+_recorder = LatencyRecorder()
+
+
+def get_latency_recorder() -> LatencyRecorder:
+    return _recorder
+
+
+def clear_latency() -> None:
+    _recorder.clear()
+
+
+def table_label(tables: Iterable[str]) -> str:
+    names = sorted(tables)
+    return ",".join(names) if names else "unknown"
+
+
+def server_time_ms(response: Any) -> Optional[float]:
+    """Server-reported execution time, whichever spelling the response uses."""
+    for name in ("execution_time", "executionTime"):
+        value = response.get(name) if isinstance(response, dict) else getattr(response, name, None)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+    return None
+
+
+def content_length(response: Any) -> Optional[int]:
+    """Size the server reported for a raw HTTP response, without reading the body again."""
+    headers = getattr(response, "headers", None)
+    value = headers.get("content-length") if headers is not None and hasattr(headers, "get") else None
+    return int(value) if isinstance(value, str) and value.isdigit() else None
+
+
+def payload_bytes(payload: Any) -> Optional[int]:
+    """Size of ``payload`` as JSON; SDK models are dumped the way they came over the wire."""
+    if payload is None:
+        return None
+    try:
+        dump = getattr(payload, "model_dump_json", None)
+        if callable(dump):
+            return len(dump(by_alias=True))
+        return len(json.dumps(payload, default=str))
+    except Exception:
+        return None
+
+
+def record_call(
+    operation: str,
+    tables: Iterable[str],
+    started: float,
+    response: Any,
+    request: Any = None,
+    recorder: Optional[LatencyRecorder] = None,
+) -> None:
+    """Record a finished call that began at ``started`` (a ``time.perf_counter()`` value)."""
+    if not ENABLED:
+        return
+    wall_ms = (time.perf_counter() - started) * 1000
+    request_bytes = None
+    response_bytes = content_length(response)
+    # Serializing a large result again can cost more than the call being measured
+    if PAYLOAD_SAMPLE_RATE > 0 and random.random() < PAYLOAD_SAMPLE_RATE:
+        request_bytes = payload_bytes(request)
+        if response_bytes is None:
+            response_bytes = payload_bytes(response)
+    (recorder or _recorder).record(
+        operation,
+        table_label(tables),
+        wall_ms,
+        server_ms=server_time_ms(response),
+        request_bytes=request_bytes,
+        response_bytes=response_bytes,
+    )
+
+
+def record_failure(operation: str, tables: Iterable[str], recorder: Optional[LatencyRecorder] = None) -> None:
+    if ENABLED:
+        (recorder or _recorder).record_error(operation, table_label(tables))
+
+
+def record_cache_hit(operation: str, tables: Iterable[str], recorder: Optional[LatencyRecorder] = None) -> None:
+    if ENABLED:
+        (recorder or _recorder).record_cache_hit(operation, table_label(tables))
+
+
+def timed_call(operation: str, tables: Iterable[str], call: Callable[..., Any], **request: Any) -> Any:
+    """Run a blocking SDK ``call(**request)`` and record its latency breakdown."""
+    started = time.perf_counter()
+    try:
+        response = call(**request)
+    except Exception:
+        record_failure(operation, tables)
+        raise
+    record_call(operation, tables, started, response, request)
+    return response
@@ -0,0 +1,321 @@
+"""Stream a CSV or JSONL export into a WorqHat table.
+
+Usage (from the python/ folder):
+
+    python -m src.loaders exports/products.csv --table products \\
+        --type price=float --type inStock=bool --type stock=int
+
+Rows are parsed lazily and handed to :func:`src.bulk_insert.bulk_insert`, which
+only pulls the next chunk when an upload slot frees up, so memory stays flat no
+matter how large the file is. Progress is checkpointed as a row offset; rerun
+the same command after a crash to pick up where it stopped. Rows that can't be
+parsed go to the rejects file with their error instead of stopping the load.
+"""
+
+import argparse
+import asyncio
+import bisect
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from .async_client import AsyncClient, close_async_clients
+from .bulk_insert import DEFAULT_CONCURRENCY, DEFAULT_MAX_RETRIES, ChunkResult, ChunkSizer, bulk_insert
+
+_TRUE = {"true", "1", "yes", "y", "t"}
+_FALSE = {"false", "0", "no", "n", "f"}
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"Not a boolean: {value!r}")
+
+
+def _to_json(value: Any) -> Any:
+    return json.loads(value) if isinstance(value, str) else value
+
+
+CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "str": str,
+    "int": lambda value: int(float(value)) if isinstance(value, str) and "." in value else int(value),
+    "float": float,
+    "bool": _to_bool,
+    "json": _to_json,
+}
+
+
+def parse_types(specs: List[str]) -> Dict[str, Callable[[Any], Any]]:
+    """Turn ``["price=float", "inStock=bool"]`` into per-column converters."""
+    types: Dict[str, Callable[[Any], Any]] = {}
+    for spec in specs:
+        column, sep, kind = spec.partition("=")
+        if not sep or kind not in CONVERTERS:
+            raise argparse.ArgumentTypeError(
+                f"Bad --type {spec!r}; expected column=<{'|'.join(CONVERTERS)}>"
+            )
+        types[column] = CONVERTERS[kind]
+    return types
+
+
+def convert_row(row: Dict[str, Any], types: Dict[str, Callable[[Any], Any]]) -> Dict[str, Any]:
+    for column, convert in types.items():
+        value = row.get(column)
+        if value is None or value == "":
+            # Empty CSV cells become nulls for typed columns
+            if column in row:
+                row[column] = None
+            continue
+        row[column] = convert(value)
+    return row
+
+
+# Called with (row index after the skip, the raw row or line, the error) for rows that can't be parsed
+RowRejectHandler = Callable[[int, Any, Exception], None]
+
+
+def read_rows(
+    path: str,
+    fmt: str,
+    types: Dict[str, Callable[[Any], Any]],
+    skip: int = 0,
+    on_reject: Optional[RowRejectHandler] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield typed rows from ``path`` one at a time, skipping the first ``skip`` rows.
+
+    A row that fails to parse or convert raises, unless ``on_reject`` is given,
+    in which case it is handed the raw row and the error and reading goes on.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        if fmt == "csv":
+            raw_rows: Iterator[Any] = csv.DictReader(file)
+        else:
+            raw_rows = (line for line in file if line.strip())
+        for index, raw in enumerate(itertools.islice(raw_rows, skip, None)):
+            try:
+                parsed = json.loads(raw) if fmt != "csv" else raw
+                if not isinstance(parsed, dict):
+                    raise ValueError(f"Expected a JSON object, got {type(parsed).__name__}")
+                # Rejects get the row as read, before conversion
+                raw = dict(parsed)
+                row = convert_row(parsed, types)
+            except (TypeError, ValueError) as e:
+                if on_reject is None:
+                    raise
+                on_reject(index, raw, e)
+                continue
+            yield row
+
+
+def _runs(positions: List[int]) -> Iterator[Tuple[int, int]]:
+    """``(start, length)`` of each run of consecutive positions."""
+    start = previous = positions[0]
+    for position in positions[1:]:
+        if position != previous + 1:
+            yield start, previous - start + 1
+            start = position
+        previous = position
+    yield start, previous - start + 1
+
+
+def detect_format(path: str) -> str:
+    lower = path.lower()
+    if lower.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if lower.endswith(".csv"):
+        return "csv"
+    raise SystemExit(f"Can't tell the format of {path}; pass --format csv or --format jsonl")
+
+
+class Checkpoint:
+    """Row-offset checkpoint written atomically next to the source file.
+
+    Chunks can finish out of order, so the saved offset is the end of the longest
+    run of settled chunks starting at the current offset. After a crash, rows past
+    it are sent again (at-least-once), bounded by the chunks that were in flight.
+    """
+
+    def __init__(self, path: str, source: str, table: str) -> None:
+        self.path = path
+        self.source = os.path.abspath(source)
+        self.table = table
+        self.offset = 0
+        self._settled: Dict[int, int] = {}
+
+    def load(self) -> int:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            return 0
+        if state.get("source") != self.source or state.get("table") != self.table:
+            raise SystemExit(f"Checkpoint {self.path} belongs to a different load; pass --restart to discard it")
+        self.offset = int(state.get("offset", 0))
+        return self.offset
+
+    def settle(self, start: int, size: int) -> bool:
+        """Mark rows ``[start, start + size)`` as done; returns True if the offset moved."""
+        self._settled[start] = size
+        moved = False
+        while self.offset in self._settled:
+            self.offset += self._settled.pop(self.offset)
+            moved = True
+        if moved:
+            self.save()
+        return moved
+
+    def save(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as file:
+            json.dump({"source": self.source, "table": self.table, "offset": self.offset}, file)
+        os.replace(tmp, self.path)
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+async def load_file(
+    path: str,
+    table: str,
+    fmt: Optional[str] = None,
+    types: Optional[Dict[str, Callable[[Any], Any]]] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    chunk_size: int = 500,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    checkpoint_path: Optional[str] = None,
+    restart: bool = False,
+    rejects_path: Optional[str] = None,
+    progress_every: float = 5.0,
+    client: Optional[AsyncClient] = None,
+) -> int:
+    """Load ``path`` into ``table``; returns the number of rejected rows."""
+    fmt = fmt or detect_format(path)
+    checkpoint = Checkpoint(checkpoint_path or f"{path}.checkpoint", path, table)
+    rejects_path = rejects_path or f"{path}.rejects.jsonl"
+    if restart:
+        checkpoint.clear()
+    skip = checkpoint.load()
+    if skip:
+        print(f"Resuming {path} at row {skip}")
+
+    started = time.perf_counter()
+    state = {"done": 0, "rejected": 0, "last_report": started, "bad_before_window": 0}
+    # Rows sent before each unparseable row past the checkpoint, to map chunk
+    # positions back to file rows; earlier ones only survive as a count
+    sent_before_bad: List[int] = []
+
+    def on_bad_row(index: int, raw: Any, error: Exception) -> None:
+        record = dict(raw) if isinstance(raw, dict) else {"_raw": raw.rstrip("\n")}
+        with open(rejects_path, "a", encoding="utf-8") as rejects:
+            rejects.write(json.dumps({**record, "_reject_error": str(error)}, default=str) + "\n")
+        sent_before_bad.append(index - state["bad_before_window"] - len(sent_before_bad))
+        state["rejected"] += 1
+        print(f"Row {skip + index} can't be parsed ({error}); written to {rejects_path}")
+        settle(skip + index, 1)
+
+    def file_row(sent: int) -> int:
+        return skip + sent + state["bad_before_window"] + bisect.bisect_right(sent_before_bad, sent)
+
+    def settle(start: int, size: int) -> None:
+        if not checkpoint.settle(start, size):
+            return
+        # Every row before the checkpoint is settled, so no chunk still needs those bad rows mapped
+        settled = 0
+        while settled < len(sent_before_bad) and \
+                skip + sent_before_bad[settled] + state["bad_before_window"] + settled < checkpoint.offset:
+            settled += 1
+        if settled:
+            state["bad_before_window"] += settled
+            del sent_before_bad[:settled]
+
+    def on_chunk(chunk: ChunkResult) -> None:
+        if not chunk.ok:
+            # Park rows that exhausted their retries so the load can move on
+            with open(rejects_path, "a", encoding="utf-8") as rejects:
+                for row in chunk.rows or []:
+                    rejects.write(json.dumps(row, default=str) + "\n")
+            state["rejected"] += chunk.size
+            print(f"Chunk at row {file_row(chunk.start)} failed ({chunk.error}); {chunk.size} rows written to {rejects_path}")
+        state["done"] += chunk.size
+        if chunk.size:
+            for start, size in _runs([file_row(sent) for sent in range(chunk.start, chunk.start + chunk.size)]):
+                settle(start, size)
+
+        now = time.perf_counter()
+        if now - state["last_report"] >= progress_every:
+            state["last_report"] = now
+            rate = state["done"] / (now - started)
+            print(f"{skip + state['done']} rows processed ({rate:.0f} rows/s)")
+
+    sizer = ChunkSizer(initial=chunk_size)
+    report = await bulk_insert(
+        table,
+        read_rows(path, fmt, types or {}, skip=skip, on_reject=on_bad_row),
+        concurrency=concurrency,
+        max_retries=max_retries,
+        client=client,
+        sizer=sizer,
+        on_chunk=on_chunk,
+    )
+
+    print(f"Loaded {report.rows_inserted} rows into {table} in {report.seconds:.1f}s "
+          f"({report.rows_per_second:.0f} rows/s), {state['rejected']} rejected")
+    if not report.failed_chunks:
+        checkpoint.clear()
+    return state["rejected"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.loaders", description=__doc__.split("\n\n")[0])
+    parser.add_argument("path", help="CSV or JSONL file to load")
+    parser.add_argument("--table", required=True, help="Destination table")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Input format (default: from extension)")
+    parser.add_argument("--type", action="append", default=[], metavar="COLUMN=TYPE",
+                        help=f"Column conversion, one of {', '.join(CONVERTERS)} (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Chunks uploaded in parallel")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Initial rows per chunk (adapts while loading)")
+    parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES, help="Retries per chunk before rejecting it")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <path>.checkpoint)")
+    parser.add_argument("--rejects", help="Where rows that fail every retry go (default: <path>.rejects.jsonl)")
+    parser.add_argument("--restart", action="store_true", help="Ignore any existing checkpoint")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+
+    async def run() -> int:
+        try:
+            return await load_file(
+                args.path,
+                args.table,
+                fmt=args.format,
+                types=parse_types(args.type),
+                concurrency=args.concurrency,
+                chunk_size=args.chunk_size,
+                max_retries=args.max_retries,
+                checkpoint_path=args.checkpoint,
+                restart=args.restart,
+                rejects_path=args.rejects,
+            )
+        finally:
+            await close_async_clients()
+
+    rejected = asyncio.run(run())
+    return 1 if rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .async_client import AsyncClient, get_async_client
+from .diff_update import invalidate_snapshots
+from .pagination import aiter_query_pages
+from .query_template import compile_query
+from .returning import quote_identifier, summarize, where_clause
+
+DEFAULT_BATCH_SIZE = int(os.environ.get("WORQHAT_DELETE_BATCH_SIZE", "500"))
+# Upper bound on rows deleted per second; 0 disables throttling
+DEFAULT_RATE = float(os.environ.get("WORQHAT_DELETE_RATE", "2000"))
+DEFAULT_MAX_RETRIES = 2
+
+
+@dataclass
+class DeleteProgress:
+    table: str
+    dry_run: bool = False
+    matched: Optional[int] = None
+    deleted: int = 0
+    batches: int = 0
+    # documentId of the last row in the last deleted batch; pass as resume_after to continue
+    cursor: Optional[str] = None
+    seconds: float = 0.0
+    done: bool = False
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.deleted / self.seconds if self.seconds else 0.0
+
+
+class MassDeleteError(RuntimeError):
+    """A batch kept failing; ``progress.cursor`` marks where to resume."""
+
+    def __init__(self, message: str, progress: DeleteProgress) -> None:
+        super().__init__(message)
+        self.progress = progress
+
+
+def _filter(
+    where: Dict[str, Any], condition: Optional[str], condition_params: Optional[Dict[str, Any]]
+) -> Tuple[str, Dict[str, Any]]:
+    params: Dict[str, Any] = {}
+    sql = where_clause(where, params) if where else ""
+    if condition:
+        sql = f"{sql} AND ({condition})" if sql else f"({condition})"
+        params.update(condition_params or {})
+    if not sql:
+        raise ValueError("mass_delete needs a where or a condition")
+    return sql, params
+
+
+async def mass_delete(
+    table: str,
+    where: Dict[str, Any],
+    condition: Optional[str] = None,
+    condition_params: Optional[Dict[str, Any]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    rate: float = DEFAULT_RATE,
+    dry_run: bool = False,
+    resume_after: Optional[str] = None,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    client: Optional[AsyncClient] = None,
+    on_progress: Optional[Callable[[DeleteProgress], None]] = None,
+) -> DeleteProgress:
+    """Delete every row of ``table`` matching ``where`` in bounded, throttled batches.
+
+    Matching documentIds are resolved with a keyset-paginated query, one page
+    of ``batch_size`` per delete, so no single statement touches more than one
+    batch. Each delete re-checks the filter, so rows that stopped matching in
+    the meantime are kept. ``condition`` adds a raw SQL predicate (with
+    ``{named}`` ``condition_params``) for filters that aren't plain equality.
+
+    With ``dry_run`` only the matching rows are counted. ``on_progress`` is
+    called after each batch; a batch that fails ``max_retries`` times raises
+    :class:`MassDeleteError`, whose ``progress.cursor`` can be passed back as
+    ``resume_after``.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+    client = client or get_async_client()
+    sql_table = quote_identifier(table)
+    filter_sql, filter_params = _filter(where, condition, condition_params)
+    progress = DeleteProgress(table=table, dry_run=dry_run, cursor=resume_after)
+    started = time.perf_counter()
+
+    if dry_run:
+        count_query = compile_query(f"SELECT COUNT(*) AS count FROM {sql_table} WHERE {filter_sql}")
+        response = await client.execute_query(count_query, filter_params or None, use_cache=False)
+        progress.matched = summarize(response, "count", "count")["count"]
+        progress.seconds = time.perf_counter() - started
+        progress.done = True
+        return progress
+
+    ids_sql = f'SELECT "documentId" AS doc_id FROM {sql_table} WHERE {filter_sql}'
+    ids_params = dict(filter_params)
+    if resume_after is not None:
+        ids_sql += ' AND "documentId" > {resume_after}'
+        ids_params["resume_after"] = resume_after
+
+    pages = aiter_query_pages(ids_sql, ids_params or None, page_size=batch_size, key_column="doc_id", client=client)
+    try:
+        async for page in pages:
+            ids = [row.get("doc_id") if isinstance(row, dict) else getattr(row, "doc_id") for row in page]
+            params = dict(filter_params, **{f"id_{i}": doc_id for i, doc_id in enumerate(ids)})
+            placeholders = ", ".join(f"{{id_{i}}}" for i in range(len(ids)))
+            delete_query = compile_query(
+                f"WITH _changed AS (DELETE FROM {sql_table} WHERE \"documentId\" IN ({placeholders}) "
+                f"AND {filter_sql} RETURNING 1) SELECT COUNT(*) AS count FROM _changed"
+            )
+
+            batch_started = time.perf_counter()
+            for attempt in range(max_retries + 1):
+                try:
+                    response = await client.execute_query(delete_query, params)
+                    break
+                except Exception as e:
+                    progress.errors.append(str(e))
+                    if attempt == max_retries:
+                        progress.seconds = time.perf_counter() - started
+                        raise MassDeleteError(f"Deleting from {table} failed after {progress.cursor!r}: {e}", progress) from e
+                    await asyncio.sleep(min(0.5 * 2 ** attempt, 8.0))
+
+            progress.deleted += summarize(response, "count", "count")["count"]
+            progress.batches += 1
+            progress.cursor = ids[-1]
+            progress.seconds = time.perf_counter() - started
+            if on_progress is not None:
+                on_progress(progress)
+
+            if rate > 0:
+                # Pace batches so the purge never exceeds `rate` rows per second
+                remaining = len(ids) / rate - (time.perf_counter() - batch_started)
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+    finally:
+        # Stops the prefetched page if a batch gave up
+        await pages.aclose()
+        if progress.batches or progress.errors:
+            invalidate_snapshots(table)
+
+    progress.seconds = time.perf_counter() - started
+    progress.done = True
+    return progress
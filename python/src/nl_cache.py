@@ -0,0 +1,351 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .async_client import AsyncClient, get_async_client
+from .client_pool import get_client
+from .latency import record_cache_hit, timed_call
+from .pagination import rows_of
+from .query_cache import is_read_query, params_key
+from .semantic_cache import SemanticIndex, default_semantic_index
+
+DEFAULT_NL_TTL = float(os.environ.get("WORQHAT_NL_CACHE_TTL", "86400"))
+DEFAULT_NL_SIZE = int(os.environ.get("WORQHAT_NL_CACHE_SIZE", "256"))
+# How long a table's schema version is trusted before it is probed again
+DEFAULT_SCHEMA_CHECK = float(os.environ.get("WORQHAT_SCHEMA_CHECK_SECONDS", "300"))
+DEFAULT_WARMUP_CONCURRENCY = int(os.environ.get("WORQHAT_NL_WARMUP_CONCURRENCY", "4"))
+DEFAULT_WARMUP_TIMEOUT = float(os.environ.get("WORQHAT_NL_WARMUP_TIMEOUT", "60"))
+
+SCHEMA_QUERY = (
+    "SELECT column_name, data_type FROM information_schema.columns "
+    "WHERE table_name = '{table}' ORDER BY column_name"
+)
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """Case, spacing and trailing punctuation don't change what is being asked."""
+    return _SPACE_RE.sub(" ", question).strip().rstrip("?.!").strip().lower()
+
+
+def schema_query(table: str) -> str:
+    """The schema probe for ``table``, with the name as an escaped literal (``execute_query`` takes no params)."""
+    return SCHEMA_QUERY.format(table=table.replace("'", "''"))
+
+
+def schema_version(columns: List[Any]) -> str:
+    """Stable hash of a table's ``information_schema.columns`` rows."""
+    return hashlib.sha1(params_key(columns).encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class CachedNlResult:
+    """What a cache hit returns: rows from re-running the remembered SQL."""
+
+    data: List[Any] = field(default_factory=list)
+    sql: str = ""
+    execution_time: float = 0.0
+    success: bool = True
+    cached: bool = True
+
+
+class NlSqlCache:
+    """Generated SQL per (normalized question, table), tied to the table's schema version.
+
+    An entry is only served while the table's schema version matches the one it
+    was generated against, so a migration makes every question about that table
+    go back through ``process_nl_query``. With a ``semantic`` index, a question
+    that misses exactly can still reuse the SQL of a near-duplicate one; each
+    semantic entry expires with, and is evicted along with, its exact entry.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_NL_TTL,
+        max_entries: int = DEFAULT_NL_SIZE,
+        schema_check_seconds: float = DEFAULT_SCHEMA_CHECK,
+        clock: Callable[[], float] = time.monotonic,
+        semantic: Optional[SemanticIndex] = None,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.schema_check_seconds = schema_check_seconds
+        self.semantic = semantic
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, str, float]]" = OrderedDict()
+        self._versions: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, question: str, table: str, version: str) -> Optional[str]:
+        key = (normalize_question(question), table.lower())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[1] != version or entry[2] <= self._clock()):
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        similar = self.semantic.lookup(question, table, version, self._clock()) if self.semantic is not None else None
+        with self._lock:
+            if similar is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return similar[0]
+
+    def put(self, question: str, table: str, sql: str, version: str) -> None:
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        key = (normalize_question(question), table.lower())
+        expires_at = self._clock() + self.ttl
+        evicted = []
+        with self._lock:
+            self._entries[key] = (sql, version, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+        if self.semantic is not None:
+            self.semantic.add(question, table, sql, version, expires_at)
+            for evicted_question, evicted_table in evicted:
+                self.semantic.discard(evicted_question, evicted_table)
+
+    def discard(self, question: str, table: str, sql: Optional[str] = None) -> None:
+        """Forget the SQL for ``question``, and with ``sql`` every question mapped to it."""
+        with self._lock:
+            self._entries.pop((normalize_question(question), table.lower()), None)
+            if sql is not None:
+                for key in [key for key, entry in self._entries.items() if key[1] == table.lower() and entry[0] == sql]:
+                    del self._entries[key]
+        if self.semantic is not None:
+            self.semantic.discard(question, table)
+            if sql is not None:
+                self.semantic.discard_sql(sql, table)
+
+    def known_version(self, table: str) -> Optional[str]:
+        """The table's schema version if it was checked recently enough."""
+        with self._lock:
+            known = self._versions.get(table.lower())
+            if known is None or known[1] <= self._clock():
+                return None
+            return known[0]
+
+    def record_version(self, table: str, version: str) -> None:
+        with self._lock:
+            self._versions[table.lower()] = (version, self._clock() + self.schema_check_seconds)
+
+    def invalidate(self, table: Optional[str] = None) -> None:
+        """Forget generated SQL (and the schema version) for one table, or everything."""
+        if self.semantic is not None:
+            self.semantic.invalidate(table)
+        with self._lock:
+            if table is None:
+                self._entries.clear()
+                self._versions.clear()
+                return
+            name = table.lower()
+            self._versions.pop(name, None)
+            for key in [key for key in self._entries if key[1] == name]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        self.invalidate()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache = NlSqlCache(semantic=default_semantic_index(DEFAULT_NL_SIZE))
+
+
+def get_nl_cache() -> NlSqlCache:
+    return _cache
+
+
+def clear_nl_cache() -> None:
+    _cache.clear()
+
+
+def _sql_of(response: Any) -> Optional[str]:
+    return response.get("sql") if isinstance(response, dict) else getattr(response, "sql", None)
+
+
+def _cacheable(sql: Any) -> bool:
+    # Only replay plain reads; anything else always goes back to the server
+    return isinstance(sql, str) and is_read_query(sql)
+
+
+def _schema_version_sync(client: Any, table: str, cache: NlSqlCache) -> Optional[str]:
+    version = cache.known_version(table)
+    if version is None:
+        try:
+            response = client.db.execute_query(query=schema_query(table))
+        except TypeError:
+            # A call the SDK doesn't accept is a bug, not an unreadable schema
+            raise
+        except Exception:
+            return None
+        version = schema_version(rows_of(response))
+        cache.record_version(table, version)
+    return version
+
+
+async def _schema_version_async(client: AsyncClient, table: str, cache: NlSqlCache) -> Optional[str]:
+    version = cache.known_version(table)
+    if version is None:
+        try:
+            response = await client.execute_query(schema_query(table), use_cache=False)
+        except TypeError:
+            raise
+        except Exception:
+            return None
+        version = schema_version(rows_of(response))
+        cache.record_version(table, version)
+    return version
+
+
+def nl_query(question: str, table: str, client: Any = None, cache: Optional[NlSqlCache] = None) -> Any:
+    """``process_nl_query`` that reuses SQL generated earlier for the same question and table.
+
+    On a hit the remembered SQL runs directly through ``execute_query`` and a
+    :class:`CachedNlResult` is returned; if that fails, the entry is dropped and
+    the question goes to the server. If the schema version can't be read, the
+    cache is bypassed.
+    """
+    client = client or get_client()
+    cache = cache if cache is not None else get_nl_cache()
+    version = _schema_version_sync(client, table, cache)
+    sql = cache.get(question, table, version) if version is not None else None
+    if sql is not None:
+        record_cache_hit("process_nl_query", [table])
+        started = time.perf_counter()
+        try:
+            response = timed_call("execute_query", [table], client.db.execute_query, query=sql)
+            return CachedNlResult(data=rows_of(response), sql=sql, execution_time=(time.perf_counter() - started) * 1000)
+        except Exception:
+            # Stale or unusable SQL: drop it and ask the server again
+            cache.discard(question, table, sql)
+
+    response = timed_call("process_nl_query", [table], client.db.process_nl_query, question=question, table=table)
+    sql = _sql_of(response)
+    if version is not None and _cacheable(sql):
+        cache.put(question, table, sql, version)
+    return response
+
+
+async def nl_query_async(
+    question: str, table: str, client: Optional[AsyncClient] = None, cache: Optional[NlSqlCache] = None
+) -> Any:
+    """Async counterpart of :func:`nl_query`."""
+    client = client or get_async_client()
+    cache = cache if cache is not None else get_nl_cache()
+    version = await _schema_version_async(client, table, cache)
+    sql = cache.get(question, table, version) if version is not None else None
+    if sql is not None:
+        record_cache_hit("process_nl_query", [table])
+        started = time.perf_counter()
+        try:
+            response = await client.execute_query(sql)
+            return CachedNlResult(data=rows_of(response), sql=sql, execution_time=(time.perf_counter() - started) * 1000)
+        except Exception:
+            cache.discard(question, table, sql)
+
+    response = await client.process_nl_query(question, table)
+    sql = _sql_of(response)
+    if version is not None and _cacheable(sql):
+        cache.put(question, table, sql, version)
+    return response
+
+
+@dataclass
+class NlWarmupReport:
+    # Schema version loaded per table (None if it couldn't be read)
+    versions: Dict[str, Optional[str]] = field(default_factory=dict)
+    warmed: int = 0
+    # Questions the cache now answers
+    cached: int = 0
+    # One entry per failed question, or a lone {"error"} if the questions or client couldn't be loaded
+    failed: List[Dict[str, str]] = field(default_factory=list)
+    timed_out: bool = False
+    seconds: float = 0.0
+
+
+def load_warmup_questions(path: str) -> List[Tuple[str, str]]:
+    """Read ``[{"question": ..., "table": ...}, ...]`` (or ``[[question, table], ...]``) from a JSON file."""
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    return [
+        (entry["question"], entry["table"]) if isinstance(entry, dict) else (entry[0], entry[1])
+        for entry in entries
+    ]
+
+
+async def warm_nl_cache(
+    questions: Union[str, Iterable[Tuple[str, str]]],
+    client: Optional[AsyncClient] = None,
+    cache: Optional[NlSqlCache] = None,
+    concurrency: int = DEFAULT_WARMUP_CONCURRENCY,
+    timeout: Optional[float] = DEFAULT_WARMUP_TIMEOUT,
+) -> NlWarmupReport:
+    """Fill the NL cache before traffic arrives.
+
+    ``questions`` is a list of ``(question, table)`` pairs, or the path of a
+    JSON file read with :func:`load_warmup_questions`. Each table's schema
+    version is loaded once, then every question goes through
+    :func:`nl_query_async`, ``concurrency`` at a time, and counts as cached
+    only if the cache answers it afterwards. Failures are reported, not raised,
+    including an unreadable question file. After ``timeout`` seconds the
+    remaining questions are abandoned and whatever was warmed by then stays
+    cached.
+    """
+    cache = cache if cache is not None else get_nl_cache()
+    report = NlWarmupReport()
+    started = time.perf_counter()
+    try:
+        questions = load_warmup_questions(questions) if isinstance(questions, str) else list(questions)
+        client = client or get_async_client()
+    except Exception as e:
+        report.failed.append({"error": str(e)})
+        report.seconds = time.perf_counter() - started
+        return report
+    slots = asyncio.Semaphore(max(1, concurrency))
+
+    async def load_schema(table: str) -> None:
+        report.versions[table] = await _schema_version_async(client, table, cache)
+
+    async def warm(question: str, table: str) -> None:
+        async with slots:
+            try:
+                await nl_query_async(question, table, client=client, cache=cache)
+            except Exception as e:
+                report.failed.append({"question": question, "table": table, "error": str(e)})
+                return
+        report.warmed += 1
+        version = cache.known_version(table)
+        if version is not None and cache.get(question, table, version) is not None:
+            report.cached += 1
+
+    async def run() -> None:
+        await asyncio.gather(*(load_schema(table) for table in dict.fromkeys(table for _, table in questions)))
+        await asyncio.gather(*(warm(question, table) for question, table in questions))
+
+    try:
+        await asyncio.wait_for(run(), timeout)
+    except asyncio.TimeoutError:
+        report.timed_out = True
+    report.seconds = time.perf_counter() - started
+    return report
@@ -0,0 +1,352 @@
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .async_client import AsyncClient
+from .batch_trigger import DEFAULT_CONCURRENCY, iter_triggers
+from .trigger_scheduler import get_trigger_scheduler
+
+DEFAULT_OUTBOX_PATH = os.environ.get("WORQHAT_OUTBOX_PATH", "worqhat_outbox.db")
+DEFAULT_BATCH_SIZE = int(os.environ.get("WORQHAT_OUTBOX_BATCH_SIZE", "100"))
+DEFAULT_MAX_ATTEMPTS = int(os.environ.get("WORQHAT_OUTBOX_MAX_ATTEMPTS", "10"))
+DEFAULT_POLL_INTERVAL = float(os.environ.get("WORQHAT_OUTBOX_POLL_SECONDS", "1"))
+DEFAULT_RETRY_DELAY = 1.0
+DEFAULT_MAX_RETRY_DELAY = 300.0
+# A claimed trigger that is neither sent nor failed by then (dispatcher crashed) is claimed again
+DEFAULT_LEASE_SECONDS = 300.0
+
+PENDING = "pending"
+SENT = "sent"
+DEAD = "dead"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trigger_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    workflow_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    analytics_id TEXT,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS trigger_outbox_due ON trigger_outbox (status, next_attempt_at);
+"""
+
+_COLUMNS = "id, workflow_id, payload, status, attempts, created_at, analytics_id, last_error"
+
+
+@dataclass
+class OutboxEntry:
+    id: int
+    workflow_id: str
+    payload: Dict[str, Any]
+    status: str = PENDING
+    attempts: int = 0
+    created_at: float = 0.0
+    analytics_id: Optional[str] = None
+    last_error: Optional[str] = None
+
+
+def _entry(row: Tuple[Any, ...]) -> OutboxEntry:
+    return OutboxEntry(row[0], row[1], json.loads(row[2]), row[3], row[4], row[5], row[6], row[7])
+
+
+class TriggerOutbox:
+    """Workflow triggers queued in a local SQLite file until they have been sent.
+
+    ``enqueue`` is one small local transaction, so callers no longer wait on
+    the WorqHat API, and queued triggers survive restarts. The file runs in WAL
+    mode with ``synchronous=NORMAL``: a committed trigger survives a process
+    crash, though the last few may be lost on power failure. Delivery is at
+    least once, since a trigger whose dispatcher died mid-send is retried once
+    its lease expires.
+    """
+
+    def __init__(self, path: str = DEFAULT_OUTBOX_PATH, clock: Callable[[], float] = time.time) -> None:
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def enqueue(self, workflow_id: str, payload: Dict[str, Any]) -> int:
+        """Queue one trigger and return its outbox id."""
+        return self.enqueue_many([(workflow_id, payload)])[0]
+
+    def enqueue_many(self, triggers: Iterable[Tuple[str, Dict[str, Any]]]) -> List[int]:
+        """Queue several triggers in a single transaction."""
+        rows = [(workflow_id, json.dumps(payload, default=str)) for workflow_id, payload in triggers]
+        now = self._clock()
+        ids = []
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                for workflow_id, payload in rows:
+                    cursor = self._db.execute(
+                        "INSERT INTO trigger_outbox (workflow_id, payload, next_attempt_at, created_at, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (workflow_id, payload, now, now, now),
+                    )
+                    ids.append(cursor.lastrowid)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return ids
+
+    def claim(self, limit: int, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> List[OutboxEntry]:
+        """Take up to ``limit`` due triggers, oldest first, hiding them from other claims for ``lease_seconds``."""
+        now = self._clock()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._db.execute(
+                    f"SELECT {_COLUMNS} FROM trigger_outbox WHERE status = ? AND next_attempt_at <= ? "
+                    "ORDER BY next_attempt_at, id LIMIT ?",
+                    (PENDING, now, limit),
+                ).fetchall()
+                self._db.executemany(
+                    "UPDATE trigger_outbox SET next_attempt_at = ?, updated_at = ? WHERE id = ?",
+                    [(now + lease_seconds, now, row[0]) for row in rows],
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return [_entry(row) for row in rows]
+
+    def settle(
+        self,
+        sent: Iterable[Tuple[int, Optional[str]]] = (),
+        retry: Iterable[Tuple[int, str, float]] = (),
+        dead: Iterable[Tuple[int, str]] = (),
+    ) -> None:
+        """Record a dispatched batch in one transaction.
+
+        ``sent`` is ``(id, analytics_id)``, ``retry`` is ``(id, error, delay_seconds)``
+        and ``dead`` is ``(id, error)`` for triggers that will not be retried.
+        """
+        now = self._clock()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany(
+                    "UPDATE trigger_outbox SET status = ?, attempts = attempts + 1, analytics_id = ?, "
+                    "last_error = NULL, updated_at = ? WHERE id = ?",
+                    [(SENT, analytics_id, now, id_) for id_, analytics_id in sent],
+                )
+                self._db.executemany(
+                    "UPDATE trigger_outbox SET attempts = attempts + 1, last_error = ?, next_attempt_at = ?, "
+                    "updated_at = ? WHERE id = ?",
+                    [(error, now + delay, now, id_) for id_, error, delay in retry],
+                )
+                self._db.executemany(
+                    "UPDATE trigger_outbox SET status = ?, attempts = attempts + 1, last_error = ?, updated_at = ? "
+                    "WHERE id = ?",
+                    [(DEAD, error, now, id_) for id_, error in dead],
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def get(self, id_: int) -> Optional[OutboxEntry]:
+        with self._lock:
+            row = self._db.execute(f"SELECT {_COLUMNS} FROM trigger_outbox WHERE id = ?", (id_,)).fetchone()
+        return _entry(row) if row is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Counts per status and the age in seconds of the oldest pending trigger."""
+        with self._lock:
+            counts = dict(self._db.execute("SELECT status, COUNT(*) FROM trigger_outbox GROUP BY status").fetchall())
+            oldest = self._db.execute(
+                "SELECT MIN(created_at) FROM trigger_outbox WHERE status = ?", (PENDING,)
+            ).fetchone()[0]
+        return {
+            PENDING: counts.get(PENDING, 0),
+            SENT: counts.get(SENT, 0),
+            DEAD: counts.get(DEAD, 0),
+            "oldest_pending_seconds": self._clock() - oldest if oldest is not None else None,
+        }
+
+    def requeue_dead(self) -> int:
+        """Give every dead trigger another round of attempts."""
+        now = self._clock()
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE trigger_outbox SET status = ?, attempts = 0, next_attempt_at = ?, updated_at = ? "
+                "WHERE status = ?",
+                (PENDING, now, now, DEAD),
+            )
+        return cursor.rowcount
+
+    def purge_sent(self, older_than: float = 0.0) -> int:
+        """Delete sent triggers last updated more than ``older_than`` seconds ago."""
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM trigger_outbox WHERE status = ? AND updated_at <= ?", (SENT, self._clock() - older_than)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_outboxes: Dict[str, TriggerOutbox] = {}
+_outboxes_lock = threading.Lock()
+
+
+def get_outbox(path: Optional[str] = None) -> TriggerOutbox:
+    """Return the shared outbox for ``path`` (default ``WORQHAT_OUTBOX_PATH``), opening it on first use."""
+    path = path or DEFAULT_OUTBOX_PATH
+    with _outboxes_lock:
+        outbox = _outboxes.get(path)
+        if outbox is None:
+            outbox = _outboxes[path] = TriggerOutbox(path)
+        return outbox
+
+
+def close_outboxes() -> None:
+    with _outboxes_lock:
+        outboxes = list(_outboxes.values())
+        _outboxes.clear()
+    for outbox in outboxes:
+        try:
+            outbox.close()
+        except Exception:
+            pass
+
+
+class OutboxDispatcher:
+    """Drains a :class:`TriggerOutbox` in the background.
+
+    Each round claims up to ``batch_size`` due triggers, sends them
+    ``concurrency`` at a time and records the outcome of the whole batch in one
+    transaction. Transient failures are retried with jittered exponential
+    backoff (persisted, so the schedule survives restarts) until
+    ``max_attempts``; permanent failures go straight to ``dead``. Between
+    rounds the dispatcher sleeps ``poll_interval`` seconds, or until
+    :meth:`wake` is called.
+    """
+
+    def __init__(
+        self,
+        outbox: Optional[TriggerOutbox] = None,
+        client: Optional[AsyncClient] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+        max_retry_delay: float = DEFAULT_MAX_RETRY_DELAY,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        self._outbox = outbox
+        self._client = client
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.poll_interval = poll_interval
+        self._wake = asyncio.Event()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.sent = 0
+        self.retried = 0
+        self.dead = 0
+
+    @property
+    def outbox(self) -> TriggerOutbox:
+        # Without an explicit outbox, follow the shared one (reopened after close_outboxes)
+        return self._outbox if self._outbox is not None else get_outbox()
+
+    def backoff(self, attempts: int) -> float:
+        """Seconds to wait before attempt ``attempts + 1``."""
+        return random.uniform(0.5, 1.0) * min(self.retry_delay * 2 ** (attempts - 1), self.max_retry_delay)
+
+    async def run_once(self) -> int:
+        """Dispatch one batch; returns how many triggers were claimed."""
+        entries = self.outbox.claim(self.batch_size)
+        if not entries:
+            return 0
+        # Queued triggers are background work: low priority on the shared scheduler
+        client = self._client or get_trigger_scheduler().with_priority("low")
+        pairs = ((entry.workflow_id, entry.payload) for entry in entries)
+        sent, retry, dead = [], [], []
+        try:
+            # Retries are persisted by the outbox rather than done inline
+            async for result in iter_triggers(pairs, concurrency=self.concurrency, max_retries=0, client=client):
+                entry = entries[result.index]
+                attempts = entry.attempts + 1
+                if result.ok:
+                    sent.append((entry.id, result.analytics_id))
+                elif result.transient and attempts < self.max_attempts:
+                    retry.append((entry.id, result.error or "", self.backoff(attempts)))
+                else:
+                    dead.append((entry.id, result.error or ""))
+        finally:
+            # Record what already went out even if shutdown cancels the batch, so it isn't sent again
+            self.outbox.settle(sent, retry, dead)
+            self.sent += len(sent)
+            self.retried += len(retry)
+            self.dead += len(dead)
+            for id_, error in dead:
+                print(f"Outbox trigger {id_} gave up: {error}")
+        return len(entries)
+
+    async def drain(self) -> None:
+        """Dispatch until nothing is due."""
+        while await self.run_once():
+            pass
+
+    def wake(self) -> None:
+        """Dispatch now instead of at the next poll."""
+        self._wake.set()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                claimed = await self.run_once()
+            except Exception as e:
+                print(f"Outbox dispatcher error: {str(e)}")
+                claimed = 0
+            if claimed >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> "asyncio.Task[None]":
+        if self._task is None or self._task.done():
+            # Events bind to the loop that first waits on them, and the app may be restarted on a new one
+            self._wake = asyncio.Event()
+            self._task = asyncio.ensure_future(self._loop())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,190 @@
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Iterator, List, Optional, Tuple, Union
+
+from .async_client import get_async_client
+from .client_pool import get_client
+from .query_template import QueryTemplate, compile_query
+from .returning import quote_identifier
+
+DEFAULT_PAGE_SIZE = 500
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_ORDER_BY_RE = re.compile(r"\bORDER\s+BY\b", re.IGNORECASE)
+_LIMIT_RE = re.compile(r"\b(?:LIMIT|OFFSET|FETCH)\b", re.IGNORECASE)
+
+
+def rows_of(response: Any) -> List[Any]:
+    """Rows from an execute_query response (SDK model or plain dict)."""
+    data = response.get("data") if isinstance(response, dict) else getattr(response, "data", None)
+    return list(data or [])
+
+
+def _top_level(sql: str) -> str:
+    """``sql`` without string literals or anything inside parentheses."""
+    text = _LITERAL_RE.sub("''", sql)
+    depth = 0
+    kept = []
+    for char in text:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth = max(0, depth - 1)
+        elif depth == 0:
+            kept.append(char)
+    return "".join(kept)
+
+
+def _row_value(row: Any, column: str) -> Any:
+    return row.get(column) if isinstance(row, dict) else getattr(row, column)
+
+
+class _Pager:
+    """Builds the SQL for each page by wrapping the template in a subquery.
+
+    With ``key_column`` the pager uses keyset pagination (``WHERE key >
+    last_seen ORDER BY key``), which stays fast on deep pages because the
+    server never has to skip rows. Without it, pages are LIMIT/OFFSET slices of
+    the query itself, which must then have its own ``ORDER BY`` (and no
+    LIMIT/OFFSET); unordered pages could overlap or skip rows.
+    """
+
+    def __init__(
+        self,
+        query: Union[str, QueryTemplate],
+        params: Any,
+        page_size: int,
+        key_column: Optional[str],
+    ) -> None:
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        # Quoted, so mixed-case keys like documentId aren't folded to lowercase
+        self.sql_key = quote_identifier(key_column) if key_column is not None else None
+        self.template = query if isinstance(query, QueryTemplate) else compile_query(query)
+        # Validate the caller's params once, up front
+        self.params = self.template.bind(params).params
+        self.page_size = page_size
+        self.key_column = key_column
+        self.inner = self.template.text.strip().rstrip(";")
+        if key_column is None:
+            top = _top_level(self.inner)
+            if not _ORDER_BY_RE.search(top):
+                raise ValueError("OFFSET pagination needs an ORDER BY in the query; pass key_column or add one")
+            if _LIMIT_RE.search(top):
+                raise ValueError("OFFSET pagination can't page a query that has its own LIMIT/OFFSET; pass key_column")
+
+    def page(self, offset: int, after: Any) -> Tuple[str, Any]:
+        """SQL and params for the page starting at ``offset`` / after key ``after``."""
+        where = ""
+        params = self.params
+        if self.key_column is not None and after is not None:
+            if self.template.style == "positional":
+                params = list(params) + [after]
+                where = f" WHERE {self.sql_key} > ${len(params)}"
+            else:
+                params = dict(params or {}, _page_after=after)
+                where = f" WHERE {self.sql_key} > {{_page_after}}"
+
+        if self.key_column is not None:
+            sql = f"SELECT * FROM ({self.inner}) AS _page{where} ORDER BY {self.sql_key} LIMIT {self.page_size}"
+        else:
+            sql = f"{self.inner} LIMIT {self.page_size} OFFSET {offset}"
+        return sql, params
+
+    def advance(self, rows: List[Any], offset: int) -> Tuple[bool, int, Any]:
+        """Return ``(more, next_offset, next_after)`` after a page of ``rows``."""
+        more = len(rows) >= self.page_size
+        after = _row_value(rows[-1], self.key_column) if (rows and self.key_column) else None
+        return more, offset + len(rows), after
+
+
+def iter_query_pages(
+    query: Union[str, QueryTemplate],
+    params: Any = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    key_column: Optional[str] = None,
+    client: Any = None,
+    prefetch: bool = True,
+) -> Iterator[List[Any]]:
+    """Yield the rows of ``query`` one page at a time with the sync client.
+
+    While the caller works on a page, the next one is already being fetched on
+    a background thread, so only two pages are ever held in memory.
+    """
+    client = client or get_client()
+    pager = _Pager(query, params, page_size, key_column)
+
+    def fetch(offset: int, after: Any) -> List[Any]:
+        sql, page_params = pager.page(offset, after)
+        if page_params is None:
+            return rows_of(client.db.execute_query(query=sql))
+        return rows_of(client.db.execute_query(query=sql, params=page_params))
+
+    if not prefetch:
+        offset, after, more = 0, None, True
+        while more:
+            rows = fetch(offset, after)
+            if rows:
+                yield rows
+            more, offset, after = pager.advance(rows, offset)
+        return
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(fetch, 0, None)
+        offset = 0
+        while pending is not None:
+            rows = pending.result()
+            more, offset, after = pager.advance(rows, offset)
+            pending = pool.submit(fetch, offset, after) if more else None
+            if rows:
+                yield rows
+
+
+def iter_query_rows(query: Union[str, QueryTemplate], params: Any = None, **kwargs: Any) -> Iterator[Any]:
+    """Yield individual rows of ``query``; see :func:`iter_query_pages`."""
+    for page in iter_query_pages(query, params, **kwargs):
+        yield from page
+
+
+async def aiter_query_pages(
+    query: Union[str, QueryTemplate],
+    params: Any = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    key_column: Optional[str] = None,
+    client: Any = None,
+    prefetch: bool = True,
+) -> AsyncIterator[List[Any]]:
+    """Async counterpart of :func:`iter_query_pages` on :class:`AsyncClient`.
+
+    The next page is requested as a task as soon as the current one arrives.
+    Pages bypass the result cache so large scans don't evict dashboard entries.
+    """
+    client = client or get_async_client()
+    pager = _Pager(query, params, page_size, key_column)
+
+    async def fetch(offset: int, after: Any) -> List[Any]:
+        sql, page_params = pager.page(offset, after)
+        return rows_of(await client.execute_query(sql, page_params, use_cache=False))
+
+    offset = 0
+    pending: Optional["asyncio.Future[List[Any]]"] = asyncio.ensure_future(fetch(0, None))
+    try:
+        while pending is not None:
+            rows = await pending
+            more, offset, after = pager.advance(rows, offset)
+            pending = asyncio.ensure_future(fetch(offset, after)) if (more and prefetch) else None
+            if rows:
+                yield rows
+            if more and pending is None:
+                pending = asyncio.ensure_future(fetch(offset, after))
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
+
+
+async def aiter_query_rows(query: Union[str, QueryTemplate], params: Any = None, **kwargs: Any) -> AsyncIterator[Any]:
+    """Yield individual rows of ``query``; see :func:`aiter_query_pages`."""
+    async for page in aiter_query_pages(query, params, **kwargs):
+        for row in page:
+            yield row
@@ -0,0 +1,249 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, NamedTuple, Optional, Set, Tuple
+
+DEFAULT_TTL = float(os.environ.get("WORQHAT_QUERY_CACHE_TTL", "30"))
+DEFAULT_MAX_ENTRIES = int(os.environ.get("WORQHAT_QUERY_CACHE_SIZE", "1024"))
+
+# Quoted literals and identifiers, kept verbatim by normalization and table parsing
+_QUOTED_RE = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`[^`]*`")
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_TABLE_KEYWORD_RE = re.compile(r"\b(FROM|JOIN|INTO|UPDATE|TABLE)\s+", re.IGNORECASE)
+_NAME_RE = re.compile(r'"([^"]+)"|`([^`]+)`|([A-Za-z_][\w.]*)')
+_ALIAS_RE = re.compile(r"\s+(?:AS\s+)?([A-Za-z_]\w*)", re.IGNORECASE)
+_COMMA_RE = re.compile(r"\s*,\s*")
+# Words that end a FROM item rather than alias it
+_CLAUSE_WORDS = frozenset({
+    "WHERE", "GROUP", "ORDER", "LIMIT", "OFFSET", "HAVING", "WINDOW", "FETCH", "FOR", "ON", "USING",
+    "JOIN", "INNER", "LEFT", "RIGHT", "FULL", "CROSS", "OUTER", "NATURAL", "LATERAL",
+    "UNION", "EXCEPT", "INTERSECT", "SET", "VALUES", "RETURNING", "SELECT", "AS",
+})
+_READ_RE = re.compile(r"^\s*(?:SELECT|WITH)\b", re.IGNORECASE)
+# A WITH statement can wrap a write (``WITH x AS (UPDATE ... RETURNING ...)``)
+_WRITE_RE = re.compile(r"\b(?:INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace outside quotes and drop a trailing semicolon.
+
+    Formatting then doesn't split cache entries, while ``'a  b'`` and ``'a b'``
+    stay different queries.
+    """
+    parts = []
+    last = 0
+    for match in _QUOTED_RE.finditer(query):
+        parts.append(re.sub(r"\s+", " ", query[last:match.start()]))
+        parts.append(match.group(0))
+        last = match.end()
+    parts.append(re.sub(r"\s+", " ", query[last:]))
+    return "".join(parts).strip().rstrip(";").rstrip()
+
+
+def _skip_parens(text: str, pos: int) -> int:
+    depth = 0
+    for index in range(pos, len(text)):
+        if text[index] == "(":
+            depth += 1
+        elif text[index] == ")":
+            depth -= 1
+            if depth == 0:
+                return index + 1
+    return len(text)
+
+
+def parse_tables(query: str) -> Tuple[Set[str], bool]:
+    """Table names a statement reads from or writes to, and whether that list is complete.
+
+    Comma-separated ``FROM`` lists are followed item by item; subqueries are
+    parsed through their own ``FROM``. The list is incomplete when a table
+    position holds something else, or when a write names no table at all.
+    """
+    text = _LITERAL_RE.sub("''", query)
+    tables: Set[str] = set()
+    known = True
+    for keyword in _TABLE_KEYWORD_RE.finditer(text):
+        pos = keyword.end()
+        while True:
+            if text.startswith("(", pos) and keyword.group(1).upper() in ("FROM", "JOIN"):
+                pos = _skip_parens(text, pos)
+            else:
+                name = _NAME_RE.match(text, pos)
+                if name is None:
+                    known = False
+                    break
+                tables.add(next(group for group in name.groups() if group).lower())
+                pos = name.end()
+            if keyword.group(1).upper() != "FROM":
+                break
+            alias = _ALIAS_RE.match(text, pos)
+            if alias and alias.group(1).upper() not in _CLAUSE_WORDS:
+                pos = alias.end()
+            comma = _COMMA_RE.match(text, pos)
+            if comma is None:
+                break
+            pos = comma.end()
+    if not tables and not is_read_query(query):
+        known = False
+    return tables, known
+
+
+def tables_in(query: str) -> Set[str]:
+    """Best-effort list of table names a statement reads from or writes to."""
+    return parse_tables(query)[0]
+
+
+def is_read_query(query: str) -> bool:
+    match = _READ_RE.match(query)
+    if not match:
+        return False
+    return match.group(0).strip().upper() != "WITH" or not _WRITE_RE.search(query)
+
+
+def params_key(params: Any) -> str:
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def cache_key(query: str, params: Any = None) -> Tuple[str, str]:
+    return normalize_query(query), params_key(params)
+
+
+# Pseudo-table whose generation every read depends on, bumped by invalidate_all()
+_ALL_TABLES = "*"
+
+
+class _Entry(NamedTuple):
+    value: Any
+    tables: Set[str]
+    expires_at: float
+
+
+class QueryCache:
+    """TTL + LRU cache of execute_query results, invalidated per table on writes.
+
+    Every table carries a generation counter that writes bump. A read records the
+    generations before it goes out and is only stored if none moved meanwhile, so a
+    result fetched concurrently with one of our own writes is never cached.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return ``(found, value)`` for a live entry, refreshing its LRU position."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= self._clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry.value
+
+    def snapshot(self, tables: Iterable[str]) -> Dict[str, int]:
+        """Current generation of each table, taken before a read is issued."""
+        with self._lock:
+            generations = {table: self._generations.get(table, 0) for table in tables}
+            if generations:
+                generations[_ALL_TABLES] = self._generations.get(_ALL_TABLES, 0)
+            return generations
+
+    def put(self, key: Hashable, value: Any, generations: Dict[str, int]) -> bool:
+        """Store a read result unless one of its tables was written since ``generations``."""
+        if not self.enabled or not generations:
+            return False
+        with self._lock:
+            if any(self._generations.get(table, 0) != gen for table, gen in generations.items()):
+                return False
+            self._entries[key] = _Entry(value, set(generations), self._clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return True
+
+    def invalidate(self, *tables: str) -> int:
+        """Drop every entry touching any of ``tables``; returns how many were removed."""
+        names = {table.lower() for table in tables}
+        with self._lock:
+            for table in names:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [key for key, entry in self._entries.items() if entry.tables & names]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def invalidate_all(self) -> int:
+        """Drop every entry, for writes whose tables can't be told from the SQL."""
+        with self._lock:
+            self._generations[_ALL_TABLES] = self._generations.get(_ALL_TABLES, 0) + 1
+            dropped = len(self._entries)
+            self._entries.clear()
+            return dropped
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# One cache per (api_key, environment): different keys can point at different databases.
+_caches: Dict[Tuple[Optional[str], str], QueryCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_query_cache(api_key: Optional[str], environment: str) -> QueryCache:
+    key = (api_key, environment)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = QueryCache()
+            _caches[key] = cache
+        return cache
+
+
+def clear_query_caches() -> None:
+    with _caches_lock:
+        for cache in _caches.values():
+            cache.clear()
+        _caches.clear()
+
+
+def invalidate_query_caches(*tables: str) -> None:
+    """Invalidate ``tables`` (everything if none are given) in every cache.
+
+    For writes that don't go through an :class:`AsyncClient`, such as the sync
+    SDK client, which doesn't know which cache its credentials map to.
+    """
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        if tables:
+            cache.invalidate(*tables)
+        else:
+            cache.invalidate_all()
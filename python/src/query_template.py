@@ -0,0 +1,144 @@
+import datetime
+import hashlib
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Type, Union
+
+from .query_cache import is_read_query, normalize_query, parse_tables
+
+# Quoted strings are matched first so placeholders inside literals are left alone.
+_TOKEN_RE = re.compile(
+    r"'(?:[^']|'')*'"
+    r'|"(?:[^"]|"")*"'
+    r"|\{\s*(?P<name>[A-Za-z_]\w*)\s*\}"
+    r"|\$(?P<position>\d+)"
+)
+
+_SCALARS = (str, int, float, bool, type(None))
+
+Params = Union[Mapping[str, Any], Sequence[Any], None]
+TypeSpec = Union[Type[Any], Tuple[Type[Any], ...]]
+
+
+class QueryTemplateError(ValueError):
+    """Raised when a template is malformed or params don't match it."""
+
+
+class BoundQuery(NamedTuple):
+    query: str
+    params: Union[Dict[str, Any], List[Any], None]
+    fingerprint: str
+
+
+def _coerce(value: Any) -> Any:
+    # Dates travel as ISO strings, same as the examples pass them
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def _check_type(label: str, value: Any, expected: Optional[TypeSpec]) -> None:
+    if expected is None:
+        if not isinstance(value, _SCALARS):
+            raise QueryTemplateError(f"Parameter {label} must be a scalar, got {type(value).__name__}")
+        return
+    expected_types = expected if isinstance(expected, tuple) else (expected,)
+    # bool is an int subclass, but passing True for a LIMIT is almost always a bug
+    if isinstance(value, bool) and bool not in expected_types:
+        raise QueryTemplateError(f"Parameter {label} must be {_type_names(expected_types)}, got bool")
+    if not isinstance(value, expected_types):
+        raise QueryTemplateError(
+            f"Parameter {label} must be {_type_names(expected_types)}, got {type(value).__name__}"
+        )
+
+
+def _type_names(types: Tuple[Type[Any], ...]) -> str:
+    return " or ".join(t.__name__ for t in types)
+
+
+class QueryTemplate:
+    """A SQL template using either ``{named}`` or ``$N`` placeholders, parsed once.
+
+    The template validates its placeholders up front, binds params with type
+    checks before anything goes over the wire, and exposes a stable
+    ``fingerprint`` (a hash of the normalized text) for cache keys and metrics.
+    Normalization leaves quoted literals alone, so templates that differ only
+    inside a string never share a fingerprint. ``tables_known`` is False when
+    the tables couldn't all be parsed from the SQL.
+    """
+
+    def __init__(self, text: str, types: Optional[Mapping[Union[str, int], TypeSpec]] = None) -> None:
+        self.text = text
+        self.normalized = normalize_query(text)
+        self.fingerprint = hashlib.sha1(self.normalized.encode("utf-8")).hexdigest()[:16]
+        tables, self.tables_known = parse_tables(text)
+        self.tables = frozenset(tables)
+        self.is_read = is_read_query(text)
+
+        names: List[str] = []
+        positions = set()
+        for match in _TOKEN_RE.finditer(text):
+            if match.group("name"):
+                if match.group("name") not in names:
+                    names.append(match.group("name"))
+            elif match.group("position"):
+                positions.add(int(match.group("position")))
+
+        if names and positions:
+            raise QueryTemplateError("Query mixes {named} and $N placeholders")
+        if positions and positions != set(range(1, max(positions) + 1)):
+            raise QueryTemplateError(f"Positional placeholders must run $1..$N without gaps, got {sorted(positions)}")
+
+        self.names: Tuple[str, ...] = tuple(names)
+        self.arity = max(positions) if positions else 0
+        self.style = "named" if names else "positional" if positions else "none"
+
+        self.types: Dict[Union[str, int], TypeSpec] = dict(types or {})
+        for key in self.types:
+            if self.style == "named" and key not in self.names:
+                raise QueryTemplateError(f"Type given for unknown placeholder {{{key}}}")
+            if self.style == "positional" and not (isinstance(key, int) and 1 <= key <= self.arity):
+                raise QueryTemplateError(f"Type given for unknown placeholder ${key}")
+
+    def bind(self, params: Params = None) -> BoundQuery:
+        """Validate ``params`` against the placeholders and return the query ready to send."""
+        if self.style == "named":
+            if not isinstance(params, Mapping):
+                raise QueryTemplateError(f"Query expects named params {list(self.names)}")
+            missing = [name for name in self.names if name not in params]
+            extra = [name for name in params if name not in self.names]
+            if missing:
+                raise QueryTemplateError(f"Missing params: {missing}")
+            if extra:
+                raise QueryTemplateError(f"Unexpected params: {extra}")
+            bound: Dict[str, Any] = {}
+            for name in self.names:
+                value = _coerce(params[name])
+                _check_type("{" + name + "}", value, self.types.get(name))
+                bound[name] = value
+            return BoundQuery(self.text, bound, self.fingerprint)
+
+        if self.style == "positional":
+            if isinstance(params, (str, bytes, Mapping)) or not isinstance(params, Sequence):
+                raise QueryTemplateError(f"Query expects {self.arity} positional params")
+            if len(params) != self.arity:
+                raise QueryTemplateError(f"Query expects {self.arity} positional params, got {len(params)}")
+            values: List[Any] = []
+            for index, value in enumerate(params, start=1):
+                value = _coerce(value)
+                _check_type(f"${index}", value, self.types.get(index))
+                values.append(value)
+            return BoundQuery(self.text, values, self.fingerprint)
+
+        if params:
+            raise QueryTemplateError("Query has no placeholders but params were given")
+        return BoundQuery(self.text, None, self.fingerprint)
+
+    def __repr__(self) -> str:
+        return f"QueryTemplate({self.normalized!r})"
+
+
+@lru_cache(maxsize=1024)
+def compile_query(text: str) -> QueryTemplate:
+    """Return the compiled (untyped) template for ``text``, parsing it only once."""
+    return QueryTemplate(text)
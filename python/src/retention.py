@@ -0,0 +1,199 @@
+import asyncio
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .async_client import AsyncClient
+from .mass_delete import DEFAULT_BATCH_SIZE, DEFAULT_RATE, mass_delete
+from .query_cache import params_key
+from .returning import quote_identifier
+
+# Off-peak hours (local time, "start-end", end exclusive) when scheduled purges may start
+DEFAULT_WINDOW = os.environ.get("WORQHAT_RETENTION_WINDOW", "1-5")
+DEFAULT_TICK_SECONDS = float(os.environ.get("WORQHAT_RETENTION_TICK", "60"))
+DEFAULT_HISTORY = 100
+
+
+def parse_window(spec: str) -> Tuple[int, int]:
+    """``"1-5"`` -> ``(1, 5)``; a window may wrap midnight, e.g. ``"22-4"``."""
+    start, _, end = spec.partition("-")
+    window = (int(start), int(end))
+    if not all(0 <= hour <= 24 for hour in window):
+        raise ValueError(f"Invalid retention window: {spec!r}")
+    return window
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Rows of ``table`` older than ``max_age`` (by ``timestamp_column``) and matching ``where`` are purged."""
+
+    table: str
+    timestamp_column: str
+    max_age: timedelta
+    where: Dict[str, Any] = field(default_factory=dict)
+    every: timedelta = timedelta(days=1)
+    batch_size: int = DEFAULT_BATCH_SIZE
+    rate: float = DEFAULT_RATE
+    # Tells apart policies the scheduler would otherwise consider the same
+    name: str = ""
+
+    @property
+    def key(self) -> str:
+        """Identity used to track when this policy last ran."""
+        if self.name:
+            return self.name
+        return f"{self.table}:{self.timestamp_column}:{self.max_age.total_seconds():g}:{params_key(self.where)}"
+
+    def cutoff(self, now: datetime) -> datetime:
+        return now - self.max_age
+
+    def condition(self) -> str:
+        return f"{quote_identifier(self.timestamp_column)} < {{cutoff}}"
+
+
+@dataclass
+class RetentionRun:
+    table: str
+    started_at: datetime
+    cutoff: datetime
+    dry_run: bool = False
+    deleted: int = 0
+    matched: Optional[int] = None
+    batches: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.deleted / self.seconds if self.seconds else 0.0
+
+
+async def run_policy(
+    policy: RetentionPolicy,
+    now: Optional[datetime] = None,
+    dry_run: bool = False,
+    client: Optional[AsyncClient] = None,
+) -> RetentionRun:
+    """Purge (or with ``dry_run``, count) what ``policy`` says has expired."""
+    now = now or datetime.now()
+    cutoff = policy.cutoff(now)
+    run = RetentionRun(table=policy.table, started_at=now, cutoff=cutoff, dry_run=dry_run)
+    try:
+        progress = await mass_delete(
+            policy.table,
+            dict(policy.where),
+            condition=policy.condition(),
+            condition_params={"cutoff": cutoff},
+            batch_size=policy.batch_size,
+            rate=policy.rate,
+            dry_run=dry_run,
+            client=client,
+        )
+    except Exception as e:
+        run.error = str(e)
+        progress = getattr(e, "progress", None)
+        if progress is None:
+            return run
+    run.deleted = progress.deleted
+    run.matched = progress.matched
+    run.batches = progress.batches
+    run.seconds = progress.seconds
+    return run
+
+
+class RetentionScheduler:
+    """Runs retention policies in-process during an off-peak window.
+
+    Every ``tick_seconds`` the scheduler checks the clock; inside the window,
+    each policy whose last run is older than its ``every`` is purged, one
+    policy at a time so purges don't compete with each other. Finished runs
+    are kept in ``history`` (newest last).
+    """
+
+    def __init__(
+        self,
+        policies: Sequence[RetentionPolicy],
+        window: Optional[Tuple[int, int]] = None,
+        tick_seconds: float = DEFAULT_TICK_SECONDS,
+        history: int = DEFAULT_HISTORY,
+        client: Optional[AsyncClient] = None,
+        clock: Callable[[], datetime] = datetime.now,
+    ) -> None:
+        self.policies = list(policies)
+        self.window = window or parse_window(DEFAULT_WINDOW)
+        self.tick_seconds = tick_seconds
+        self.history: Deque[RetentionRun] = deque(maxlen=history)
+        self._client = client
+        self._clock = clock
+        self._last_run: Dict[str, datetime] = {}
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def in_window(self, now: datetime) -> bool:
+        start, end = self.window
+        if start <= end:
+            return start <= now.hour < end
+        return now.hour >= start or now.hour < end
+
+    def due(self, now: datetime) -> List[RetentionPolicy]:
+        return [
+            policy for policy in self.policies
+            if policy.key not in self._last_run or now - self._last_run[policy.key] >= policy.every
+        ]
+
+    async def run_once(self, now: Optional[datetime] = None, force: bool = False) -> List[RetentionRun]:
+        """Run every due policy now (``force`` ignores the window and ``every``)."""
+        now = now or self._clock()
+        if not force and not self.in_window(now):
+            return []
+        runs = []
+        for policy in self.policies if force else self.due(now):
+            run = await run_policy(policy, now=now, client=self._client)
+            if not run.error:
+                # A failed purge stays due, so the next tick in the window retries it
+                self._last_run[policy.key] = now
+            self.history.append(run)
+            runs.append(run)
+            if run.error:
+                print(f"Retention purge of {policy.table} failed: {run.error}")
+            else:
+                print(f"Retention purge of {policy.table}: {run.deleted} rows older than {run.cutoff.isoformat()} "
+                      f"in {run.seconds:.1f}s ({run.rows_per_second:.0f} rows/s)")
+        return runs
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Totals per table over the runs in ``history``."""
+        totals: Dict[str, Dict[str, Any]] = {}
+        for run in self.history:
+            table = totals.setdefault(run.table, {"runs": 0, "deleted": 0, "seconds": 0.0, "errors": 0})
+            table["runs"] += 1
+            table["deleted"] += run.deleted
+            table["seconds"] += run.seconds
+            table["errors"] += 1 if run.error else 0
+            table["last_run"] = run.started_at
+        for table in totals.values():
+            table["rows_per_second"] = table["deleted"] / table["seconds"] if table["seconds"] else 0.0
+        return totals
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Retention scheduler error: {str(e)}")
+            await asyncio.sleep(self.tick_seconds)
+
+    def start(self) -> "asyncio.Task[None]":
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._loop())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,197 @@
+import re
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+from .async_client import AsyncClient, get_async_client
+from .client_pool import get_client
+from .query_cache import invalidate_query_caches
+from .query_template import QueryTemplate, compile_query
+
+# How much of the touched rows update/delete helpers bring back:
+#   "rows"  - the full records (the SDK's update_records / delete_records)
+#   "ids"   - only their documentIds
+#   "count" - only how many rows changed
+ReturnMode = Literal["rows", "ids", "count"]
+RETURN_MODES: Tuple[str, ...] = ("rows", "ids", "count")
+
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z_]\w*$")
+
+
+def quote_identifier(identifier: str) -> str:
+    if not _IDENTIFIER_RE.match(identifier):
+        raise ValueError(f"Invalid identifier: {identifier!r}")
+    return f'"{identifier}"'
+
+
+def _check_mode(returning: str) -> None:
+    if returning not in RETURN_MODES:
+        raise ValueError(f"returning must be one of {RETURN_MODES}, got {returning!r}")
+
+
+def where_clause(where: Dict[str, Any], params: Dict[str, Any]) -> str:
+    """AND of ``column = value`` conditions as template text; values are added to ``params``."""
+    if not where:
+        raise ValueError("where must match at least one column")
+    conditions = []
+    for i, (column, value) in enumerate(where.items()):
+        if value is None:
+            conditions.append(f"{quote_identifier(column)} IS NULL")
+        else:
+            params[f"where_{i}"] = value
+            conditions.append(f"{quote_identifier(column)} = {{where_{i}}}")
+    return " AND ".join(conditions)
+
+
+def _returning_sql(statement: str, returning: str) -> str:
+    if returning == "rows":
+        return f"{statement} RETURNING *"
+    if returning == "count":
+        # The changed rows never leave the database, only their count does
+        return f"WITH _changed AS ({statement} RETURNING 1) SELECT COUNT(*) AS count FROM _changed"
+    return f'{statement} RETURNING "documentId"'
+
+
+def update_statement(
+    table: str, where: Dict[str, Any], data: Dict[str, Any], returning: str
+) -> Tuple[QueryTemplate, Dict[str, Any]]:
+    """SQL equivalent of ``update_records(table, where, data)`` for the "ids"/"count" modes."""
+    if not data:
+        raise ValueError("data must set at least one column")
+    params: Dict[str, Any] = {}
+    assignments = []
+    for i, (column, value) in enumerate(data.items()):
+        params[f"set_{i}"] = value
+        assignments.append(f"{quote_identifier(column)} = {{set_{i}}}")
+    statement = f"UPDATE {quote_identifier(table)} SET {', '.join(assignments)} WHERE {where_clause(where, params)}"
+    # Column names are part of the text, so the same shape of update reuses its template
+    return compile_query(_returning_sql(statement, returning)), params
+
+
+def delete_statement(
+    table: str,
+    where: Dict[str, Any],
+    returning: str,
+    condition: Optional[str] = None,
+    condition_params: Optional[Dict[str, Any]] = None,
+) -> Tuple[QueryTemplate, Dict[str, Any]]:
+    """SQL equivalent of ``delete_records(table, where)``, optionally narrowed by a raw ``condition``."""
+    params: Dict[str, Any] = {}
+    statement = f"DELETE FROM {quote_identifier(table)} WHERE {where_clause(where, params)}"
+    if condition:
+        statement = f"{statement} AND ({condition})"
+        params.update(condition_params or {})
+    return compile_query(_returning_sql(statement, returning)), params
+
+
+def _written(table: str) -> None:
+    """Drop cached reads and diff snapshots of ``table`` after a write."""
+    # diff_update imports this module, so its snapshot store is reached lazily
+    from .diff_update import invalidate_snapshots
+
+    invalidate_query_caches(table)
+    invalidate_snapshots(table)
+
+
+def _rows(response: Any) -> List[Any]:
+    data = response.get("data") if isinstance(response, dict) else getattr(response, "data", None)
+    return list(data or [])
+
+
+def _field(row: Any, name: str) -> Any:
+    return row.get(name) if isinstance(row, dict) else getattr(row, name, None)
+
+
+def summarize(response: Any, returning: str, count_field: str) -> Dict[str, Any]:
+    """Shape a ``RETURNING`` query response like the SDK's update/delete responses."""
+    rows = _rows(response)
+    if returning == "count":
+        return {"success": True, count_field: int(_field(rows[0], "count") or 0) if rows else 0}
+    if returning == "rows":
+        return {"success": True, count_field: len(rows), "data": rows}
+    ids = [_field(row, "documentId") for row in rows]
+    return {"success": True, count_field: len(ids), "documentIds": ids}
+
+
+def update_records(
+    table: str,
+    where: Dict[str, Any],
+    data: Dict[str, Any],
+    returning: ReturnMode = "rows",
+    client: Any = None,
+) -> Any:
+    """``client.db.update_records`` with a choice of how much comes back."""
+    _check_mode(returning)
+    client = client or get_client()
+    try:
+        if returning == "rows":
+            return client.db.update_records(table=table, where=where, data=data)
+        template, params = update_statement(table, where, data, returning)
+        bound = template.bind(params)
+        return summarize(client.db.execute_query(query=bound.query, params=bound.params), returning, "count")
+    finally:
+        # The sync client has no query cache of its own; drop what the async side cached
+        _written(table)
+
+
+def delete_records(
+    table: str,
+    where: Dict[str, Any],
+    returning: ReturnMode = "rows",
+    client: Any = None,
+    condition: Optional[str] = None,
+    condition_params: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """``client.db.delete_records`` with a choice of how much comes back.
+
+    ``condition`` adds a raw SQL predicate (with ``{named}`` ``condition_params``)
+    for filters that aren't plain equality, such as an age cutoff; the delete
+    then goes out as SQL in every mode.
+    """
+    _check_mode(returning)
+    client = client or get_client()
+    try:
+        if returning == "rows" and not condition:
+            return client.db.delete_records(table=table, where=where)
+        template, params = delete_statement(table, where, returning, condition, condition_params)
+        bound = template.bind(params)
+        return summarize(client.db.execute_query(query=bound.query, params=bound.params), returning, "deleted_count")
+    finally:
+        _written(table)
+
+
+async def update_records_async(
+    table: str,
+    where: Dict[str, Any],
+    data: Dict[str, Any],
+    returning: ReturnMode = "rows",
+    client: Optional[AsyncClient] = None,
+) -> Any:
+    """Async counterpart of :func:`update_records`; writes still invalidate cached reads."""
+    _check_mode(returning)
+    client = client or get_async_client()
+    try:
+        if returning == "rows":
+            return await client.update_records(table, where, data)
+        template, params = update_statement(table, where, data, returning)
+        return summarize(await client.execute_query(template, params), returning, "count")
+    finally:
+        _written(table)
+
+
+async def delete_records_async(
+    table: str,
+    where: Dict[str, Any],
+    returning: ReturnMode = "rows",
+    client: Optional[AsyncClient] = None,
+    condition: Optional[str] = None,
+    condition_params: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """Async counterpart of :func:`delete_records`."""
+    _check_mode(returning)
+    client = client or get_async_client()
+    try:
+        if returning == "rows" and not condition:
+            return await client.delete_records(table, where)
+        template, params = delete_statement(table, where, returning, condition, condition_params)
+        return summarize(await client.execute_query(template, params), returning, "deleted_count")
+    finally:
+        _written(table)
@@ -0,0 +1,189 @@
+import hashlib
+import math
+import os
+import re
+import threading
+import time
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # The semantic layer is optional; exact-match NL caching works without it
+    np = None
+
+DEFAULT_THRESHOLD = float(os.environ.get("WORQHAT_NL_SEMANTIC_THRESHOLD", "0.85"))
+# Sized like the exact NL cache, whose entries the semantic ones mirror
+DEFAULT_CAPACITY = int(os.environ.get("WORQHAT_NL_CACHE_SIZE", "256"))
+DEFAULT_DIMENSIONS = 2 ** 10
+# Bigrams keep some word order ("how many") without drowning out the words themselves
+BIGRAM_WEIGHT = 0.5
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Filler that changes phrasing but not the question
+STOP_WORDS = frozenset({
+    "a", "an", "the", "do", "does", "did", "we", "our", "us", "i", "you", "have", "has", "had",
+    "is", "are", "was", "were", "be", "there", "right", "now", "currently", "please", "me",
+    "tell", "show", "can", "could", "would", "of", "in", "on", "for", "to",
+})
+
+
+def tokens(question: str) -> List[str]:
+    return [token for token in _TOKEN_RE.findall(question.lower()) if token not in STOP_WORDS]
+
+
+def _key(question: str, table: str) -> Tuple[str, str]:
+    # Same tokens for any spelling normalize_question treats as equal
+    return " ".join(tokens(question)), table.lower()
+
+
+def _bucket(feature: str, dimensions: int) -> Tuple[int, float]:
+    digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+    # The sign bit keeps colliding features from always adding up
+    return digest % dimensions, 1.0 if digest >> 63 else -1.0
+
+
+class HashingVectorizer:
+    """Hashed word unigram + bigram features, L2-normalized; no fitting or vocabulary needed."""
+
+    def __init__(self, dimensions: int = DEFAULT_DIMENSIONS) -> None:
+        if np is None:
+            raise RuntimeError("The 'numpy' package is required for the semantic NL cache. Install with `pip install numpy`.")
+        self.dimensions = dimensions
+
+    def transform(self, question: str) -> "np.ndarray":
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        words = tokens(question)
+        features = [(word, 1.0) for word in words]
+        features += [(f"{a}_{b}", BIGRAM_WEIGHT) for a, b in zip(words, words[1:])]
+        for feature, weight in features:
+            index, sign = _bucket(feature, self.dimensions)
+            vector[index] += sign * weight
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+
+class _Entry(NamedTuple):
+    question: str
+    table: str
+    sql: str
+    version: str
+    # Content words, which a match may reorder but not add to or drop
+    words: FrozenSet[str]
+    expires_at: float
+
+
+class SemanticIndex:
+    """Bounded nearest-neighbour index from question vectors to generated SQL.
+
+    Vectors live in one preallocated ``capacity x dimensions`` matrix, so a
+    lookup is a single matrix-vector product. A hit needs cosine similarity of
+    at least ``threshold`` with an entry for the same table and schema version
+    that hasn't expired, and the same set of words once stop words are removed:
+    a filter ("... in Germany"), a number ("top 3" vs "top 5") or a time word
+    ("last quarter" vs "this quarter") never matches a question without it.
+    When full, the least recently used entry is overwritten.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        capacity: int = DEFAULT_CAPACITY,
+        vectorizer: Optional[HashingVectorizer] = None,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.threshold = threshold
+        self.capacity = capacity
+        self.vectorizer = vectorizer or HashingVectorizer()
+        self._vectors = np.zeros((capacity, self.vectorizer.dimensions), dtype=np.float32)
+        self._entries: List[Optional[_Entry]] = [None] * capacity
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._slots: Dict[Tuple[str, str], int] = {}
+        self._tick = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def _touch(self, slot: int) -> None:
+        self._tick += 1
+        self._last_used[slot] = self._tick
+
+    def lookup(
+        self, question: str, table: str, version: str, now: Optional[float] = None
+    ) -> Optional[Tuple[str, float]]:
+        """``(sql, similarity)`` of the closest stored question, if it is close enough."""
+        vector = self.vectorizer.transform(question)
+        if not vector.any():
+            return None
+        wanted = frozenset(tokens(question))
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            similarities = self._vectors @ vector
+            for slot in np.argsort(-similarities):
+                similarity = float(similarities[slot])
+                if similarity < self.threshold:
+                    return None
+                entry = self._entries[slot]
+                if entry is not None and entry.expires_at <= now:
+                    self._drop(int(slot))
+                    continue
+                if entry is not None and entry.table == table.lower() and entry.version == version \
+                        and entry.words == wanted:
+                    self._touch(int(slot))
+                    self.hits += 1
+                    return entry.sql, similarity
+        return None
+
+    def add(self, question: str, table: str, sql: str, version: str, expires_at: float = math.inf) -> None:
+        vector = self.vectorizer.transform(question)
+        if not vector.any():
+            return
+        key = _key(question, table)
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                # Empty slots have never been used, so they go first
+                slot = int(np.argmin(self._last_used))
+                evicted = self._entries[slot]
+                if evicted is not None:
+                    self._slots.pop(_key(evicted.question, evicted.table), None)
+            self._vectors[slot] = vector
+            self._entries[slot] = _Entry(question, table.lower(), sql, version, frozenset(tokens(question)), expires_at)
+            self._slots[key] = slot
+            self._touch(slot)
+
+    def _drop(self, slot: int) -> None:
+        entry = self._entries[slot]
+        if entry is not None:
+            self._slots.pop(_key(entry.question, entry.table), None)
+        self._entries[slot] = None
+        self._vectors[slot] = 0
+        self._last_used[slot] = 0
+
+    def discard(self, question: str, table: str) -> None:
+        with self._lock:
+            slot = self._slots.get(_key(question, table))
+            if slot is not None:
+                self._drop(slot)
+
+    def discard_sql(self, sql: str, table: str) -> None:
+        """Drop every entry that would replay ``sql`` for ``table``."""
+        with self._lock:
+            for slot, entry in enumerate(self._entries):
+                if entry is not None and entry.sql == sql and entry.table == table.lower():
+                    self._drop(slot)
+
+    def invalidate(self, table: Optional[str] = None) -> None:
+        with self._lock:
+            for slot, entry in enumerate(self._entries):
+                if entry is not None and (table is None or entry.table == table.lower()):
+                    self._drop(slot)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+
+def default_semantic_index(capacity: int = DEFAULT_CAPACITY) -> Optional[SemanticIndex]:
+    """The index used by the shared NL cache, or None without NumPy, with a threshold <= 0 or no capacity."""
+    if np is None or DEFAULT_THRESHOLD <= 0 or capacity <= 0:
+        return None
+    return SemanticIndex(capacity=capacity)
@@ -0,0 +1,258 @@
+import asyncio
+import inspect
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from .async_client import AsyncClient, get_async_client
+
+DEFAULT_INITIAL_INTERVAL = float(os.environ.get("WORQHAT_TRACKER_INITIAL_SECONDS", "1"))
+DEFAULT_MAX_INTERVAL = float(os.environ.get("WORQHAT_TRACKER_MAX_SECONDS", "60"))
+DEFAULT_TIMEOUT = float(os.environ.get("WORQHAT_TRACKER_TIMEOUT", "3600"))
+DEFAULT_BACKOFF = 2.0
+DEFAULT_BATCH_SIZE = 500
+# Finished runs kept for lookups before the oldest are dropped
+DEFAULT_KEEP_FINISHED = 1000
+
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+FAILED = "failed"
+TIMED_OUT = "timed_out"
+TERMINAL_STATUSES = frozenset({COMPLETED, FAILED, TIMED_OUT})
+
+
+@dataclass
+class TrackedRun:
+    analytics_id: str
+    workflow_id: Optional[str] = None
+    status: str = IN_PROGRESS
+    # Wall-clock registration time, to bound status lookups by date
+    registered_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    polls: int = 0
+    next_poll_at: float = 0.0
+    deadline: float = 0.0
+    finished_at: Optional[datetime] = None
+    # Whatever the status source reported alongside the final status
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+
+RunCallback = Callable[[TrackedRun], Any]
+# Given the runs due for a poll, returns the known status (and details) per analytics_id
+StatusFetcher = Callable[[List[TrackedRun]], Awaitable[Dict[str, Dict[str, Any]]]]
+
+
+def metrics_status_fetcher(client: Optional[AsyncClient] = None) -> StatusFetcher:
+    """Look statuses up with one ``get_metrics`` call per poll, however many runs are due.
+
+    The API has no per-execution status call, so the workflow list from the
+    metrics endpoint, starting on the day the oldest due run was registered,
+    covers a whole batch at once.
+    """
+
+    async def fetch(runs: List[TrackedRun]) -> Dict[str, Dict[str, Any]]:
+        since = min(run.registered_at for run in runs) - timedelta(days=1)
+        response = await (client or get_async_client()).get_metrics(start_date=since.date().isoformat())
+        workflows = response.get("workflows") if isinstance(response, dict) else getattr(response, "workflows", None)
+        statuses: Dict[str, Dict[str, Any]] = {}
+        for workflow in workflows or []:
+            row = workflow if isinstance(workflow, dict) else workflow.model_dump()
+            if row.get("id"):
+                statuses[row["id"]] = row
+        return statuses
+
+    return fetch
+
+
+class WorkflowTracker:
+    """Tracks triggered workflow runs by ``analytics_id`` until they finish.
+
+    All runs due for a poll are looked up together in one batch of at most
+    ``batch_size``. Each run is first polled after ``initial_interval`` seconds
+    and then ``backoff`` times less often, up to ``max_interval``, so fresh runs
+    resolve quickly while long ones cost little. A run not finished after
+    ``timeout`` seconds ends as ``timed_out``. Callers can ``await`` a run or
+    register callbacks; :meth:`resolve` settles a run from any other source,
+    such as a webhook. The last ``keep_finished`` finished runs stay available
+    to :meth:`get`.
+    """
+
+    def __init__(
+        self,
+        fetch: Optional[StatusFetcher] = None,
+        initial_interval: float = DEFAULT_INITIAL_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        backoff: float = DEFAULT_BACKOFF,
+        timeout: float = DEFAULT_TIMEOUT,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        keep_finished: int = DEFAULT_KEEP_FINISHED,
+        poll: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._fetch = fetch or metrics_status_fetcher()
+        # Without polling, runs only finish through resolve() (e.g. webhooks) or time out
+        self.poll = poll
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self._clock = clock
+        self._runs: Dict[str, TrackedRun] = {}
+        self._callbacks: Dict[str, List[RunCallback]] = {}
+        self._waiters: Dict[str, List["asyncio.Future[TrackedRun]"]] = {}
+        self.keep_finished = keep_finished
+        self._finished: Deque[str] = deque()
+        self._wake = asyncio.Event()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.status_calls = 0
+        self.finished = 0
+
+    def track(
+        self, analytics_id: str, workflow_id: Optional[str] = None, callback: Optional[RunCallback] = None
+    ) -> TrackedRun:
+        """Start tracking ``analytics_id`` (tracking it twice is a no-op) and optionally add a callback."""
+        run = self._runs.get(analytics_id)
+        if run is None:
+            now = self._clock()
+            run = TrackedRun(
+                analytics_id,
+                workflow_id,
+                next_poll_at=now + self.initial_interval,
+                deadline=now + self.timeout,
+            )
+            self._runs[analytics_id] = run
+            self._wake.set()
+        if callback is not None:
+            self.add_callback(analytics_id, callback)
+        return run
+
+    def get(self, analytics_id: str) -> Optional[TrackedRun]:
+        return self._runs.get(analytics_id)
+
+    def add_callback(self, analytics_id: str, callback: RunCallback) -> None:
+        """Call ``callback(run)`` when the run finishes (right away if it already has)."""
+        run = self._runs[analytics_id]
+        if run.done:
+            self._call(callback, run)
+        else:
+            self._callbacks.setdefault(analytics_id, []).append(callback)
+
+    async def wait(self, analytics_id: str, timeout: Optional[float] = None) -> TrackedRun:
+        """Wait for the run to finish, tracking it first if needed."""
+        run = self.track(analytics_id)
+        if run.done:
+            return run
+        future: "asyncio.Future[TrackedRun]" = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(analytics_id, []).append(future)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        finally:
+            waiters = self._waiters.get(analytics_id)
+            if waiters and future in waiters:
+                waiters.remove(future)
+
+    def resolve(self, analytics_id: str, status: str, details: Optional[Dict[str, Any]] = None) -> bool:
+        """Record the final status of a tracked run; False if it isn't tracked or already finished."""
+        run = self._runs.get(analytics_id)
+        if run is None or run.done or status not in TERMINAL_STATUSES:
+            return False
+        run.status = status
+        run.details = details or {}
+        run.finished_at = datetime.now(timezone.utc)
+        self.finished += 1
+        self._finished.append(analytics_id)
+        while len(self._finished) > self.keep_finished:
+            self._runs.pop(self._finished.popleft(), None)
+        for future in self._waiters.pop(analytics_id, []):
+            if not future.done():
+                future.set_result(run)
+        for callback in self._callbacks.pop(analytics_id, []):
+            self._call(callback, run)
+        return True
+
+    def _call(self, callback: RunCallback, run: TrackedRun) -> None:
+        try:
+            outcome = callback(run)
+            if inspect.isawaitable(outcome):
+                asyncio.ensure_future(outcome)
+        except Exception as e:
+            print(f"Workflow tracker callback for {run.analytics_id} failed: {str(e)}")
+
+    def pending(self) -> List[TrackedRun]:
+        return [run for run in self._runs.values() if not run.done]
+
+    async def poll_once(self) -> int:
+        """Look up every run that is due, in batches; returns how many runs were polled."""
+        now = self._clock()
+        for run in self.pending():
+            if run.deadline <= now:
+                self.resolve(run.analytics_id, TIMED_OUT)
+        if not self.poll:
+            return 0
+        due = sorted((run for run in self.pending() if run.next_poll_at <= now), key=lambda run: run.next_poll_at)
+        for start in range(0, len(due), self.batch_size):
+            batch = due[start:start + self.batch_size]
+            self.status_calls += 1
+            try:
+                statuses = await self._fetch(batch)
+            except Exception as e:
+                print(f"Workflow status lookup failed: {str(e)}")
+                statuses = {}
+            for run in batch:
+                found = statuses.get(run.analytics_id)
+                if found is not None and found.get("status") in TERMINAL_STATUSES:
+                    self.resolve(run.analytics_id, found["status"], found)
+                    continue
+                run.polls += 1
+                run.next_poll_at = self._clock() + min(
+                    self.initial_interval * self.backoff ** run.polls, self.max_interval
+                )
+        return len(due)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tracked": len(self._runs),
+            "pending": len(self.pending()),
+            "finished": self.finished,
+            "status_calls": self.status_calls,
+        }
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+            except Exception as e:
+                print(f"Workflow tracker error: {str(e)}")
+            pending = self.pending()
+            delay = self.max_interval
+            if pending:
+                wake_at = min(run.next_poll_at if self.poll else run.deadline for run in pending)
+                delay = max(0.0, min(delay, wake_at - self._clock()))
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> "asyncio.Task[None]":
+        if self._task is None or self._task.done():
+            # Events bind to the loop that first waits on them, and the app may be restarted on a new one
+            self._wake = asyncio.Event()
+            self._task = asyncio.ensure_future(self._loop())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
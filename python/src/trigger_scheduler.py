@@ -0,0 +1,267 @@
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Literal, Optional, Set, Tuple
+
+from .async_client import AsyncClient, get_async_client
+
+Priority = Literal["high", "normal", "low"]
+# Served strictly in this order, apart from jobs that waited longer than max_wait
+PRIORITIES: Tuple[Priority, ...] = ("high", "normal", "low")
+
+DEFAULT_CONCURRENCY = int(os.environ.get("WORQHAT_SCHEDULER_CONCURRENCY", "16"))
+DEFAULT_WORKFLOW_MAX_IN_FLIGHT = int(os.environ.get("WORQHAT_SCHEDULER_WORKFLOW_MAX", "8"))
+# A job queued longer than this is served next whatever its class, so low never starves outright
+DEFAULT_MAX_WAIT = float(os.environ.get("WORQHAT_SCHEDULER_MAX_WAIT", "30"))
+
+
+def priority_of(payload: Dict[str, Any], default: Priority = "normal") -> Priority:
+    """The payload's own ``"priority"`` field if it names a class, else ``default``."""
+    value = payload.get("priority")
+    return value if value in PRIORITIES else default
+
+
+@dataclass
+class _Job:
+    workflow_id: str
+    payload: Dict[str, Any]
+    with_file: bool
+    priority: Priority
+    finish: float
+    enqueued_at: float
+    future: "asyncio.Future[Any]" = field(repr=False)
+
+
+def _is_throttled(error: BaseException) -> bool:
+    return getattr(error, "status_code", None) == 429
+
+
+class TriggerScheduler:
+    """Orders outbound workflow triggers by priority class and fairness between workflows.
+
+    At most ``concurrency`` triggers are in flight overall, and at most
+    ``max_in_flight`` per workflow id (``default_max_in_flight`` unless set).
+    The next trigger comes from the highest non-empty priority class; within a
+    class, workflows share capacity by weighted fair queuing (virtual finish
+    tags), so one workflow's backlog can't crowd out the others. A trigger
+    queued longer than ``max_wait`` goes first regardless of class. A 429
+    halves the usable concurrency and successes grow it back one step at a
+    time, so near the rate limit the capacity that remains goes to high
+    priority work.
+
+    ``trigger_with_payload`` and ``trigger_with_file`` mirror
+    :class:`AsyncClient`, so a scheduler can be passed wherever a client is
+    (``iter_triggers``, ``trigger_once_async``, the outbox dispatcher);
+    :meth:`with_priority` does the same for one fixed class.
+    """
+
+    def __init__(
+        self,
+        client: Optional[AsyncClient] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        default_max_in_flight: int = DEFAULT_WORKFLOW_MAX_IN_FLIGHT,
+        max_in_flight: Optional[Dict[str, int]] = None,
+        weights: Optional[Dict[str, float]] = None,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        self._client = client
+        self.concurrency = concurrency
+        self.default_max_in_flight = default_max_in_flight
+        self.max_in_flight = dict(max_in_flight or {})
+        self.weights = dict(weights or {})
+        self.max_wait = max_wait
+        self._clock = clock
+        self._capacity = float(concurrency)
+        self._queues: Dict[Priority, Dict[str, Deque[_Job]]] = {priority: {} for priority in PRIORITIES}
+        self._virtual: Dict[Priority, float] = {priority: 0.0 for priority in PRIORITIES}
+        self._last_finish: Dict[Tuple[Priority, str], float] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._running: Set["asyncio.Task[None]"] = set()
+        self.started: Dict[Priority, int] = {priority: 0 for priority in PRIORITIES}
+        self.throttled = 0
+
+    @property
+    def client(self) -> AsyncClient:
+        if self._client is None:
+            self._client = get_async_client()
+        return self._client
+
+    @property
+    def capacity(self) -> int:
+        """How many triggers may be in flight right now (lower after throttling)."""
+        return max(1, int(self._capacity))
+
+    def set_limit(self, workflow_id: str, max_in_flight: Optional[int] = None, weight: Optional[float] = None) -> None:
+        if max_in_flight is not None:
+            self.max_in_flight[workflow_id] = max_in_flight
+        if weight is not None:
+            self.weights[workflow_id] = weight
+
+    def submit(
+        self,
+        workflow_id: str,
+        payload: Dict[str, Any],
+        priority: Optional[Priority] = None,
+        with_file: bool = False,
+    ) -> "asyncio.Future[Any]":
+        """Queue a trigger; the future resolves to the SDK response (``priority`` defaults to the payload's)."""
+        priority = priority or priority_of(payload)
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority!r}")
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        key = (priority, workflow_id)
+        # Weighted fair queuing: each job finishes 1/weight after the later of now and its flow's previous job
+        start = max(self._virtual[priority], self._last_finish.get(key, 0.0))
+        finish = start + 1.0 / self.weights.get(workflow_id, 1.0)
+        self._last_finish[key] = finish
+        job = _Job(workflow_id, payload, with_file, priority, finish, self._clock(), future)
+        self._queues[priority].setdefault(workflow_id, deque()).append(job)
+        self._dispatch()
+        return future
+
+    async def trigger(
+        self,
+        workflow_id: str,
+        payload: Dict[str, Any],
+        priority: Optional[Priority] = None,
+        with_file: bool = False,
+    ) -> Any:
+        return await self.submit(workflow_id, payload, priority, with_file)
+
+    async def trigger_with_payload(self, workflow_id: str, body: Dict[str, Any], priority: Optional[Priority] = None) -> Any:
+        return await self.submit(workflow_id, body, priority)
+
+    async def trigger_with_file(self, workflow_id: str, payload: Dict[str, Any], priority: Optional[Priority] = None) -> Any:
+        return await self.submit(workflow_id, payload, priority, with_file=True)
+
+    def with_priority(self, priority: Priority) -> "PriorityClient":
+        """A client-shaped view that submits every trigger as ``priority``."""
+        return PriorityClient(self, priority)
+
+    def _limit(self, workflow_id: str) -> int:
+        return self.max_in_flight.get(workflow_id, self.default_max_in_flight)
+
+    def _heads(self) -> List[_Job]:
+        """The first queued job of every workflow that still has in-flight room."""
+        return [
+            queue[0]
+            for queues in self._queues.values()
+            for workflow_id, queue in queues.items()
+            if queue and self._in_flight.get(workflow_id, 0) < self._limit(workflow_id)
+        ]
+
+    def _pick(self) -> Optional[_Job]:
+        heads = self._heads()
+        if not heads:
+            return None
+        overdue = [job for job in heads if self._clock() - job.enqueued_at >= self.max_wait]
+        if overdue:
+            return min(overdue, key=lambda job: job.enqueued_at)
+        for priority in PRIORITIES:
+            candidates = [job for job in heads if job.priority == priority]
+            if candidates:
+                return min(candidates, key=lambda job: job.finish)
+        return None
+
+    def _dispatch(self) -> None:
+        while sum(self._in_flight.values()) < self.capacity:
+            job = self._pick()
+            if job is None:
+                return
+            queues = self._queues[job.priority]
+            queues[job.workflow_id].popleft()
+            if not queues[job.workflow_id]:
+                del queues[job.workflow_id]
+            if job.future.done():
+                # Cancelled while queued
+                self._forget(job.workflow_id)
+                continue
+            self._virtual[job.priority] = max(self._virtual[job.priority], job.finish - 1.0 / self.weights.get(job.workflow_id, 1.0))
+            self._in_flight[job.workflow_id] = self._in_flight.get(job.workflow_id, 0) + 1
+            self.started[job.priority] += 1
+            task = asyncio.ensure_future(self._run(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, job: _Job) -> None:
+        try:
+            if job.with_file:
+                response = await self.client.trigger_with_file(job.workflow_id, job.payload)
+            else:
+                response = await self.client.trigger_with_payload(job.workflow_id, job.payload)
+        except asyncio.CancelledError:
+            # The scheduler's loop is shutting down; don't leave the caller waiting forever
+            job.future.cancel()
+            raise
+        except Exception as e:
+            if _is_throttled(e):
+                self.throttled += 1
+                self._capacity = max(1.0, self._capacity / 2)
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            self._capacity = min(float(self.concurrency), self._capacity + 1.0 / self._capacity)
+            if not job.future.done():
+                job.future.set_result(response)
+        finally:
+            self._in_flight[job.workflow_id] -= 1
+            if not self._in_flight[job.workflow_id]:
+                del self._in_flight[job.workflow_id]
+                self._forget(job.workflow_id)
+            self._dispatch()
+
+    def _forget(self, workflow_id: str) -> None:
+        """Drop the finish tags of an idle workflow; it starts from virtual time when it comes back."""
+        if workflow_id in self._in_flight:
+            return
+        for priority, queues in self._queues.items():
+            if workflow_id not in queues:
+                self._last_finish.pop((priority, workflow_id), None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "in_flight": dict(self._in_flight),
+            "queued": {
+                priority: sum(len(queue) for queue in queues.values()) for priority, queues in self._queues.items()
+            },
+            "started": dict(self.started),
+            "throttled": self.throttled,
+        }
+
+
+class PriorityClient:
+    """:class:`TriggerScheduler` as an :class:`AsyncClient` lookalike pinned to one priority class."""
+
+    def __init__(self, scheduler: TriggerScheduler, priority: Priority) -> None:
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority!r}")
+        self.scheduler = scheduler
+        self.priority = priority
+
+    async def trigger_with_payload(self, workflow_id: str, body: Dict[str, Any]) -> Any:
+        return await self.scheduler.submit(workflow_id, body, self.priority)
+
+    async def trigger_with_file(self, workflow_id: str, payload: Dict[str, Any]) -> Any:
+        return await self.scheduler.submit(workflow_id, payload, self.priority, with_file=True)
+
+
+_scheduler: Optional[TriggerScheduler] = None
+
+
+def get_trigger_scheduler() -> TriggerScheduler:
+    """The shared scheduler used by the async trigger examples."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = TriggerScheduler()
+    return _scheduler
+
+
+def clear_trigger_scheduler() -> None:
+    global _scheduler
+    _scheduler = None
@@ -0,0 +1,158 @@
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Literal, Mapping, Optional
+
+import httpx
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+from .tracker import WorkflowTracker
+
+SIGNATURE_HEADER = "X-Worqhat-Signature"
+TIMESTAMP_HEADER = "X-Worqhat-Timestamp"
+# Callbacks signed longer ago than this are rejected as replays
+DEFAULT_TOLERANCE = float(os.environ.get("WORQHAT_WEBHOOK_TOLERANCE", "300"))
+# Where the app is served; the README runs it with `uvicorn ... --port 4000`
+APP_URL = os.environ.get("WORQHAT_APP_URL", "http://localhost:4000").rstrip("/")
+DEFAULT_WEBHOOK_URL = f"{APP_URL}/webhooks/workflow-complete"
+
+
+class WebhookVerificationError(ValueError):
+    """A callback whose signature or timestamp can't be trusted."""
+
+
+class InvalidCallbackError(ValueError):
+    """A verified callback whose body isn't a workflow completion."""
+
+
+class WorkflowCompletion(BaseModel):
+    """Body of a workflow-completion callback; unknown fields are kept as details."""
+
+    model_config = ConfigDict(extra="allow")
+
+    analytics_id: str
+    status: Literal["completed", "failed"]
+    workflow_id: Optional[str] = None
+    completed_at: Optional[datetime] = None
+    output: Optional[Any] = None
+    error: Optional[str] = None
+
+
+def sign(body: bytes, secret: str, timestamp: str) -> str:
+    """``sha256=<hex>`` HMAC of ``"<timestamp>.<body>"``."""
+    digest = hmac.new(secret.encode("utf-8"), timestamp.encode("utf-8") + b"." + body, hashlib.sha256)
+    return f"sha256={digest.hexdigest()}"
+
+
+def verify_signature(
+    body: bytes,
+    secret: str,
+    signature: Optional[str],
+    timestamp: Optional[str],
+    tolerance: float = DEFAULT_TOLERANCE,
+    now: Optional[float] = None,
+) -> None:
+    if not signature or not timestamp:
+        raise WebhookVerificationError("Missing signature or timestamp header")
+    try:
+        age = abs((now if now is not None else time.time()) - float(timestamp))
+    except ValueError:
+        raise WebhookVerificationError("Invalid timestamp header") from None
+    if age > tolerance:
+        raise WebhookVerificationError("Timestamp outside the allowed window")
+    if not hmac.compare_digest(sign(body, secret, timestamp), signature):
+        raise WebhookVerificationError("Signature mismatch")
+
+
+def parse_completion(body: bytes) -> WorkflowCompletion:
+    try:
+        return WorkflowCompletion.model_validate_json(body)
+    except ValidationError as e:
+        raise InvalidCallbackError(f"Invalid callback body: {e.errors()[0]['msg']}") from None
+
+
+def handle_completion(
+    body: bytes,
+    headers: Mapping[str, str],
+    secret: str,
+    tracker: WorkflowTracker,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> bool:
+    """Verify a callback and settle its run in ``tracker``; False if the run had already finished.
+
+    A callback for a run nobody is tracking yet is still recorded, so a caller
+    that starts waiting after the push arrived gets the result at once.
+    """
+    verify_signature(body, secret, headers.get(SIGNATURE_HEADER), headers.get(TIMESTAMP_HEADER), tolerance)
+    completion = parse_completion(body)
+    tracker.track(completion.analytics_id, completion.workflow_id)
+    return tracker.resolve(completion.analytics_id, completion.status, completion.model_dump(mode="json"))
+
+
+def sample_completion(analytics_id: str, status: str = "completed", workflow_id: Optional[str] = None) -> Dict[str, Any]:
+    """A callback body like the ones the local stand-in posts."""
+    completion: Dict[str, Any] = {
+        "analytics_id": analytics_id,
+        "status": status,
+        "workflow_id": workflow_id,
+        "completed_at": datetime.now(timezone.utc).isoformat(),
+    }
+    if status == "failed":
+        completion["error"] = "Sample failure"
+    else:
+        completion["output"] = {"message": "Sample output"}
+    return completion
+
+
+async def post_sample_callbacks(
+    analytics_ids: List[str],
+    secret: str,
+    url: str = DEFAULT_WEBHOOK_URL,
+    status: str = "completed",
+    delay: float = 0.0,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> List[int]:
+    """Post a signed sample completion for each id, ``delay`` seconds apart; returns the status codes.
+
+    Pass ``transport=httpx.ASGITransport(app=app)`` to call the app in-process.
+    """
+    codes = []
+    async with httpx.AsyncClient(transport=transport) as http:
+        for analytics_id in analytics_ids:
+            if delay:
+                await asyncio.sleep(delay)
+            body = json.dumps(sample_completion(analytics_id, status)).encode("utf-8")
+            timestamp = str(int(time.time()))
+            response = await http.post(url, content=body, headers={
+                "Content-Type": "application/json",
+                SIGNATURE_HEADER: sign(body, secret, timestamp),
+                TIMESTAMP_HEADER: timestamp,
+            })
+            codes.append(response.status_code)
+    return codes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Post sample workflow-completion callbacks to a running app.")
+    parser.add_argument("analytics_ids", nargs="+")
+    parser.add_argument("--url", default=DEFAULT_WEBHOOK_URL)
+    parser.add_argument("--status", choices=["completed", "failed"], default="completed")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds between callbacks")
+    parser.add_argument("--secret", default=os.environ.get("WORQHAT_WEBHOOK_SECRET"))
+    args = parser.parse_args(argv)
+    if not args.secret:
+        parser.error("--secret or WORQHAT_WEBHOOK_SECRET is required")
+    codes = asyncio.run(post_sample_callbacks(args.analytics_ids, args.secret, args.url, args.status, args.delay))
+    for analytics_id, code in zip(args.analytics_ids, codes):
+        print(f"{analytics_id}: HTTP {code}")
+    return 0 if all(code == 200 for code in codes) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
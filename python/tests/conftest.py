@@ -0,0 +1,42 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make the `src` package importable when running `pytest` from the python/ folder.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.async_client import close_async_clients  # noqa: E402
+from src.client_pool import close_clients  # noqa: E402
+from src.diff_update import clear_snapshots  # noqa: E402
+from src.idempotency import clear_idempotency  # noqa: E402
+from src.latency import clear_latency  # noqa: E402
+from src.nl_cache import clear_nl_cache  # noqa: E402
+from src.outbox import close_outboxes  # noqa: E402
+from src.query_cache import clear_query_caches  # noqa: E402
+from src.trigger_scheduler import clear_trigger_scheduler  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def reset_client_pool():
+    """Start every test with empty client registries so patched clients don't leak."""
+    close_clients()
+    asyncio.run(close_async_clients())
+    clear_query_caches()
+    clear_snapshots()
+    clear_nl_cache()
+    clear_latency()
+    close_outboxes()
+    clear_idempotency()
+    clear_trigger_scheduler()
+    yield
+    close_clients()
+    asyncio.run(close_async_clients())
+    clear_query_caches()
+    clear_snapshots()
+    clear_nl_cache()
+    clear_latency()
+    close_outboxes()
+    clear_idempotency()
+    clear_trigger_scheduler()
@@ -0,0 +1,75 @@
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.async_client import AsyncClient, close_async_clients, get_async_client
+
+
+def make_async_sdk():
+    """Build a stand-in AsyncWorqhat whose resource methods are awaitable."""
+    sdk = MagicMock()
+    sdk.db.execute_query = AsyncMock(return_value={"data": [{"id": 1}]})
+    sdk.db.insert_record = AsyncMock(return_value={"data": {"documentId": "doc_1"}})
+    sdk.flows.trigger_with_payload = AsyncMock(return_value={"analytics_id": "wf-1"})
+    sdk.close = AsyncMock()
+    return sdk
+
+
+class TestAsyncClient:
+    """Test suite for the async client facade."""
+
+    @pytest.mark.asyncio
+    @patch('src.async_client.AsyncWorqhat')
+    async def test_execute_query_awaits_sdk(self, mock_async_worqhat_class):
+        """Test that execute_query awaits the SDK call with the same arguments."""
+        sdk = make_async_sdk()
+        mock_async_worqhat_class.return_value = sdk
+
+        client = AsyncClient(api_key="test-api-key", environment="test")
+        result = await client.execute_query("SELECT * FROM users WHERE id = {a}", {"a": 1})
+
+        mock_async_worqhat_class.assert_called_once_with(api_key="test-api-key", base_url=None)
+        sdk.db.execute_query.assert_awaited_once_with(query="SELECT * FROM users WHERE id = {a}", params={"a": 1})
+        assert result == {"data": [{"id": 1}]}
+
+    @pytest.mark.asyncio
+    @patch('src.async_client.AsyncWorqhat')
+    async def test_trigger_with_payload_passes_body(self, mock_async_worqhat_class):
+        """Test that workflow triggers forward the workflow id and body."""
+        sdk = make_async_sdk()
+        mock_async_worqhat_class.return_value = sdk
+
+        client = AsyncClient(api_key="test-api-key", environment="test")
+        result = await client.trigger_with_payload("wf-id", {"orderId": "ORD-1"})
+
+        sdk.flows.trigger_with_payload.assert_awaited_once_with("wf-id", body={"orderId": "ORD-1"})
+        assert result == {"analytics_id": "wf-1"}
+
+    @pytest.mark.asyncio
+    @patch.dict(os.environ, {
+        "WORQHAT_API_KEY": "test-api-key",
+        "WORQHAT_ENVIRONMENT": "test"
+    })
+    @patch('src.async_client.AsyncWorqhat')
+    async def test_get_async_client_reuses_and_closes(self, mock_async_worqhat_class):
+        """Test that the async registry reuses clients and closes them on shutdown."""
+        sdk = make_async_sdk()
+        mock_async_worqhat_class.return_value = sdk
+
+        assert get_async_client() is get_async_client()
+        await close_async_clients()
+
+        sdk.close.assert_awaited_once()
+        assert mock_async_worqhat_class.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_builds_real_async_sdk_client(self):
+        """Test that the facade wraps a real AsyncWorqhat instance."""
+        from worqhat import AsyncWorqhat
+
+        client = get_async_client(api_key="test-api-key", environment="production")
+
+        assert isinstance(client._client, AsyncWorqhat)
+        assert client._client.api_key == "test-api-key"
+        await close_async_clients()
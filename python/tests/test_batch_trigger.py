@@ -0,0 +1,134 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from worqhat import APIConnectionError
+
+from src.batch_trigger import TriggerBatchReport, is_transient, iter_triggers, trigger_batch
+from src.trigger_scheduler import get_trigger_scheduler
+
+
+class Throttled(Exception):
+    status_code = 429
+
+
+class BadRequest(Exception):
+    status_code = 400
+
+
+def trigger_client(side_effect=None, delay=0.0):
+    client = MagicMock()
+    state = {"in_flight": 0, "peak": 0}
+
+    async def trigger_with_payload(workflow_id, body):
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        try:
+            await asyncio.sleep(delay)
+            if side_effect is not None:
+                return side_effect(workflow_id, body)
+            return {"analytics_id": f"{workflow_id}-{body['n']}"}
+        finally:
+            state["in_flight"] -= 1
+
+    client.trigger_with_payload = AsyncMock(side_effect=trigger_with_payload)
+    return client, state
+
+
+class TestBatchTrigger:
+    """Test suite for batched workflow triggers."""
+
+    @pytest.mark.asyncio
+    async def test_trigger_batch_caps_concurrency(self):
+        """Test that no more than `concurrency` triggers are in flight."""
+        client, state = trigger_client(delay=0.01)
+
+        report = await trigger_batch((("wf", {"n": n}) for n in range(20)), concurrency=4, client=client)
+
+        assert state["peak"] == 4
+        assert report.total == 20 and report.succeeded == 20 and report.failed == 0
+        assert report.analytics_ids == [f"wf-{n}" for n in range(20)]
+        assert report.triggers_per_second > 0
+
+    @pytest.mark.asyncio
+    async def test_transient_failures_are_retried(self):
+        """Test that throttled triggers are retried and counted in the report."""
+        calls = {"n": 0}
+
+        def flaky(workflow_id, body):
+            calls["n"] += 1
+            if calls["n"] <= 2:
+                raise Throttled("slow down")
+            return {"analytics_id": "wf-ok"}
+
+        client, _ = trigger_client(side_effect=flaky)
+        report = await trigger_batch([("wf", {"n": 0})], max_retries=3, retry_delay=0, client=client)
+
+        assert report.results[0].ok and report.results[0].attempts == 3
+        assert report.retries == 2
+
+    @pytest.mark.asyncio
+    async def test_permanent_failures_are_not_retried(self):
+        """Test that a 400 fails the trigger on the first attempt."""
+        def reject(workflow_id, body):
+            raise BadRequest("invalid payload")
+
+        client, _ = trigger_client(side_effect=reject)
+        report = await trigger_batch([("wf", {"n": 0})], retry_delay=0, client=client)
+
+        assert report.failed == 1
+        assert report.results[0].attempts == 1 and report.results[0].error == "invalid payload"
+
+    @pytest.mark.asyncio
+    async def test_iter_triggers_streams_and_reads_lazily(self):
+        """Test that results stream before the input is exhausted."""
+        client, _ = trigger_client()
+        consumed = []
+
+        def source():
+            for n in range(100):
+                consumed.append(n)
+                yield ("wf", {"n": n})
+
+        report = TriggerBatchReport()
+        stream = iter_triggers(source(), concurrency=2, client=client, report=report)
+        first = await stream.__anext__()
+        await stream.aclose()
+
+        assert first.ok and first.analytics_id.startswith("wf-")
+        assert len(consumed) < 10
+        assert report.succeeded == 1
+
+    def test_is_transient(self):
+        """Test which errors are retried."""
+        request = httpx.Request("POST", "https://api.worqhat.com")
+        assert is_transient(APIConnectionError(request=request))
+        assert is_transient(Throttled())
+        assert is_transient(type("ServerError", (Exception,), {"status_code": 503})())
+        assert not is_transient(BadRequest())
+        assert not is_transient(ValueError("bad"))
+
+    @patch("src.async_client.AsyncWorqhat")
+    @patch("src.client_pool.Worqhat")
+    def test_bulk_route_streams_results_then_summary(self, _mock_worqhat_class, mock_async_worqhat_class):
+        """Test /flows/trigger-json/bulk emits one line per trigger and a final summary."""
+        from fastapi.testclient import TestClient
+        from src.app import app
+
+        sdk = MagicMock()
+        sdk.flows.trigger_with_payload = AsyncMock(side_effect=lambda workflow_id, body: {"analytics_id": body["orderId"]})
+        sdk.close = AsyncMock()
+        mock_async_worqhat_class.return_value = sdk
+
+        body = [{"workflow_id": "orders", "payload": {"orderId": f"ORD-{n}"}} for n in range(3)]
+        with TestClient(app) as client:
+            response = client.post("/flows/trigger-json/bulk?concurrency=2", json=body)
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert response.status_code == 200
+        assert sorted(line["analytics_id"] for line in lines[:-1]) == ["ORD-0", "ORD-1", "ORD-2"]
+        assert lines[-1]["summary"]["succeeded"] == 3
+        # Bulk triggers go through the shared scheduler as low priority
+        assert get_trigger_scheduler().stats()["started"]["low"] == 3
@@ -0,0 +1,102 @@
+import asyncio
+import re
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.batch_update import batch_update, group_updates, update_in_statement
+from src.diff_update import get_snapshot_store
+
+
+def recording_client(existing, fail_values=()):
+    """execute_query stand-in that 'updates' the keys present in `existing`."""
+    state = {"statements": [], "in_flight": 0, "peak": 0}
+
+    async def execute_query(query, params=None, use_cache=True):
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        try:
+            await asyncio.sleep(0)
+            state["statements"].append((query.text, params))
+            if params.get("set_0") in fail_values:
+                raise Exception("Request timed out")
+            keys = [value for name, value in params.items() if name.startswith("key_")]
+            return {"data": [{"documentId": key} for key in keys if key in existing]}
+        finally:
+            state["in_flight"] -= 1
+
+    client = MagicMock()
+    client.execute_query = execute_query
+    return client, state
+
+
+class TestBatchUpdate:
+    """Test suite for grouped batch updates."""
+
+    def test_identical_changes_are_grouped(self):
+        """Test grouping by change set, with the last change for a key winning."""
+        groups = group_updates([
+            ("a", {"tier": "gold"}),
+            ("b", {"tier": "silver"}),
+            ("c", {"tier": "gold"}),
+            ("b", {"tier": "gold"}),
+        ])
+
+        assert groups == [({"tier": "gold"}, ["a", "b", "c"])]
+
+    def test_statement(self):
+        """Test the generated WHERE IN update."""
+        query, params = update_in_statement("users", "documentId", {"tier": "gold"}, ["a", "b"])
+
+        assert query.text == 'UPDATE "users" SET "tier" = {set_0} WHERE "documentId" IN ({key_0}, {key_1}) RETURNING "documentId"'
+        assert params == {"set_0": "gold", "key_0": "a", "key_1": "b"}
+
+    @pytest.mark.asyncio
+    async def test_per_row_results(self):
+        """Test one call per change set and per-row outcomes."""
+        client, state = recording_client(existing={"a", "b", "c"})
+        updates = [("a", {"tier": "gold"}), ("b", {"tier": "silver"}), ("c", {"tier": "gold"}), ("zz", {"tier": "gold"})]
+
+        report = await batch_update("users", updates, client=client)
+
+        assert report.calls == 2
+        assert report.updated == 3
+        assert [(r.key, r.ok, r.error) for r in report.failed] == [("zz", False, "No matching row")]
+        assert report.groups == [{"tier": "gold"}, {"tier": "silver"}]
+
+    @pytest.mark.asyncio
+    async def test_large_groups_are_split_and_run_concurrently(self):
+        """Test max_keys splitting and the concurrency cap."""
+        keys = [f"doc_{i}" for i in range(25)]
+        client, state = recording_client(existing=set(keys))
+
+        report = await batch_update("users", [(key, {"tier": "gold"}) for key in keys],
+                                    max_keys=10, concurrency=2, client=client)
+
+        assert report.calls == 3
+        assert [len(re.findall(r"\{key_\d+\}", text)) for text, _ in state["statements"]] == [10, 10, 5]
+        assert state["peak"] <= 2
+        assert report.updated == 25
+
+    @pytest.mark.asyncio
+    async def test_failed_statement_fails_only_its_rows(self):
+        """Test that an error is reported on the rows of the failing group only."""
+        client, _ = recording_client(existing={"a", "b"}, fail_values={"silver"})
+
+        report = await batch_update("users", [("a", {"tier": "gold"}), ("b", {"tier": "silver"})], client=client)
+
+        assert [(r.key, r.ok) for r in report.results] == [("a", True), ("b", False)]
+        assert report.failed[0].error == "Request timed out"
+
+    @pytest.mark.asyncio
+    async def test_drops_diff_snapshots(self):
+        """Test that a batch update invalidates the table's diff snapshots."""
+        client, _ = recording_client(existing={"a"})
+        store = get_snapshot_store()
+        store.merge("users", {"documentId": "a"}, {"tier": "silver"})
+        store.merge("orders", {"documentId": "a"}, {"state": "open"})
+
+        await batch_update("users", [("a", {"tier": "gold"})], client=client)
+
+        assert store.get("users", {"documentId": "a"}) is None
+        assert store.get("orders", {"documentId": "a"}) == {"state": "open"}
@@ -0,0 +1,124 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.bulk_insert import ChunkSizer, bulk_insert, retry_failed
+
+
+def recording_client(fail_first_rows=()):
+    """insert_record stand-in; chunks starting with a row in fail_first_rows fail once."""
+    state = {"sent": [], "failed": set(), "in_flight": 0, "peak": 0}
+
+    async def insert_record(table, data):
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        try:
+            first = data[0]["n"]
+            if first in fail_first_rows and first not in state["failed"]:
+                state["failed"].add(first)
+                raise Exception("Request timed out")
+            state["sent"].append([row["n"] for row in data])
+            return {"data": [{"documentId": f"doc_{row['n']}"} for row in data]}
+        finally:
+            state["in_flight"] -= 1
+
+    client = MagicMock()
+    client.insert_record = AsyncMock(side_effect=insert_record)
+    return client, state
+
+
+def rows(count):
+    # A generator, so the whole input is never materialized
+    return ({"n": i} for i in range(count))
+
+
+class TestBulkInsert:
+    """Test suite for chunked parallel bulk insert."""
+
+    @pytest.mark.asyncio
+    async def test_generator_is_split_into_chunks(self):
+        """Test that every row is sent exactly once, in chunks."""
+        client, state = recording_client()
+        sizer = ChunkSizer(initial=10, min_size=10, max_size=10)
+
+        report = await bulk_insert("products", rows(25), client=client, sizer=sizer, keep_chunks=True)
+
+        assert [chunk.size for chunk in report.chunks] == [10, 10, 5]
+        assert sorted(n for chunk in state["sent"] for n in chunk) == list(range(25))
+        assert report.rows_inserted == 25
+        assert report.chunks[2].document_ids == ["doc_20", "doc_21", "doc_22", "doc_23", "doc_24"]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        """Test that no more than `concurrency` chunks are in flight."""
+        client, state = recording_client()
+        sizer = ChunkSizer(initial=1, min_size=1, max_size=1)
+
+        await bulk_insert("products", rows(20), concurrency=3, client=client, sizer=sizer)
+
+        assert state["peak"] <= 3
+
+    @pytest.mark.asyncio
+    async def test_only_failed_chunk_is_retried(self):
+        """Test per-chunk retries leave successful chunks alone."""
+        client, state = recording_client(fail_first_rows={10})
+        sizer = ChunkSizer(initial=10, min_size=10, max_size=10)
+
+        report = await bulk_insert("products", rows(30), client=client, sizer=sizer, retry_delay=0, keep_chunks=True)
+
+        assert report.rows_failed == 0
+        assert report.chunks[1].attempts == 2
+        assert report.chunks[0].attempts == 1
+        assert client.insert_record.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_exhausted_chunks_can_be_retried_later(self):
+        """Test that chunks failing every attempt keep their rows for retry_failed."""
+        client, _ = recording_client(fail_first_rows={0})
+        sizer = ChunkSizer(initial=5, min_size=5, max_size=5)
+
+        report = await bulk_insert("products", rows(10), client=client, sizer=sizer, max_retries=0)
+
+        assert report.rows_failed == 5
+        failed = report.failed_chunks[0]
+        assert failed.error == "Request timed out"
+        assert [row["n"] for row in failed.rows] == [0, 1, 2, 3, 4]
+
+        await retry_failed(report, client=client, retry_delay=0)
+
+        assert report.rows_failed == 0 and report.rows_inserted == 10
+        assert report.failed_chunks == []
+        assert failed.ok and failed.rows is None
+
+    @pytest.mark.asyncio
+    async def test_settled_chunks_are_not_kept_by_default(self):
+        """Test that only totals and failed chunks stay on the report, and no finished task is held."""
+        client, _ = recording_client(fail_first_rows={0})
+        sizer = ChunkSizer(initial=5, min_size=5, max_size=5)
+        seen = []
+
+        report = await bulk_insert("products", rows(20), client=client, sizer=sizer, max_retries=0,
+                                   on_chunk=lambda chunk: seen.append(list(chunk.document_ids)))
+
+        assert report.chunks == []
+        assert report.chunk_count == 4
+        assert report.rows_inserted == 15 and report.rows_failed == 5
+        assert [chunk.start for chunk in report.failed_chunks] == [0]
+        # IDs are still handed to on_chunk as each chunk settles
+        assert sorted(len(ids) for ids in seen) == [0, 5, 5, 5]
+
+    def test_sizer_grows_when_fast_and_shrinks_on_failure(self):
+        """Test adaptive sizing against latency, payload size and errors."""
+        sizer = ChunkSizer(initial=100, min_size=10, max_size=10_000, target_seconds=1.0,
+                           max_payload_bytes=1_000_000)
+
+        sizer.record(100, 0.1, 10_000, ok=True)
+        assert sizer.size == 200  # growth capped at 2x per step
+
+        sizer = ChunkSizer(initial=100, min_size=10, max_size=10_000, target_seconds=1.0,
+                           max_payload_bytes=20_000)
+        sizer.record(100, 0.01, 10_000, ok=True)
+        assert sizer.size == 200  # 100 bytes/row -> 200 rows fit the payload cap
+
+        sizer.record(200, 10.0, 20_000, ok=False)
+        assert sizer.size == 100
@@ -0,0 +1,65 @@
+import os
+from unittest.mock import MagicMock, patch
+
+from src.client_pool import get_client, close_clients
+
+
+class TestClientPool:
+    """Test suite for the pooled Worqhat client registry."""
+
+    @patch.dict(os.environ, {
+        "WORQHAT_API_KEY": "test-api-key",
+        "WORQHAT_ENVIRONMENT": "test"
+    })
+    @patch('src.client_pool.Worqhat')
+    def test_get_client_reuses_instance(self, mock_worqhat_class):
+        """Test that repeated lookups return the same client."""
+        first = get_client()
+        second = get_client()
+
+        assert first is second
+        mock_worqhat_class.assert_called_once_with(
+            api_key="test-api-key",
+            base_url=None
+        )
+
+    @patch('src.client_pool.Worqhat')
+    def test_get_client_keyed_by_key_and_environment(self, mock_worqhat_class):
+        """Test that distinct credentials get distinct clients."""
+        mock_worqhat_class.side_effect = lambda **kwargs: MagicMock()
+
+        a = get_client(api_key="key-a", environment="production")
+        b = get_client(api_key="key-b", environment="production")
+        c = get_client(api_key="key-a", environment="staging")
+
+        assert len({id(a), id(b), id(c)}) == 3
+        assert get_client(api_key="key-a", environment="production") is a
+
+    @patch('src.client_pool.Worqhat')
+    def test_close_clients_closes_and_clears(self, mock_worqhat_class):
+        """Test that close_clients closes pooled clients and empties the registry."""
+        mock_client = MagicMock()
+        mock_worqhat_class.return_value = mock_client
+
+        get_client(api_key="key", environment="production")
+        close_clients()
+
+        mock_client.close.assert_called_once()
+        get_client(api_key="key", environment="production")
+        assert mock_worqhat_class.call_count == 2
+
+    def test_builds_real_sdk_client(self):
+        """Test that the pooled client is a real Worqhat SDK instance."""
+        from worqhat import Worqhat
+
+        client = get_client(api_key="test-api-key", environment="production")
+
+        assert isinstance(client, Worqhat)
+        assert client.api_key == "test-api-key"
+
+    @patch.dict(os.environ, {"WORQHAT_STAGING_BASE_URL": "https://staging.example.com"})
+    def test_environment_maps_to_base_url(self):
+        """Test that an environment with a configured base URL points the SDK there."""
+        client = get_client(api_key="test-api-key", environment="staging")
+
+        assert str(client.base_url).rstrip("/") == "https://staging.example.com"
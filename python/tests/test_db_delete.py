@@ -1,7 +1,8 @@
+from datetime import datetime, timedelta
 import pytest
 from unittest.mock import MagicMock, patch, mock_open
 import os
-from endpoints.db_delete import delete_inactive_users, delete_old_completed_tasks, db_delete
+from src.endpoints.db_delete import delete_inactive_users, delete_old_completed_tasks, db_delete
 
 
 class TestDbDelete:
@@ -11,7 +12,7 @@ class TestDbDelete:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.db_delete.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_delete_inactive_users_success(self, mock_worqhat_class):
         """Test successful deletion of inactive users."""
         mock_client = MagicMock()
@@ -30,7 +31,7 @@ class TestDbDelete:
         # Verify the call was made with correct parameters
         mock_worqhat_class.assert_called_once_with(
             api_key="test-api-key",
-            environment="test"
+            base_url=None
         )
 
         mock_client.db.delete_records.assert_called_once_with(
@@ -44,7 +45,7 @@ class TestDbDelete:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.db_delete.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_delete_old_completed_tasks_success(self, mock_worqhat_class):
         """Test successful deletion of old completed tasks."""
         mock_client = MagicMock()
@@ -56,23 +57,27 @@ class TestDbDelete:
             "message": "3 record(s) deleted successfully from tasks",
         }
 
-        mock_client.db.delete_records.return_value = mock_response
+        mock_client.db.execute_query.return_value = {"data": [{"documentId": "task_1"}]}
 
-        delete_old_completed_tasks()
+        result = delete_old_completed_tasks()
 
-        # Verify the call was made with correct parameters
-        mock_client.db.delete_records.assert_called_once_with(
-            table="tasks",
-            where={
-                "status": "completed",
-                "priority": "low",
-            }
+        # The 30-day cutoff can't be expressed with delete_records, so the delete goes out as SQL
+        mock_client.db.delete_records.assert_not_called()
+        call = mock_client.db.execute_query.call_args[1]
+        assert call["query"] == (
+            'DELETE FROM "tasks" WHERE "status" = {where_0} AND "priority" = {where_1} '
+            'AND ("completedAt" < {cutoff}) RETURNING *'
         )
+        assert call["params"]["where_0"] == "completed"
+        assert call["params"]["where_1"] == "low"
+        cutoff = datetime.fromisoformat(call["params"]["cutoff"])
+        assert abs(cutoff - (datetime.now() - timedelta(days=30))) < timedelta(minutes=1)
+        assert result == {"success": True, "deleted_count": 1, "data": [{"documentId": "task_1"}]}
 
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_delete.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_delete_inactive_users_api_error_handling(self, mock_worqhat_class):
         """Test API error handling in delete_inactive_users."""
         mock_client = MagicMock()
@@ -86,7 +91,7 @@ class TestDbDelete:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_delete.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_delete_old_completed_tasks_no_records_error(self, mock_worqhat_class):
         """Test handling of no records matched error."""
         mock_client = MagicMock()
@@ -100,7 +105,7 @@ class TestDbDelete:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_delete.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_delete_inactive_users_network_error(self, mock_worqhat_class):
         """Test network error handling."""
         mock_client = MagicMock()
@@ -114,7 +119,7 @@ class TestDbDelete:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_delete.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_delete_old_completed_tasks_auth_error(self, mock_worqhat_class):
         """Test authentication error handling."""
         mock_client = MagicMock()
@@ -128,7 +133,7 @@ class TestDbDelete:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_delete.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_delete_inactive_users_validation_error(self, mock_worqhat_class):
         """Test validation error handling."""
         mock_client = MagicMock()
@@ -142,7 +147,7 @@ class TestDbDelete:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_delete.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_delete_inactive_users_zero_records(self, mock_worqhat_class):
         """Test handling of zero records deleted."""
         mock_client = MagicMock()
@@ -165,7 +170,7 @@ class TestDbDelete:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_delete.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_response_structure_validation_single_condition(self, mock_worqhat_class):
         """Test response structure validation for single where condition."""
         mock_client = MagicMock()
@@ -191,7 +196,7 @@ class TestDbDelete:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_delete.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_response_structure_validation_multiple_conditions(self, mock_worqhat_class):
         """Test response structure validation for multiple where conditions."""
         mock_client = MagicMock()
@@ -217,7 +222,7 @@ class TestDbDelete:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_delete.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_where_conditions_single_key(self, mock_worqhat_class):
         """Test that single where condition is handled correctly."""
         mock_client = MagicMock()
@@ -244,7 +249,7 @@ class TestDbDelete:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_delete.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_where_conditions_multiple_keys(self, mock_worqhat_class):
         """Test that multiple where conditions are handled correctly."""
         mock_client = MagicMock()
@@ -256,24 +261,21 @@ class TestDbDelete:
             "message": "3 record(s) deleted successfully from tasks",
         }
 
-        mock_client.db.delete_records.return_value = mock_response
+        mock_client.db.execute_query.return_value = {"data": []}
 
         delete_old_completed_tasks()
 
         # Verify the where conditions
-        call_args = mock_client.db.delete_records.call_args
-        where_conditions = call_args[1]["where"]
+        params = mock_client.db.execute_query.call_args[1]["params"]
 
-        assert len(where_conditions) == 2
-        assert "status" in where_conditions
-        assert "priority" in where_conditions
-        assert where_conditions["status"] == "completed"
-        assert where_conditions["priority"] == "low"
+        assert set(params) == {"where_0", "where_1", "cutoff"}
+        assert params["where_0"] == "completed"
+        assert params["where_1"] == "low"
 
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_delete.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_table_targeting(self, mock_worqhat_class):
         """Test that correct tables are targeted."""
         mock_client = MagicMock()
@@ -291,25 +293,23 @@ class TestDbDelete:
             "message": "3 record(s) deleted successfully from tasks",
         }
 
-        mock_client.db.delete_records.side_effect = [mock_response_users, mock_response_tasks]
+        mock_client.db.delete_records.return_value = mock_response_users
+        mock_client.db.execute_query.return_value = {"data": [{"documentId": "t"}] * mock_response_tasks["deleted_count"]}
 
         delete_inactive_users()
-        delete_old_completed_tasks()
-
-        # Verify table targeting
-        calls = mock_client.db.delete_records.call_args_list
-        assert len(calls) == 2
+        tasks = delete_old_completed_tasks()
 
         # First call should target users table
-        assert calls[0][1]["table"] == "users"
+        assert mock_client.db.delete_records.call_args[1]["table"] == "users"
 
         # Second call should target tasks table
-        assert calls[1][1]["table"] == "tasks"
+        assert mock_client.db.execute_query.call_args[1]["query"].startswith('DELETE FROM "tasks"')
+        assert tasks["deleted_count"] == 3
 
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_delete.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_db_delete_runs_all_examples(self, mock_worqhat_class):
         """Test that db_delete runs all examples."""
         mock_client = MagicMock()
@@ -322,8 +322,10 @@ class TestDbDelete:
         }
 
         mock_client.db.delete_records.return_value = mock_response
+        mock_client.db.execute_query.return_value = {"data": []}
 
         db_delete()
 
-        # Should be called twice - once for each function
-        assert mock_client.db.delete_records.call_count == 2
+        # One call per example
+        assert mock_client.db.delete_records.call_count == 1
+        assert mock_client.db.execute_query.call_count == 1
@@ -1,12 +1,12 @@
 import pytest
 from unittest.mock import MagicMock, patch
-from endpoints.db_insert import create_user, create_product_with_custom_id, create_multiple_products, db_insert
+from src.endpoints.db_insert import create_user, create_product_with_custom_id, create_multiple_products, db_insert
 
 
 class TestDbInsert:
     """Test suite for db_insert functionality."""
 
-    @patch('endpoints.db_insert.client')
+    @patch('src.endpoints.db_insert.client')
     def test_create_user_success(self, mock_client):
         """Test successful user creation."""
         mock_response = {
@@ -38,7 +38,7 @@ class TestDbInsert:
 
         assert result == mock_response
 
-    @patch('endpoints.db_insert.client')
+    @patch('src.endpoints.db_insert.client')
     def test_create_product_with_custom_id_success(self, mock_client):
         """Test successful product creation with custom documentId."""
         mock_product_response = {
@@ -69,7 +69,7 @@ class TestDbInsert:
 
         assert result == mock_product_response
 
-    @patch('endpoints.db_insert.client')
+    @patch('src.endpoints.db_insert.client')
     def test_create_multiple_products_success(self, mock_client):
         """Test successful bulk insertion of multiple products."""
         mock_bulk_response = {
@@ -131,7 +131,7 @@ class TestDbInsert:
         assert result == mock_bulk_response
         assert len(result["data"]) == 3
 
-    @patch('endpoints.db_insert.client')
+    @patch('src.endpoints.db_insert.client')
     def test_create_user_api_error_handling(self, mock_client):
         """Test handling of API errors in create_user."""
         mock_client.db.insert_record.side_effect = Exception("API Error: Invalid API key")
@@ -139,7 +139,7 @@ class TestDbInsert:
         with pytest.raises(Exception, match="API Error: Invalid API key"):
             create_user()
 
-    @patch('endpoints.db_insert.client')
+    @patch('src.endpoints.db_insert.client')
     def test_create_product_network_error_handling(self, mock_client):
         """Test handling of network errors in create_product_with_custom_id."""
         mock_client.db.insert_record.side_effect = Exception("Network Error: Connection timeout")
@@ -147,7 +147,7 @@ class TestDbInsert:
         with pytest.raises(Exception, match="Network Error: Connection timeout"):
             create_product_with_custom_id()
 
-    @patch('endpoints.db_insert.client')
+    @patch('src.endpoints.db_insert.client')
     def test_create_multiple_products_table_not_found_error(self, mock_client):
         """Test handling of table not found errors in create_multiple_products."""
         mock_client.db.insert_record.side_effect = Exception("Table not found")
@@ -155,7 +155,7 @@ class TestDbInsert:
         with pytest.raises(Exception, match="Table not found"):
             create_multiple_products()
 
-    @patch('endpoints.db_insert.client')
+    @patch('src.endpoints.db_insert.client')
     def test_create_user_duplicate_document_id_error(self, mock_client):
         """Test handling of duplicate documentId errors in create_user."""
         mock_client.db.insert_record.side_effect = Exception("Duplicate documentId")
@@ -163,7 +163,7 @@ class TestDbInsert:
         with pytest.raises(Exception, match="Duplicate documentId"):
             create_user()
 
-    @patch('endpoints.db_insert.client')
+    @patch('src.endpoints.db_insert.client')
     def test_custom_id_generation_uniqueness(self, mock_client):
         """Test that custom IDs are generated uniquely."""
         mock_response = {
@@ -202,7 +202,7 @@ class TestDbInsert:
         # All IDs should start with "prod_"
         assert all(doc_id.startswith("prod_") for doc_id in document_ids)
 
-    @patch('endpoints.db_insert.client')
+    @patch('src.endpoints.db_insert.client')
     def test_data_structure_validation(self, mock_client):
         """Test that returned data has correct structure."""
         mock_single_response = {
@@ -276,7 +276,7 @@ class TestDbInsert:
             assert "inStock" in item
             assert "category" in item
 
-    @patch('endpoints.db_insert.client')
+    @patch('src.endpoints.db_insert.client')
     def test_bulk_insert_partial_failure_simulation(self, mock_client):
         """Test simulation of partial bulk insert failures."""
         # This would test if partial failures in bulk operations are handled
@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import MagicMock, patch, mock_open
 import os
-from endpoints.db_nl_query import count_active_users, analyze_sales_data, db_nl_query
+from src.endpoints.db_nl_query import count_active_users, analyze_sales_data, db_nl_query
 
 
 class TestDbNlQuery:
@@ -11,7 +11,7 @@ class TestDbNlQuery:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.db_nl_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_count_active_users_success(self, mock_worqhat_class):
         """Test successful natural language query for counting active users."""
         mock_client = MagicMock()
@@ -36,7 +36,7 @@ class TestDbNlQuery:
         # Verify the call was made with correct parameters
         mock_worqhat_class.assert_called_once_with(
             api_key="test-api-key",
-            environment="test"
+            base_url=None
         )
 
         mock_client.db.process_nl_query.assert_called_once_with(
@@ -48,7 +48,7 @@ class TestDbNlQuery:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.db_nl_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_analyze_sales_data_success(self, mock_worqhat_class):
         """Test successful natural language query for sales data analysis."""
         mock_client = MagicMock()
@@ -91,7 +91,7 @@ class TestDbNlQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_nl_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_count_active_users_api_error_handling(self, mock_worqhat_class):
         """Test API error handling in count_active_users."""
         mock_client = MagicMock()
@@ -105,7 +105,7 @@ class TestDbNlQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_nl_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_analyze_sales_data_table_not_found_error(self, mock_worqhat_class):
         """Test table not found error handling."""
         mock_client = MagicMock()
@@ -119,7 +119,7 @@ class TestDbNlQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_nl_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_count_active_users_network_error(self, mock_worqhat_class):
         """Test network error handling."""
         mock_client = MagicMock()
@@ -133,7 +133,7 @@ class TestDbNlQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_nl_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_analyze_sales_data_auth_error(self, mock_worqhat_class):
         """Test authentication error handling."""
         mock_client = MagicMock()
@@ -147,7 +147,7 @@ class TestDbNlQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_nl_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_count_active_users_query_timeout(self, mock_worqhat_class):
         """Test query timeout error handling."""
         mock_client = MagicMock()
@@ -161,7 +161,7 @@ class TestDbNlQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_nl_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_count_active_users_empty_results(self, mock_worqhat_class):
         """Test handling of empty query results."""
         mock_client = MagicMock()
@@ -186,7 +186,7 @@ class TestDbNlQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_nl_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_response_structure_validation_simple_query(self, mock_worqhat_class):
         """Test response structure validation for simple NL queries."""
         mock_client = MagicMock()
@@ -227,7 +227,7 @@ class TestDbNlQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_nl_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_response_structure_validation_complex_query(self, mock_worqhat_class):
         """Test response structure validation for complex analysis queries."""
         mock_client = MagicMock()
@@ -267,7 +267,7 @@ class TestDbNlQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_nl_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_question_and_table_parameters(self, mock_worqhat_class):
         """Test that correct question and table parameters are passed."""
         mock_client = MagicMock()
@@ -301,7 +301,7 @@ class TestDbNlQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_nl_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_sql_generation_transparency(self, mock_worqhat_class):
         """Test that generated SQL is included in response."""
         mock_client = MagicMock()
@@ -329,7 +329,7 @@ class TestDbNlQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_nl_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_execution_time_tracking(self, mock_worqhat_class):
         """Test that execution time is properly tracked."""
         mock_client = MagicMock()
@@ -355,7 +355,7 @@ class TestDbNlQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_nl_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_complex_query_sql_generation(self, mock_worqhat_class):
         """Test SQL generation for complex analysis queries."""
         mock_client = MagicMock()
@@ -386,7 +386,7 @@ class TestDbNlQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_nl_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_db_nl_query_runs_all_examples(self, mock_worqhat_class):
         """Test that db_nl_query runs all examples."""
         mock_client = MagicMock()
@@ -1,7 +1,7 @@
 import pytest
-from unittest.mock import MagicMock, patch, mock_open
+from unittest.mock import AsyncMock, MagicMock, patch, mock_open
 import os
-from endpoints.db_query import fetch_active_users, generate_sales_report, search_users, db_query
+from src.endpoints.db_query import fetch_active_users, generate_sales_report, search_users, db_query, db_query_async
 
 
 class TestDbQuery:
@@ -11,7 +11,7 @@ class TestDbQuery:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.db_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_fetch_active_users_success(self, mock_worqhat_class):
         """Test successful execution of query with named parameters."""
         mock_client = MagicMock()
@@ -44,7 +44,7 @@ class TestDbQuery:
         # Verify the call was made with correct parameters
         mock_worqhat_class.assert_called_once_with(
             api_key="test-api-key",
-            environment="test"
+            base_url=None
         )
 
         mock_client.db.execute_query.assert_called_once_with(
@@ -59,7 +59,7 @@ class TestDbQuery:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.db_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_generate_sales_report_success(self, mock_worqhat_class):
         """Test successful execution of complex query with positional parameters."""
         mock_client = MagicMock()
@@ -102,7 +102,7 @@ class TestDbQuery:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.db_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_search_users_success(self, mock_worqhat_class):
         """Test successful execution of search query with multiple named parameters."""
         mock_client = MagicMock()
@@ -141,7 +141,7 @@ class TestDbQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_fetch_active_users_api_error_handling(self, mock_worqhat_class):
         """Test API error handling in fetch_active_users."""
         mock_client = MagicMock()
@@ -155,7 +155,7 @@ class TestDbQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_generate_sales_report_syntax_error(self, mock_worqhat_class):
         """Test handling of SQL syntax errors."""
         mock_client = MagicMock()
@@ -169,7 +169,7 @@ class TestDbQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_search_users_query_timeout(self, mock_worqhat_class):
         """Test handling of query timeout errors."""
         mock_client = MagicMock()
@@ -183,7 +183,7 @@ class TestDbQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_fetch_active_users_network_error(self, mock_worqhat_class):
         """Test network error handling."""
         mock_client = MagicMock()
@@ -197,7 +197,7 @@ class TestDbQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_generate_sales_report_auth_error(self, mock_worqhat_class):
         """Test authentication error handling."""
         mock_client = MagicMock()
@@ -211,7 +211,7 @@ class TestDbQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_search_users_unauthorized_operation(self, mock_worqhat_class):
         """Test handling of unauthorized operation errors."""
         mock_client = MagicMock()
@@ -225,7 +225,7 @@ class TestDbQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_fetch_active_users_empty_results(self, mock_worqhat_class):
         """Test handling of empty query results."""
         mock_client = MagicMock()
@@ -249,7 +249,7 @@ class TestDbQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_response_structure_validation_simple_query(self, mock_worqhat_class):
         """Test response structure validation for simple queries."""
         mock_client = MagicMock()
@@ -292,7 +292,7 @@ class TestDbQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_response_structure_validation_complex_query(self, mock_worqhat_class):
         """Test response structure validation for complex aggregation queries."""
         mock_client = MagicMock()
@@ -333,7 +333,7 @@ class TestDbQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_parameter_handling_named_parameters(self, mock_worqhat_class):
         """Test named parameter handling."""
         mock_client = MagicMock()
@@ -362,7 +362,7 @@ class TestDbQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_parameter_handling_positional_parameters(self, mock_worqhat_class):
         """Test positional parameter handling."""
         mock_client = MagicMock()
@@ -389,7 +389,7 @@ class TestDbQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_parameter_handling_multiple_named_parameters(self, mock_worqhat_class):
         """Test multiple named parameter handling."""
         mock_client = MagicMock()
@@ -419,7 +419,7 @@ class TestDbQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_query_structure_validation(self, mock_worqhat_class):
         """Test that queries have proper SQL structure."""
         mock_client = MagicMock()
@@ -460,7 +460,7 @@ class TestDbQuery:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_query.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_db_query_runs_all_examples(self, mock_worqhat_class):
         """Test that db_query runs all examples."""
         mock_client = MagicMock()
@@ -479,3 +479,25 @@ class TestDbQuery:
 
         # Should be called three times - once for each function
         assert mock_client.db.execute_query.call_count == 3
+
+    @pytest.mark.asyncio
+    @patch.dict(os.environ, {
+        "WORQHAT_API_KEY": "test-api-key",
+        "WORQHAT_ENVIRONMENT": "test"
+    })
+    @patch('src.async_client.AsyncWorqhat')
+    async def test_db_query_async_runs_all_examples(self, mock_async_worqhat_class):
+        """Test that db_query_async awaits every example plus the route query."""
+        mock_client = MagicMock()
+        mock_client.db.execute_query = AsyncMock(return_value={"data": []})
+        mock_async_worqhat_class.return_value = mock_client
+
+        results = await db_query_async("SELECT 1")
+
+        assert list(results) == ["query", "fetch_active_users", "generate_sales_report", "search_users"]
+        assert mock_client.db.execute_query.await_count == 4
+        mock_client.db.execute_query.assert_any_await(query="SELECT 1")
+        mock_client.db.execute_query.assert_any_await(
+            query="SELECT * FROM users WHERE status = {status} LIMIT {limit}",
+            params={"status": "active", "limit": 10}
+        )
@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import MagicMock, patch, mock_open
 import os
-from endpoints.db_update import update_user_status, update_inactive_users, db_update
+from src.endpoints.db_update import update_user_status, update_inactive_users, db_update
 
 
 class TestDbUpdate:
@@ -11,7 +11,7 @@ class TestDbUpdate:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.db_update.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_update_user_status_success(self, mock_worqhat_class):
         """Test successful user status update with multiple where conditions."""
         mock_client = MagicMock()
@@ -40,7 +40,7 @@ class TestDbUpdate:
         # Verify the call was made with correct parameters
         mock_worqhat_class.assert_called_once_with(
             api_key="test-api-key",
-            environment="test"
+            base_url=None
         )
 
         mock_client.db.update_records.assert_called_once_with(
@@ -59,7 +59,7 @@ class TestDbUpdate:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.db_update.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_update_inactive_users_success(self, mock_worqhat_class):
         """Test successful update of all inactive users."""
         mock_client = MagicMock()
@@ -103,7 +103,7 @@ class TestDbUpdate:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_update.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_update_user_status_api_error_handling(self, mock_worqhat_class):
         """Test API error handling in update_user_status."""
         mock_client = MagicMock()
@@ -117,7 +117,7 @@ class TestDbUpdate:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_update.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_update_inactive_users_no_records_error(self, mock_worqhat_class):
         """Test handling of no records matched error."""
         mock_client = MagicMock()
@@ -131,7 +131,7 @@ class TestDbUpdate:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_update.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_update_user_status_network_error(self, mock_worqhat_class):
         """Test network error handling."""
         mock_client = MagicMock()
@@ -145,7 +145,7 @@ class TestDbUpdate:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_update.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_update_inactive_users_auth_error(self, mock_worqhat_class):
         """Test authentication error handling."""
         mock_client = MagicMock()
@@ -159,7 +159,7 @@ class TestDbUpdate:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_update.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_update_user_status_validation_error(self, mock_worqhat_class):
         """Test validation error handling."""
         mock_client = MagicMock()
@@ -173,7 +173,7 @@ class TestDbUpdate:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_update.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_update_user_status_zero_records(self, mock_worqhat_class):
         """Test handling of zero records updated."""
         mock_client = MagicMock()
@@ -198,7 +198,7 @@ class TestDbUpdate:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_update.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_data_structure_validation_multiple_conditions(self, mock_worqhat_class):
         """Test data structure validation for multiple where conditions."""
         mock_client = MagicMock()
@@ -243,7 +243,7 @@ class TestDbUpdate:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_update.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_data_structure_validation_single_condition(self, mock_worqhat_class):
         """Test data structure validation for single where condition."""
         mock_client = MagicMock()
@@ -289,7 +289,7 @@ class TestDbUpdate:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_update.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_where_conditions_multiple_keys(self, mock_worqhat_class):
         """Test that multiple where conditions are handled correctly."""
         mock_client = MagicMock()
@@ -320,7 +320,7 @@ class TestDbUpdate:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_update.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_where_conditions_single_key(self, mock_worqhat_class):
         """Test that single where condition is handled correctly."""
         mock_client = MagicMock()
@@ -349,7 +349,7 @@ class TestDbUpdate:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.db_update.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_db_update_runs_all_examples(self, mock_worqhat_class):
         """Test that db_update runs all examples."""
         mock_client = MagicMock()
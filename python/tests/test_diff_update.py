@@ -0,0 +1,120 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.diff_update import SnapshotStore, changed_columns, diff_update, diff_update_async, get_snapshot_store
+from src.returning import update_records
+
+WHERE = {"id": "123"}
+
+
+class TestDiffUpdate:
+    """Test suite for snapshot-based diff updates."""
+
+    def test_changed_columns(self):
+        """Test that only differing or unknown columns are reported."""
+        snapshot = {"status": "active", "name": "Old"}
+
+        assert changed_columns(snapshot, {"status": "active", "name": "New", "role": "user"}) == {
+            "name": "New", "role": "user",
+        }
+        assert changed_columns(None, {"status": "active"}) == {"status": "active"}
+
+    def test_repeated_state_is_skipped(self):
+        """Test that re-asserting the same state sends nothing the second time."""
+        client = MagicMock()
+        store = SnapshotStore()
+
+        first = diff_update("users", WHERE, {"status": "active", "name": "A"}, store=store, client=client)
+        second = diff_update("users", WHERE, {"status": "active", "name": "A"}, store=store, client=client)
+        third = diff_update("users", WHERE, {"status": "active", "name": "B"}, store=store, client=client)
+
+        assert first.changes == {"status": "active", "name": "A"}
+        assert second.skipped and client.db.update_records.call_count == 2
+        assert third.changes == {"name": "B"}
+        client.db.update_records.assert_called_with(table="users", where=WHERE, data={"name": "B"})
+
+    def test_load_missing_reads_current_row(self):
+        """Test that a missing snapshot is loaded so unchanged state costs one read, no write."""
+        client = MagicMock()
+        client.db.execute_query.return_value = {"data": [{"status": "active", "name": "A"}]}
+        store = SnapshotStore()
+
+        result = diff_update("users", WHERE, {"status": "active", "name": "A"}, load_missing=True,
+                             store=store, client=client)
+
+        assert result.skipped
+        client.db.update_records.assert_not_called()
+        assert client.db.execute_query.call_args[1]["query"] == 'SELECT "status", "name" FROM "users" WHERE "id" = {where_0}'
+
+    def test_rows_that_disagree_are_sent(self):
+        """Test that a column differing across matched rows is always sent."""
+        client = MagicMock()
+        client.db.execute_query.return_value = {"data": [{"status": "active"}, {"status": "inactive"}]}
+
+        result = diff_update("users", {"role": "user"}, {"status": "active"}, load_missing=True,
+                             store=SnapshotStore(), client=client)
+
+        assert result.changes == {"status": "active"}
+
+    def test_failed_update_drops_snapshot(self):
+        """Test that an error leaves no snapshot to wrongly skip the retry."""
+        client = MagicMock()
+        store = SnapshotStore()
+        diff_update("users", WHERE, {"status": "active"}, store=store, client=client)
+        client.db.update_records.side_effect = Exception("Request timed out")
+
+        with pytest.raises(Exception):
+            diff_update("users", WHERE, {"status": "inactive"}, store=store, client=client)
+
+        assert store.get("users", WHERE) is None
+
+    def test_snapshots_expire(self):
+        """Test the TTL bounds how long a snapshot is trusted."""
+        now = [0.0]
+        store = SnapshotStore(ttl=10, clock=lambda: now[0])
+        store.merge("users", WHERE, {"status": "active"})
+
+        assert store.get("users", WHERE) == {"status": "active"}
+        now[0] = 11
+        assert store.get("users", WHERE) is None
+
+    @pytest.mark.asyncio
+    async def test_async_diff_update(self):
+        """Test the async variant sends only changed columns through AsyncClient."""
+        client = MagicMock()
+        client.update_records = AsyncMock(return_value={"count": 1})
+        store = SnapshotStore()
+        store.merge("users", WHERE, {"status": "active"})
+
+        result = await diff_update_async("users", WHERE, {"status": "active", "name": "A"}, store=store, client=client)
+
+        client.update_records.assert_awaited_once_with("users", WHERE, {"name": "A"})
+        assert result.response == {"count": 1}
+
+    def test_update_drops_other_filters_of_the_table(self):
+        """Test that a diff write forgets snapshots taken under other filters of the same table."""
+        client = MagicMock()
+        store = SnapshotStore()
+        store.merge("users", {"role": "trial"}, {"status": "active"})
+        store.merge("teams", WHERE, {"status": "active"})
+
+        diff_update("users", WHERE, {"status": "inactive"}, store=store, client=client)
+
+        assert store.get("users", WHERE) == {"status": "inactive"}
+        assert store.get("teams", WHERE) == {"status": "active"}
+        result = diff_update("users", {"role": "trial"}, {"status": "active"}, store=store, client=client)
+        assert not result.skipped
+
+    def test_plain_update_drops_table_snapshots(self):
+        """Test that a write through update_records makes the next diff resend the column."""
+        client = MagicMock()
+        diff_update("users", WHERE, {"status": "active"}, client=client)
+
+        # Another write path changes the same row behind the snapshot's back
+        update_records("users", {"role": "trial"}, {"status": "inactive"}, client=client)
+        result = diff_update("users", WHERE, {"status": "active"}, client=client)
+
+        assert not result.skipped
+        assert result.changes == {"status": "active"}
+        assert get_snapshot_store().get("users", WHERE) == {"status": "active"}
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.fanout import NO_RESULT_ERROR, gather_concurrently, run_concurrently
+
+
+class TestFanout:
+    """Test suite for bounded concurrent fan-out."""
+
+    def test_run_concurrently_preserves_order_and_captures_errors(self):
+        """Test that results keep call order and a failing call doesn't hide the others."""
+        def fail():
+            raise Exception("Upstream timeout")
+
+        results = run_concurrently({
+            "slow": lambda: (time.sleep(0.05), "slow")[1],
+            "fail": fail,
+            "fast": lambda: "fast",
+        })
+
+        assert list(results) == ["slow", "fail", "fast"]
+        assert results["slow"] == "slow"
+        assert results["fail"] == {"error": "Upstream timeout"}
+        assert results["fast"] == "fast"
+
+    def test_run_concurrently_respects_limit(self):
+        """Test that no more than `limit` calls run at the same time."""
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def call():
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+
+        run_concurrently({f"call_{i}": call for i in range(8)}, limit=2)
+
+        assert state["peak"] == 2
+
+    def test_run_concurrently_reports_none_as_error(self):
+        """Test that helpers which swallow their own errors still show up as failed."""
+        results = run_concurrently({"ok": lambda: "done", "swallowed": lambda: None}, none_is_error=True)
+
+        assert results["ok"] == "done"
+        assert results["swallowed"] == {"error": NO_RESULT_ERROR}
+        assert run_concurrently({"swallowed": lambda: None}) == {"swallowed": None}
+
+    @pytest.mark.asyncio
+    async def test_gather_concurrently_overlaps_and_bounds_calls(self):
+        """Test that coroutines overlap up to the limit and results stay ordered."""
+        state = {"active": 0, "peak": 0}
+
+        async def call(value):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.01)
+            state["active"] -= 1
+            if value == 2:
+                raise ValueError("bad value")
+            return value
+
+        results = await gather_concurrently(
+            {f"call_{i}": (lambda i=i: call(i)) for i in range(6)},
+            limit=3,
+        )
+
+        assert state["peak"] == 3
+        assert list(results) == [f"call_{i}" for i in range(6)]
+        assert results["call_2"] == {"error": "bad value"}
+        assert results["call_5"] == 5
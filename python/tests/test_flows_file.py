@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import MagicMock, patch, mock_open
 import os
-from endpoints.flows_file import process_document, process_remote_image, process_document_with_params, trigger_flow_with_file, trigger_flow_with_url
+from src.endpoints.flows_file import process_document, process_remote_image, process_document_with_params, trigger_flow_with_file, trigger_flow_with_url
 
 
 class TestFlowsFile:
@@ -11,7 +11,7 @@ class TestFlowsFile:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     @patch('builtins.open', new_callable=mock_open, read_data=b"fake file content")
     def test_process_document_success(self, mock_file_open, mock_worqhat_class):
         """Test successful document processing with file upload."""
@@ -37,7 +37,7 @@ class TestFlowsFile:
         # Verify the call was made with correct parameters
         mock_worqhat_class.assert_called_once_with(
             api_key="test-api-key",
-            environment="test"
+            base_url=None
         )
 
         mock_client.flows.trigger_with_file.assert_called_once()
@@ -54,7 +54,7 @@ class TestFlowsFile:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_process_remote_image_success(self, mock_worqhat_class):
         """Test successful remote image processing with URL."""
         mock_client = MagicMock()
@@ -93,7 +93,7 @@ class TestFlowsFile:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     @patch('builtins.open', new_callable=mock_open, read_data=b"fake file content")
     def test_process_document_with_params_success(self, mock_file_open, mock_worqhat_class):
         """Test successful document processing with complex parameters."""
@@ -137,7 +137,7 @@ class TestFlowsFile:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     @patch('builtins.open', new_callable=mock_open, read_data=b"fake file content")
     def test_process_document_file_not_found_error(self, mock_file_open, mock_worqhat_class):
         """Test file not found error handling."""
@@ -153,7 +153,7 @@ class TestFlowsFile:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_process_remote_image_api_error_handling(self, mock_worqhat_class):
         """Test API error handling in process_remote_image."""
         mock_client = MagicMock()
@@ -167,7 +167,7 @@ class TestFlowsFile:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     @patch('builtins.open', new_callable=mock_open, read_data=b"fake file content")
     def test_process_document_with_params_workflow_not_found_error(self, mock_file_open, mock_worqhat_class):
         """Test workflow not found error handling."""
@@ -182,7 +182,7 @@ class TestFlowsFile:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     @patch('builtins.open', new_callable=mock_open, read_data=b"fake file content")
     def test_process_document_file_too_large_error(self, mock_file_open, mock_worqhat_class):
         """Test file too large error handling."""
@@ -197,7 +197,7 @@ class TestFlowsFile:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_process_remote_image_unsupported_file_type_error(self, mock_worqhat_class):
         """Test unsupported file type error handling."""
         mock_client = MagicMock()
@@ -211,7 +211,7 @@ class TestFlowsFile:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_process_remote_image_rate_limit_error(self, mock_worqhat_class):
         """Test rate limit error handling."""
         mock_client = MagicMock()
@@ -225,7 +225,7 @@ class TestFlowsFile:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     @patch('builtins.open', new_callable=mock_open, read_data=b"fake file content")
     def test_response_structure_validation_document_processing(self, mock_file_open, mock_worqhat_class):
         """Test response structure validation for document processing."""
@@ -261,7 +261,7 @@ class TestFlowsFile:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_response_structure_validation_image_processing(self, mock_worqhat_class):
         """Test response structure validation for image processing."""
         mock_client = MagicMock()
@@ -295,7 +295,7 @@ class TestFlowsFile:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     @patch('builtins.open', new_callable=mock_open, read_data=b"fake file content")
     def test_payload_structure_validation_document_processing(self, mock_file_open, mock_worqhat_class):
         """Test payload structure validation for document processing."""
@@ -326,7 +326,7 @@ class TestFlowsFile:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_payload_structure_validation_image_processing(self, mock_worqhat_class):
         """Test payload structure validation for image processing."""
         mock_client = MagicMock()
@@ -357,7 +357,7 @@ class TestFlowsFile:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     @patch('builtins.open', new_callable=mock_open, read_data=b"fake file content")
     def test_payload_structure_validation_complex_parameters(self, mock_file_open, mock_worqhat_class):
         """Test payload structure validation for complex parameters."""
@@ -389,7 +389,7 @@ class TestFlowsFile:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     @patch('builtins.open', new_callable=mock_open, read_data=b"fake file content")
     def test_analytics_id_format_validation(self, mock_file_open, mock_worqhat_class):
         """Test analytics ID format validation."""
@@ -415,7 +415,7 @@ class TestFlowsFile:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_url_format_validation(self, mock_worqhat_class):
         """Test URL format validation."""
         mock_client = MagicMock()
@@ -442,7 +442,7 @@ class TestFlowsFile:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     @patch('builtins.open', new_callable=mock_open, read_data=b"fake file content")
     def test_data_processing_validation_structured_response(self, mock_file_open, mock_worqhat_class):
         """Test data processing validation for structured responses."""
@@ -482,7 +482,7 @@ class TestFlowsFile:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_data_processing_validation_array_response(self, mock_worqhat_class):
         """Test data processing validation for array responses."""
         mock_client = MagicMock()
@@ -521,7 +521,7 @@ class TestFlowsFile:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_workflow_trigger_status_validation(self, mock_worqhat_class):
         """Test workflow trigger status validation."""
         mock_client = MagicMock()
@@ -547,7 +547,7 @@ class TestFlowsFile:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_file.Worqhat')
+    @patch('src.client_pool.Worqhat')
     @patch('builtins.open', new_callable=mock_open, read_data=b"fake file content")
     def test_trigger_flow_with_file_runs_all_examples(self, mock_file_open, mock_worqhat_class):
         """Test that trigger_flow_with_file runs all examples."""
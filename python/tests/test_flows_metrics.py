@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import MagicMock, patch, mock_open
 import os
-from endpoints.flows_metrics import get_workflow_metrics, get_all_workflow_metrics, get_flows_metrics
+from src.endpoints.flows_metrics import get_workflow_metrics, get_all_workflow_metrics, get_flows_metrics
 
 
 class TestFlowsMetrics:
@@ -11,7 +11,7 @@ class TestFlowsMetrics:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.flows_metrics.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_get_workflow_metrics_success(self, mock_worqhat_class):
         """Test successful workflow metrics retrieval with specific parameters."""
         mock_client = MagicMock()
@@ -58,7 +58,7 @@ class TestFlowsMetrics:
         # Verify the call was made with correct parameters
         mock_worqhat_class.assert_called_once_with(
             api_key="test-api-key",
-            environment="test"
+            base_url=None
         )
 
         mock_client.workflows.get_metrics.assert_called_once_with(
@@ -71,7 +71,7 @@ class TestFlowsMetrics:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.flows_metrics.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_get_all_workflow_metrics_success(self, mock_worqhat_class):
         """Test successful workflow metrics retrieval with default parameters."""
         mock_client = MagicMock()
@@ -112,7 +112,7 @@ class TestFlowsMetrics:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_metrics.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_get_workflow_metrics_api_error_handling(self, mock_worqhat_class):
         """Test API error handling in get_workflow_metrics."""
         mock_client = MagicMock()
@@ -126,7 +126,7 @@ class TestFlowsMetrics:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_metrics.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_get_all_workflow_metrics_unauthorized_error(self, mock_worqhat_class):
         """Test unauthorized error handling."""
         mock_client = MagicMock()
@@ -140,7 +140,7 @@ class TestFlowsMetrics:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_metrics.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_get_workflow_metrics_network_error(self, mock_worqhat_class):
         """Test network error handling."""
         mock_client = MagicMock()
@@ -154,7 +154,7 @@ class TestFlowsMetrics:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_metrics.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_get_all_workflow_metrics_invalid_status_error(self, mock_worqhat_class):
         """Test invalid status parameter error handling."""
         mock_client = MagicMock()
@@ -168,7 +168,7 @@ class TestFlowsMetrics:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_metrics.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_get_workflow_metrics_end_date_before_start_date_error(self, mock_worqhat_class):
         """Test end date before start date error handling."""
         mock_client = MagicMock()
@@ -182,7 +182,7 @@ class TestFlowsMetrics:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_metrics.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_get_workflow_metrics_empty_results(self, mock_worqhat_class):
         """Test handling of empty workflow metrics results."""
         mock_client = MagicMock()
@@ -214,7 +214,7 @@ class TestFlowsMetrics:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_metrics.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_response_structure_validation_simple_query(self, mock_worqhat_class):
         """Test response structure validation for workflow metrics queries."""
         mock_client = MagicMock()
@@ -271,7 +271,7 @@ class TestFlowsMetrics:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_metrics.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_response_structure_validation_individual_workflows(self, mock_worqhat_class):
         """Test response structure validation for individual workflow metrics."""
         mock_client = MagicMock()
@@ -322,7 +322,7 @@ class TestFlowsMetrics:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_metrics.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_parameter_validation_specific_dates(self, mock_worqhat_class):
         """Test parameter validation for specific date range queries."""
         mock_client = MagicMock()
@@ -347,7 +347,7 @@ class TestFlowsMetrics:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_metrics.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_parameter_validation_default_dates(self, mock_worqhat_class):
         """Test parameter validation for default date range queries."""
         mock_client = MagicMock()
@@ -370,7 +370,7 @@ class TestFlowsMetrics:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_metrics.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_metrics_calculations_success_rates(self, mock_worqhat_class):
         """Test metrics calculations for success rates and error rates."""
         mock_client = MagicMock()
@@ -402,7 +402,7 @@ class TestFlowsMetrics:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_metrics.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_metrics_calculations_perfect_workflow(self, mock_worqhat_class):
         """Test metrics for workflows with 100% success rate."""
         mock_client = MagicMock()
@@ -445,7 +445,7 @@ class TestFlowsMetrics:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_metrics.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_metrics_calculations_broken_workflow(self, mock_worqhat_class):
         """Test metrics for workflows with 0% success rate."""
         mock_client = MagicMock()
@@ -488,7 +488,7 @@ class TestFlowsMetrics:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_metrics.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_period_validation(self, mock_worqhat_class):
         """Test period structure and date format validation."""
         mock_client = MagicMock()
@@ -517,7 +517,7 @@ class TestFlowsMetrics:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_metrics.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_get_flows_metrics_runs_all_examples(self, mock_worqhat_class):
         """Test that get_flows_metrics runs all examples."""
         mock_client = MagicMock()
@@ -1,7 +1,12 @@
 import pytest
 from unittest.mock import MagicMock, patch, mock_open
 import os
-from endpoints.flows_trigger_json import onboard_new_customer, process_ecommerce_order, trigger_data_analysis, trigger_flow_json
+
+import httpx
+from worqhat import APIConnectionError
+
+from src.outbox import PENDING, TriggerOutbox
+from src.endpoints.flows_trigger_json import onboard_new_customer, process_ecommerce_order, trigger_data_analysis, trigger_flow_json
 
 
 class TestFlowsTriggerJson:
@@ -11,7 +16,7 @@ class TestFlowsTriggerJson:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.flows_trigger_json.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_onboard_new_customer_success(self, mock_worqhat_class):
         """Test successful customer onboarding workflow trigger."""
         mock_client = MagicMock()
@@ -34,7 +39,7 @@ class TestFlowsTriggerJson:
         # Verify the call was made with correct parameters
         mock_worqhat_class.assert_called_once_with(
             api_key="test-api-key",
-            environment="test"
+            base_url=None
         )
 
         mock_client.flows.trigger_with_payload.assert_called_once()
@@ -48,7 +53,7 @@ class TestFlowsTriggerJson:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.flows_trigger_json.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_process_ecommerce_order_success(self, mock_worqhat_class):
         """Test successful e-commerce order processing workflow trigger."""
         mock_client = MagicMock()
@@ -82,7 +87,7 @@ class TestFlowsTriggerJson:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.flows_trigger_json.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_trigger_data_analysis_success(self, mock_worqhat_class):
         """Test successful data analysis workflow trigger."""
         mock_client = MagicMock()
@@ -114,7 +119,7 @@ class TestFlowsTriggerJson:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_trigger_json.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_onboard_new_customer_api_error_handling(self, mock_worqhat_class):
         """Test API error handling in onboard_new_customer."""
         mock_client = MagicMock()
@@ -128,7 +133,7 @@ class TestFlowsTriggerJson:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_trigger_json.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_process_ecommerce_order_workflow_not_found_error(self, mock_worqhat_class):
         """Test workflow not found error handling."""
         mock_client = MagicMock()
@@ -142,7 +147,7 @@ class TestFlowsTriggerJson:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_trigger_json.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_trigger_data_analysis_invalid_payload_error(self, mock_worqhat_class):
         """Test invalid payload error handling."""
         mock_client = MagicMock()
@@ -156,7 +161,7 @@ class TestFlowsTriggerJson:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_trigger_json.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_onboard_new_customer_network_error(self, mock_worqhat_class):
         """Test network error handling."""
         mock_client = MagicMock()
@@ -170,7 +175,7 @@ class TestFlowsTriggerJson:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_trigger_json.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_process_ecommerce_order_rate_limit_error(self, mock_worqhat_class):
         """Test rate limit error handling."""
         mock_client = MagicMock()
@@ -184,7 +189,7 @@ class TestFlowsTriggerJson:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_trigger_json.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_response_structure_validation_simple_customer_onboarding(self, mock_worqhat_class):
         """Test response structure validation for customer onboarding."""
         mock_client = MagicMock()
@@ -216,7 +221,7 @@ class TestFlowsTriggerJson:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_trigger_json.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_response_structure_validation_ecommerce_order(self, mock_worqhat_class):
         """Test response structure validation for e-commerce order processing."""
         mock_client = MagicMock()
@@ -244,7 +249,7 @@ class TestFlowsTriggerJson:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_trigger_json.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_payload_structure_validation_customer_data(self, mock_worqhat_class):
         """Test payload structure validation for customer onboarding."""
         mock_client = MagicMock()
@@ -279,7 +284,7 @@ class TestFlowsTriggerJson:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_trigger_json.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_payload_structure_validation_ecommerce_order(self, mock_worqhat_class):
         """Test payload structure validation for e-commerce order."""
         mock_client = MagicMock()
@@ -314,7 +319,7 @@ class TestFlowsTriggerJson:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_trigger_json.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_payload_structure_validation_data_analysis(self, mock_worqhat_class):
         """Test payload structure validation for data analysis."""
         mock_client = MagicMock()
@@ -349,7 +354,7 @@ class TestFlowsTriggerJson:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_trigger_json.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_analytics_id_format_validation(self, mock_worqhat_class):
         """Test analytics ID format validation."""
         mock_client = MagicMock()
@@ -374,7 +379,7 @@ class TestFlowsTriggerJson:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_trigger_json.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_timestamp_format_validation(self, mock_worqhat_class):
         """Test timestamp format validation."""
         mock_client = MagicMock()
@@ -399,7 +404,7 @@ class TestFlowsTriggerJson:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_trigger_json.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_complex_payload_nested_structures(self, mock_worqhat_class):
         """Test complex payload with nested structures."""
         mock_client = MagicMock()
@@ -444,7 +449,7 @@ class TestFlowsTriggerJson:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_trigger_json.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_complex_payload_analysis_parameters(self, mock_worqhat_class):
         """Test complex payload with analysis parameters."""
         mock_client = MagicMock()
@@ -492,7 +497,7 @@ class TestFlowsTriggerJson:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_trigger_json.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_workflow_status_validation(self, mock_worqhat_class):
         """Test workflow status validation in response."""
         mock_client = MagicMock()
@@ -516,7 +521,7 @@ class TestFlowsTriggerJson:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.flows_trigger_json.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_trigger_flow_json_runs_all_examples(self, mock_worqhat_class):
         """Test that trigger_flow_json runs all examples."""
         mock_client = MagicMock()
@@ -536,3 +541,23 @@ class TestFlowsTriggerJson:
 
         # Should be called three times - once for each function
         assert mock_client.flows.trigger_with_payload.call_count == 3
+
+    @patch("src.endpoints.flows_trigger_json.trigger_once")
+    def test_process_ecommerce_order_queues_transient_failures(self, mock_trigger_once, tmp_path):
+        """Test that a transient failure goes to the outbox while a permanent one is only logged."""
+        outbox = TriggerOutbox(str(tmp_path / "outbox.db"))
+        request = httpx.Request("POST", "https://api.worqhat.com")
+
+        with patch("src.endpoints.flows_trigger_json.get_outbox", return_value=outbox):
+            mock_trigger_once.side_effect = Exception("Invalid payload format")
+            process_ecommerce_order()
+            assert outbox.stats()[PENDING] == 0
+
+            mock_trigger_once.side_effect = APIConnectionError(request=request)
+            assert process_ecommerce_order() is None
+
+        assert outbox.stats()[PENDING] == 1
+        entry = outbox.claim(1)[0]
+        assert entry.workflow_id == "order-processing-workflow-id"
+        assert entry.payload["orderId"] == "ORD-12345"
+        outbox.close()
@@ -0,0 +1,135 @@
+import asyncio
+import io
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.idempotency import IdempotencyStore, idempotency_key, trigger_once, trigger_once_async
+
+
+def sync_client():
+    client = MagicMock()
+    client.flows.trigger_with_payload.side_effect = lambda workflow_id, body: {"analytics_id": f"wf-{body['orderId']}"}
+    client.flows.trigger_with_file.return_value = {"analytics_id": "wf-file"}
+    return client
+
+
+class TestIdempotency:
+    """Test suite for idempotency-key deduplication of workflow triggers."""
+
+    def test_key_ignores_field_order(self):
+        """Test that equal payloads give the same key regardless of key order."""
+        first = idempotency_key("orders", {"orderId": "ORD-1", "items": [1, 2]})
+        second = idempotency_key("orders", {"items": [1, 2], "orderId": "ORD-1"})
+
+        assert first == second
+        assert first != idempotency_key("orders", {"orderId": "ORD-2", "items": [1, 2]})
+        assert first != idempotency_key("refunds", {"orderId": "ORD-1", "items": [1, 2]})
+
+    def test_key_hashes_file_content(self):
+        """Test that files are keyed by content and left at their read position."""
+        file = io.BytesIO(b"contract")
+
+        key = idempotency_key("documents", {"file": file, "priority": "high"})
+
+        assert key == idempotency_key("documents", {"file": io.BytesIO(b"contract"), "priority": "high"})
+        assert key != idempotency_key("documents", {"file": io.BytesIO(b"invoice"), "priority": "high"})
+        assert file.tell() == 0
+
+    def test_duplicate_reuses_analytics_id(self):
+        """Test that a repeated trigger returns the first analytics_id without calling the API."""
+        client = sync_client()
+        store = IdempotencyStore()
+
+        first = trigger_once("orders", {"orderId": "ORD-1"}, client=client, store=store)
+        second = trigger_once("orders", {"orderId": "ORD-1"}, client=client, store=store)
+
+        assert not first.duplicate and second.duplicate
+        assert second.analytics_id == first.analytics_id == "wf-ORD-1"
+        assert client.flows.trigger_with_payload.call_count == 1
+        assert store.duplicates == 1
+
+    def test_caller_key_and_expiry(self):
+        """Test that a supplied key is used and expires after the TTL."""
+        now = [0.0]
+        client = sync_client()
+        store = IdempotencyStore(ttl=60, clock=lambda: now[0])
+
+        trigger_once("orders", {"orderId": "ORD-1", "attempt": 1}, key="order:ORD-1", client=client, store=store)
+        retried = trigger_once("orders", {"orderId": "ORD-1", "attempt": 2}, key="order:ORD-1", client=client, store=store)
+        now[0] = 61
+        trigger_once("orders", {"orderId": "ORD-1", "attempt": 3}, key="order:ORD-1", client=client, store=store)
+
+        assert retried.duplicate
+        assert client.flows.trigger_with_payload.call_count == 2
+
+    def test_failures_are_not_remembered(self):
+        """Test that a failed trigger can be retried."""
+        client = sync_client()
+        client.flows.trigger_with_payload.side_effect = [Exception("timeout"), {"analytics_id": "wf-1"}]
+        store = IdempotencyStore()
+
+        with pytest.raises(Exception, match="timeout"):
+            trigger_once("orders", {"orderId": "ORD-1"}, client=client, store=store)
+        result = trigger_once("orders", {"orderId": "ORD-1"}, client=client, store=store)
+
+        assert not result.duplicate and result.analytics_id == "wf-1"
+
+    def test_bounded_store(self):
+        """Test that the store evicts the least recently used key."""
+        store = IdempotencyStore(max_entries=2)
+        for key in ["a", "b", "c"]:
+            store.put(key, key)
+
+        assert len(store) == 2
+        assert store.get("a") == (False, None)
+        assert store.get("c") == (True, "c")
+
+    def test_file_trigger(self):
+        """Test that with_file goes through trigger_with_file."""
+        client = sync_client()
+
+        result = trigger_once("documents", {"file": io.BytesIO(b"pdf")}, with_file=True, client=client, store=IdempotencyStore())
+
+        assert result.analytics_id == "wf-file"
+        client.flows.trigger_with_file.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_share_one_trigger(self):
+        """Test that concurrent async triggers with one key make a single call."""
+        client = MagicMock()
+
+        async def trigger_with_payload(workflow_id, body):
+            await asyncio.sleep(0.01)
+            return {"analytics_id": "wf-1"}
+
+        client.trigger_with_payload = AsyncMock(side_effect=trigger_with_payload)
+        store = IdempotencyStore()
+
+        results = await asyncio.gather(*(
+            trigger_once_async("orders", {"orderId": "ORD-1"}, client=client, store=store) for _ in range(5)
+        ))
+
+        assert client.trigger_with_payload.await_count == 1
+        assert [result.analytics_id for result in results] == ["wf-1"] * 5
+        assert sum(result.duplicate for result in results) == 4
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_share_failure(self):
+        """Test that waiters see the error of the shared trigger and nothing is remembered."""
+        client = MagicMock()
+
+        async def trigger_with_payload(workflow_id, body):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        client.trigger_with_payload = AsyncMock(side_effect=trigger_with_payload)
+        store = IdempotencyStore()
+
+        results = await asyncio.gather(
+            *(trigger_once_async("orders", {"orderId": "ORD-1"}, client=client, store=store) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert len(store) == 0
@@ -0,0 +1,119 @@
+import os
+import threading
+
+import pytest
+
+from src import ids
+from src.ids import SnowflakeGenerator, UlidGenerator, new_id, set_id_generator, with_document_ids
+
+
+@pytest.fixture(autouse=True)
+def default_generator():
+    set_id_generator(None)
+    yield
+    set_id_generator(None)
+
+
+class TestIds:
+    """Test suite for local documentId generation."""
+
+    def test_ulids_are_unique_and_time_ordered(self):
+        """Test that a burst of ULIDs is strictly increasing and well-formed."""
+        generator = UlidGenerator()
+
+        values = [generator.new_id() for _ in range(1000)] + generator.new_ids(5000)
+
+        assert values == sorted(values)
+        assert len(set(values)) == len(values)
+        assert all(len(value) == 26 for value in values)
+        assert set("".join(values)) <= set(ids._CROCKFORD)
+
+    def test_ulid_time_prefix_tracks_clock(self, monkeypatch):
+        """Test that the first 10 characters encode the millisecond timestamp."""
+        monkeypatch.setattr(ids, "_now_ms", lambda: 1_700_000_000_000)
+        first = UlidGenerator().new_id()
+
+        monkeypatch.setattr(ids, "_now_ms", lambda: 1_700_000_000_001)
+        later = UlidGenerator().new_id()
+
+        assert first[:10] == ids._encode_time(1_700_000_000_000)
+        assert first < later
+
+    def test_ulid_stays_monotonic_when_clock_goes_back(self, monkeypatch):
+        """Test that a clock step backwards doesn't reorder IDs."""
+        generator = UlidGenerator()
+        monkeypatch.setattr(ids, "_now_ms", lambda: 1_700_000_000_500)
+        ahead = generator.new_id()
+        monkeypatch.setattr(ids, "_now_ms", lambda: 1_700_000_000_000)
+
+        assert generator.new_id() > ahead
+
+    def test_ids_unique_across_threads(self):
+        """Test that concurrent callers never get the same ID."""
+        generator = UlidGenerator()
+        results = []
+
+        def work():
+            results.extend(generator.new_id() for _ in range(2000))
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(results)) == 16000
+
+    def test_snowflake_layout_and_sequence_overflow(self, monkeypatch):
+        """Test worker bits and borrowing the next millisecond past 4096 IDs."""
+        monkeypatch.setattr(ids, "_now_ms", lambda: SnowflakeGenerator.EPOCH_MS + 10)
+        generator = SnowflakeGenerator(worker_id=7)
+
+        values = [int(value) for value in generator.new_ids(4097)]
+
+        assert values == sorted(values) and len(set(values)) == 4097
+        assert (values[0] >> 12) & 1023 == 7
+        assert values[0] >> 22 == 10
+        assert values[-1] >> 22 == 11
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+    def test_forked_child_starts_fresh_sequence(self):
+        """Test that a forked child doesn't continue the parent's ULID sequence."""
+        generator = UlidGenerator()
+        generator.new_id()
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.write(write, str(generator._last_ms).encode())
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+        assert os.read(read, 64) == b"-1"
+
+    def test_prefix_and_bulk_assignment(self):
+        """Test prefixed IDs and that existing documentIds are left alone."""
+        rows = list(with_document_ids(({"n": i} for i in range(300)), "prod_", block=100))
+        kept = next(with_document_ids([{"documentId": "mine"}], "prod_"))
+
+        assert new_id("prod_").startswith("prod_")
+        assert all(row["documentId"].startswith("prod_") for row in rows)
+        assert len({row["documentId"] for row in rows}) == 300
+        assert [row["documentId"] for row in rows] == sorted(row["documentId"] for row in rows)
+        assert kept == {"documentId": "mine"}
+
+    def test_custom_generator_is_used(self):
+        """Test swapping in a custom generator."""
+        class Counter:
+            def __init__(self):
+                self.n = 0
+
+            def new_id(self):
+                self.n += 1
+                return str(self.n)
+
+            def new_ids(self, count):
+                return [self.new_id() for _ in range(count)]
+
+        set_id_generator(Counter())
+
+        assert new_id("user_") == "user_1"
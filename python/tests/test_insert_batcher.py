@@ -0,0 +1,81 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.insert_batcher import InsertBatcher
+
+
+def echo_insert():
+    """insert_record stand-in that assigns documentIds in request order."""
+    counter = {"n": 0}
+
+    async def insert_record(table, data):
+        records = []
+        for row in data:
+            counter["n"] += 1
+            records.append({"documentId": f"doc_{counter['n']}", **row})
+        return {"data": records}
+
+    client = MagicMock()
+    client.insert_record = AsyncMock(side_effect=insert_record)
+    return client
+
+
+class TestInsertBatcher:
+    """Test suite for the insert micro-batcher."""
+
+    @pytest.mark.asyncio
+    async def test_flushes_when_batch_is_full(self):
+        """Test that reaching max_rows sends one list insert."""
+        client = echo_insert()
+        batcher = InsertBatcher(client=client, max_rows=3, max_delay_ms=10_000)
+
+        ids = await asyncio.gather(*(batcher.insert("users", {"name": f"user {i}"}) for i in range(3)))
+
+        assert ids == ["doc_1", "doc_2", "doc_3"]
+        client.insert_record.assert_awaited_once()
+        table, rows = client.insert_record.await_args[0]
+        assert table == "users"
+        assert [row["name"] for row in rows] == ["user 0", "user 1", "user 2"]
+
+    @pytest.mark.asyncio
+    async def test_flushes_after_delay(self):
+        """Test that a partial batch is sent once max_delay_ms passes."""
+        client = echo_insert()
+        batcher = InsertBatcher(client=client, max_rows=100, max_delay_ms=5)
+
+        future = batcher.submit("users", {"name": "John Doe"})
+        await asyncio.sleep(0.02)
+
+        assert future.done()
+        assert future.result() == "doc_1"
+        assert batcher.batches_sent == 1
+
+    @pytest.mark.asyncio
+    async def test_batches_are_per_table(self):
+        """Test that rows for different tables are never mixed."""
+        client = echo_insert()
+        batcher = InsertBatcher(client=client, max_rows=100, max_delay_ms=10_000)
+
+        batcher.submit("users", {"name": "John Doe"})
+        batcher.submit("products", {"name": "Widget"})
+        await batcher.flush()
+
+        tables = sorted(call[0][0] for call in client.insert_record.await_args_list)
+        assert tables == ["products", "users"]
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_fails_every_row(self):
+        """Test that an API error reaches each caller in the batch."""
+        client = MagicMock()
+        client.insert_record = AsyncMock(side_effect=Exception("Table not found"))
+        batcher = InsertBatcher(client=client, max_rows=2, max_delay_ms=10_000)
+
+        results = await asyncio.gather(
+            batcher.insert("users", {"name": "a"}),
+            batcher.insert("users", {"name": "b"}),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, Exception) and str(r) == "Table not found" for r in results)
@@ -0,0 +1,110 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.latency import (
+    Histogram,
+    LatencyRecorder,
+    content_length,
+    get_latency_recorder,
+    payload_bytes,
+    server_time_ms,
+    timed_call,
+)
+from src.nl_cache import NlSqlCache, nl_query
+
+
+class TestLatency:
+    """Test suite for the NL/SQL latency breakdown."""
+
+    def test_histogram_quantiles(self):
+        """Test that quantiles interpolate within buckets and stay within min/max."""
+        histogram = Histogram((10, 100, 1000))
+        for value in [5] * 50 + [50] * 45 + [500] * 5:
+            histogram.observe(value)
+
+        summary = histogram.summary()
+        assert summary["count"] == 100 and summary["min"] == 5 and summary["max"] == 500
+        assert 5 <= summary["p50"] <= 10
+        assert 10 < summary["p95"] <= 100
+        assert summary["p99"] <= 500
+        assert summary["buckets"] == {"le_10": 50, "le_100": 45, "le_1000": 5, "inf": 0}
+
+    def test_record_derives_overhead(self):
+        """Test that overhead is wall time minus the server-reported execution time."""
+        recorder = LatencyRecorder()
+        recorder.record("process_nl_query", "users", 1200, server_ms=900, request_bytes=80, response_bytes=400)
+
+        stats = recorder.snapshot()["users"]["process_nl_query"]
+        assert stats["wall_ms"]["mean"] == 1200
+        assert stats["server_ms"]["mean"] == 900
+        assert stats["overhead_ms"]["mean"] == 300
+        assert stats["response_bytes"]["max"] == 400
+
+    def test_server_time_and_payload_size(self):
+        """Test reading execution time in either spelling and measuring JSON payloads."""
+        assert server_time_ms({"execution_time": 12}) == 12.0
+        assert server_time_ms({"executionTime": 3.5}) == 3.5
+        assert server_time_ms({"data": []}) is None
+        assert payload_bytes({"a": 1}) == len('{"a": 1}')
+        assert payload_bytes(None) is None
+
+    def test_payloads_are_only_serialized_when_sampled(self):
+        """Test that sizes come from Content-Length, and bodies are re-encoded only when sampled."""
+        raw = MagicMock(headers={"content-length": "512"})
+        assert content_length(raw) == 512
+        assert content_length({"data": []}) is None
+
+        call = MagicMock(return_value={"data": [{"count": 1}]})
+        timed_call("execute_query", ["users"], call, query="SELECT 1")
+        stats = get_latency_recorder().snapshot()["users"]["execute_query"]
+        assert stats["response_bytes"]["count"] == 0 and stats["request_bytes"]["count"] == 0
+
+        with patch("src.latency.PAYLOAD_SAMPLE_RATE", 1.0):
+            timed_call("execute_query", ["users"], call, query="SELECT 1")
+        stats = get_latency_recorder().snapshot()["users"]["execute_query"]
+        assert stats["response_bytes"]["max"] == payload_bytes({"data": [{"count": 1}]})
+        assert stats["request_bytes"]["count"] == 1
+
+    def test_timed_call_records_failures(self):
+        """Test that a failing call counts as an error and is re-raised."""
+        call = MagicMock(side_effect=RuntimeError("boom"))
+
+        with pytest.raises(RuntimeError):
+            timed_call("execute_query", ["users"], call, query="SELECT 1")
+
+        assert get_latency_recorder().snapshot()["users"]["execute_query"]["errors"] == 1
+
+    def test_nl_query_records_generation_and_replay(self):
+        """Test that nl_query records the server round trip, then the cache hit and replay."""
+        client = MagicMock()
+        client.db.process_nl_query.return_value = {"data": [], "sql": "SELECT COUNT(*) FROM users", "execution_time": 5}
+        client.db.execute_query.return_value = {"data": [{"count": 1}], "execution_time": 2}
+        cache = NlSqlCache()
+
+        nl_query("How many users?", "users", client=client, cache=cache)
+        nl_query("How many users?", "users", client=client, cache=cache)
+
+        stats = get_latency_recorder().snapshot()["users"]
+        assert stats["process_nl_query"]["wall_ms"]["count"] == 1
+        assert stats["process_nl_query"]["server_ms"]["mean"] == 5
+        assert stats["process_nl_query"]["cache_hits"] == 1
+        assert stats["execute_query"]["server_ms"]["mean"] == 2
+
+    @patch("src.async_client.AsyncWorqhat")
+    def test_async_client_records_tables(self, mock_async_worqhat_class):
+        """Test that AsyncClient labels execute_query timings with the tables in the SQL."""
+        from src.async_client import AsyncClient
+
+        sdk = MagicMock()
+        sdk.db.execute_query = AsyncMock(return_value={"data": [], "execution_time": 7})
+        mock_async_worqhat_class.return_value = sdk
+
+        client = AsyncClient(api_key="key")
+        asyncio.run(client.execute_query("SELECT * FROM users u JOIN orders o ON o.user_id = u.id"))
+        asyncio.run(client.execute_query("SELECT * FROM users u JOIN orders o ON o.user_id = u.id"))
+
+        stats = get_latency_recorder().snapshot()["orders,users"]["execute_query"]
+        assert stats["server_ms"]["count"] == 1
+        assert stats["cache_hits"] == 1
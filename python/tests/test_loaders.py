@@ -0,0 +1,151 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.loaders import Checkpoint, convert_row, load_file, main, parse_types, read_rows
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def recording_client(fail_rows=()):
+    """insert_record stand-in; chunks containing a sku in fail_rows always fail."""
+    sent = []
+
+    async def insert_record(table, data):
+        if any(row["sku"] in fail_rows for row in data):
+            raise Exception("Request timed out")
+        sent.extend(data)
+        return {"data": [{"documentId": row["sku"]} for row in data]}
+
+    client = MagicMock()
+    client.insert_record = AsyncMock(side_effect=insert_record)
+    return client, sent
+
+
+class TestLoaders:
+    """Test suite for the CSV/JSONL bulk loader."""
+
+    def test_csv_columns_are_converted(self, tmp_path):
+        """Test per-column type conversion, with empty cells becoming None."""
+        path = write(tmp_path / "products.csv", "sku,price,inStock,stock\nA,9.5,yes,3\nB,,false,\n")
+        types = parse_types(["price=float", "inStock=bool", "stock=int"])
+
+        rows = list(read_rows(path, "csv", types))
+
+        assert rows == [
+            {"sku": "A", "price": 9.5, "inStock": True, "stock": 3},
+            {"sku": "B", "price": None, "inStock": False, "stock": None},
+        ]
+
+    def test_jsonl_rows_skip_offset(self, tmp_path):
+        """Test that JSONL rows are read lazily and the resume offset is skipped."""
+        path = write(tmp_path / "products.jsonl", "\n".join(json.dumps({"sku": str(i)}) for i in range(5)) + "\n")
+
+        rows = read_rows(path, "jsonl", {}, skip=3)
+
+        assert next(rows) == {"sku": "3"}
+        assert list(rows) == [{"sku": "4"}]
+
+    def test_bad_type_spec_is_rejected(self):
+        """Test that unknown column types fail before any upload."""
+        with pytest.raises(Exception, match="Bad --type"):
+            parse_types(["price=decimal"])
+        with pytest.raises(ValueError):
+            convert_row({"inStock": "maybe"}, parse_types(["inStock=bool"]))
+
+    def test_checkpoint_advances_over_contiguous_chunks(self, tmp_path):
+        """Test that out-of-order chunks only move the offset once the gap fills."""
+        checkpoint = Checkpoint(str(tmp_path / "load.checkpoint"), "products.csv", "products")
+
+        assert checkpoint.settle(10, 10) is False
+        assert checkpoint.offset == 0
+        assert checkpoint.settle(0, 10) is True
+        assert checkpoint.offset == 20
+
+        reloaded = Checkpoint(checkpoint.path, "products.csv", "products")
+        assert reloaded.load() == 20
+
+    @pytest.mark.asyncio
+    async def test_load_resumes_from_checkpoint(self, tmp_path):
+        """Test that a rerun skips rows already covered by the checkpoint."""
+        path = write(tmp_path / "products.csv", "sku\n" + "\n".join(f"s{i}" for i in range(10)) + "\n")
+        Checkpoint(f"{path}.checkpoint", path, "products").settle(0, 6)
+        client, sent = recording_client()
+
+        rejected = await load_file(path, "products", client=client, progress_every=0)
+
+        assert rejected == 0
+        assert [row["sku"] for row in sent] == ["s6", "s7", "s8", "s9"]
+        assert not (tmp_path / "products.csv.checkpoint").exists()
+
+    @pytest.mark.asyncio
+    async def test_failed_chunks_go_to_rejects_file(self, tmp_path):
+        """Test that exhausted chunks are parked in the rejects file and kept in the checkpoint."""
+        path = write(tmp_path / "products.jsonl", "".join(json.dumps({"sku": f"s{i}"}) + "\n" for i in range(4)))
+        client, sent = recording_client(fail_rows={"s0"})
+
+        rejected = await load_file(path, "products", max_retries=0, client=client)
+
+        assert rejected == 4
+        assert sent == []
+        rejects = (tmp_path / "products.jsonl.rejects.jsonl").read_text().splitlines()
+        assert [json.loads(line)["sku"] for line in rejects] == ["s0", "s1", "s2", "s3"]
+        assert json.loads((tmp_path / "products.jsonl.checkpoint").read_text())["offset"] == 4
+
+    @pytest.mark.asyncio
+    async def test_malformed_rows_are_rejected_and_load_continues(self, tmp_path):
+        """Test that unparseable rows go to the rejects file while the rest load and the checkpoint covers both."""
+        lines = [json.dumps({"sku": "s0", "stock": "1"}), json.dumps({"sku": "s1", "stock": "many"}),
+                 "{not json", json.dumps({"sku": "s3", "stock": "3"})]
+        path = write(tmp_path / "products.jsonl", "\n".join(lines) + "\n")
+        client, sent = recording_client()
+
+        rejected = await load_file(path, "products", types=parse_types(["stock=int"]), client=client)
+
+        assert rejected == 2
+        assert [(row["sku"], row["stock"]) for row in sent] == [("s0", 1), ("s3", 3)]
+        rejects = [json.loads(line) for line in (tmp_path / "products.jsonl.rejects.jsonl").read_text().splitlines()]
+        assert rejects[0]["sku"] == "s1" and "many" in rejects[0]["_reject_error"]
+        assert rejects[1]["_raw"] == "{not json"
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_covers_rejected_rows(self, tmp_path):
+        """Test that the checkpoint offset counts unparseable rows as well as sent ones."""
+        lines = [json.dumps({"sku": "s0"}), "{not json", json.dumps({"sku": "s2"})]
+        path = write(tmp_path / "products.jsonl", "\n".join(lines) + "\n")
+        client, _ = recording_client(fail_rows={"s2"})
+
+        rejected = await load_file(path, "products", max_retries=0, client=client)
+
+        assert rejected == 3
+        assert json.loads((tmp_path / "products.jsonl.checkpoint").read_text())["offset"] == 3
+
+    @pytest.mark.asyncio
+    async def test_rejects_spread_over_many_chunks(self, tmp_path, capsys):
+        """Test that file rows stay correctly mapped as bad rows before the checkpoint are folded away."""
+        lines = ["{not json" if i % 7 == 3 else json.dumps({"sku": f"s{i}"}) for i in range(400)]
+        path = write(tmp_path / "products.jsonl", "\n".join(lines) + "\n")
+        client, sent = recording_client(fail_rows={"s398"})
+
+        rejected = await load_file(path, "products", chunk_size=50, concurrency=2, max_retries=0, client=client)
+
+        rejects = [json.loads(line) for line in (tmp_path / "products.jsonl.rejects.jsonl").read_text().splitlines()]
+        failed_first = next(int(row["sku"][1:]) for row in rejects if "sku" in row)
+        # The failed chunk is reported at its real file row, after dozens of earlier bad rows
+        assert f"Chunk at row {failed_first} failed" in capsys.readouterr().out
+        assert rejected == 400 - len(sent)
+        # Every row, sent, failed or unparseable, is covered by the checkpoint
+        assert json.loads((tmp_path / "products.jsonl.checkpoint").read_text())["offset"] == 400
+
+    def test_cli_exit_code(self, tmp_path, monkeypatch):
+        """Test the command-line entry point end to end."""
+        path = write(tmp_path / "products.csv", "sku,price\nA,1.5\n")
+        client, sent = recording_client()
+        monkeypatch.setattr("src.bulk_insert.get_async_client", lambda: client)
+
+        assert main([path, "--table", "products", "--type", "price=float"]) == 0
+        assert sent == [{"sku": "A", "price": 1.5}]
@@ -0,0 +1,130 @@
+import re
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.diff_update import get_snapshot_store
+from src.mass_delete import MassDeleteError, mass_delete
+
+
+def table_client(ids, fail_batches=()):
+    """execute_query stand-in over an in-memory table of documentIds."""
+    state = {"rows": sorted(ids), "deletes": [], "calls": 0}
+
+    async def execute_query(query, params=None, use_cache=True):
+        text = query if isinstance(query, str) else query.text
+        params = params or {}
+        if text.startswith("SELECT COUNT(*)"):
+            return {"data": [{"count": len(state["rows"])}]}
+        if text.startswith("WITH _changed AS (DELETE"):
+            state["calls"] += 1
+            if state["calls"] in fail_batches:
+                raise Exception("Request timed out")
+            batch = [value for key, value in params.items() if key.startswith("id_")]
+            state["deletes"].append(batch)
+            state["rows"] = [row for row in state["rows"] if row not in batch]
+            return {"data": [{"count": len(batch)}]}
+        # Keyset page over the remaining rows
+        after = params.get("_page_after") or params.get("resume_after")
+        limit = int(re.search(r"LIMIT (\d+)", text).group(1))
+        rows = [row for row in state["rows"] if after is None or row > after][:limit]
+        return {"data": [{"doc_id": row} for row in rows]}
+
+    client = MagicMock()
+    client.execute_query = execute_query
+    return client, state
+
+
+class TestMassDelete:
+    """Test suite for the chunked mass-delete executor."""
+
+    @pytest.mark.asyncio
+    async def test_deletes_in_bounded_batches(self):
+        """Test that matching IDs are deleted batch by batch with progress reports."""
+        client, state = table_client([f"doc_{i:03d}" for i in range(25)])
+        seen = []
+
+        progress = await mass_delete("users", {"status": "inactive"}, batch_size=10, rate=0, client=client,
+                                     on_progress=lambda p: seen.append(p.deleted))
+
+        assert [len(batch) for batch in state["deletes"]] == [10, 10, 5]
+        assert seen == [10, 20, 25]
+        assert progress.deleted == 25 and progress.done
+        assert progress.cursor == "doc_024"
+        assert state["rows"] == []
+
+    @pytest.mark.asyncio
+    async def test_dry_run_only_counts(self):
+        """Test that a dry run never deletes."""
+        client, state = table_client(["a", "b", "c"])
+
+        progress = await mass_delete("users", {"status": "inactive"}, dry_run=True, client=client)
+
+        assert progress.matched == 3
+        assert state["deletes"] == []
+
+    @pytest.mark.asyncio
+    async def test_failure_can_be_resumed(self):
+        """Test that a failing batch raises with a cursor the next run resumes from."""
+        client, state = table_client([f"doc_{i}" for i in range(6)], fail_batches={2})
+
+        with pytest.raises(MassDeleteError) as error:
+            await mass_delete("tasks", {"status": "completed"}, batch_size=2, rate=0, max_retries=0, client=client)
+
+        assert error.value.progress.cursor == "doc_1"
+        progress = await mass_delete("tasks", {"status": "completed"}, batch_size=2, rate=0,
+                                     resume_after=error.value.progress.cursor, client=client)
+        assert progress.deleted == 4
+        assert state["rows"] == []
+
+    @pytest.mark.asyncio
+    async def test_rate_limits_throughput(self, monkeypatch):
+        """Test that batches are paced to the configured rows per second."""
+        client, _ = table_client(["a", "b", "c", "d"])
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        monkeypatch.setattr("src.mass_delete.asyncio.sleep", fake_sleep)
+        await mass_delete("users", {"status": "inactive"}, batch_size=2, rate=4, client=client)
+
+        assert len(sleeps) == 2
+        assert all(0.4 < seconds <= 0.5 for seconds in sleeps)
+
+    @pytest.mark.asyncio
+    async def test_delete_rechecks_filter_and_condition(self):
+        """Test the generated delete keeps the original filter and extra condition."""
+        queries = []
+
+        async def execute_query(query, params=None, use_cache=True):
+            queries.append((query if isinstance(query, str) else query.text, params))
+            if "DELETE" in queries[-1][0]:
+                return {"data": [{"count": 1}]}
+            return {"data": [{"doc_id": "x"}] if len(queries) == 1 else []}
+
+        client = MagicMock()
+        client.execute_query = execute_query
+        await mass_delete("tasks", {"status": "completed"}, condition='"completedAt" < {cutoff}',
+                          condition_params={"cutoff": "2024-01-01"}, batch_size=5, rate=0, client=client)
+
+        delete_sql, delete_params = next(q for q in queries if "DELETE" in q[0])
+        assert '"documentId" IN ({id_0}) AND "status" = {where_0} AND ("completedAt" < {cutoff})' in delete_sql
+        assert delete_params == {"where_0": "completed", "cutoff": "2024-01-01", "id_0": "x"}
+
+    @pytest.mark.asyncio
+    async def test_requires_a_filter(self):
+        """Test that an unfiltered purge is refused."""
+        with pytest.raises(ValueError):
+            await mass_delete("users", {}, client=MagicMock())
+
+    @pytest.mark.asyncio
+    async def test_drops_diff_snapshots(self):
+        """Test that deleting rows invalidates the table's diff snapshots."""
+        client, _ = table_client(["doc_001"])
+        store = get_snapshot_store()
+        store.merge("users", {"documentId": "doc_001"}, {"status": "inactive"})
+
+        await mass_delete("users", {"status": "inactive"}, rate=0, client=client)
+
+        assert store.get("users", {"documentId": "doc_001"}) is None
@@ -0,0 +1,251 @@
+import asyncio
+import inspect
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.nl_cache import (
+    CachedNlResult,
+    NlSqlCache,
+    load_warmup_questions,
+    normalize_question,
+    nl_query,
+    schema_query,
+    nl_query_async,
+    warm_nl_cache,
+)
+
+COLUMNS = {"data": [{"column_name": "id", "data_type": "text"}, {"column_name": "status", "data_type": "text"}]}
+SQL = "SELECT COUNT(*) as count FROM users WHERE status = 'active'"
+
+
+def sync_client(columns=COLUMNS):
+    client = MagicMock()
+    client.db.process_nl_query.return_value = {"data": [{"count": 157}], "sql": SQL, "execution_time": 900}
+
+    # Same keyword-only signature as the SDK's DBResource.execute_query
+    def execute_query(*, query):
+        if "information_schema" in query:
+            return columns
+        return {"data": [{"count": 158}]}
+
+    client.db.execute_query.side_effect = execute_query
+    return client
+
+
+class TestNlCache:
+    """Test suite for the natural-language-to-SQL cache."""
+
+    def test_normalize_question(self):
+        """Test that spacing, case and trailing punctuation are ignored."""
+        assert normalize_question("  How many  ACTIVE users?? ") == "how many active users"
+
+    def test_repeat_question_runs_cached_sql(self):
+        """Test that the second ask skips process_nl_query and runs the stored SQL."""
+        client = sync_client()
+        cache = NlSqlCache()
+
+        first = nl_query("How many active users do we have?", "users", client=client, cache=cache)
+        second = nl_query("how many active users do we have", "users", client=client, cache=cache)
+
+        assert first["data"] == [{"count": 157}]
+        assert isinstance(second, CachedNlResult)
+        assert second.data == [{"count": 158}] and second.sql == SQL
+        assert client.db.process_nl_query.call_count == 1
+        client.db.execute_query.assert_called_with(query=SQL)
+        assert cache.hits == 1
+
+    def test_schema_change_expires_entries(self):
+        """Test that a new schema version sends the question back to the server."""
+        now = [0.0]
+        cache = NlSqlCache(schema_check_seconds=60, clock=lambda: now[0])
+        nl_query("How many active users?", "users", client=sync_client(), cache=cache)
+
+        migrated = sync_client(columns={"data": COLUMNS["data"] + [{"column_name": "tier", "data_type": "text"}]})
+        now[0] = 61
+        nl_query("How many active users?", "users", client=migrated, cache=cache)
+
+        assert migrated.db.process_nl_query.call_count == 1
+
+    def test_schema_probe_is_rate_limited(self):
+        """Test the schema version is only re-read after schema_check_seconds."""
+        client = sync_client()
+        cache = NlSqlCache(schema_check_seconds=60, clock=lambda: 0.0)
+
+        for _ in range(3):
+            nl_query("How many active users?", "users", client=client, cache=cache)
+
+        probes = [c for c in client.db.execute_query.call_args_list if "information_schema" in c[1]["query"]]
+        assert len(probes) == 1
+
+    def test_schema_probe_matches_sdk_signature(self):
+        """Test the probe is a single query= call the real SDK accepts, with the table name escaped."""
+        from worqhat.resources.db import DBResource
+
+        client = sync_client()
+        nl_query("How many active users?", "users", client=client, cache=NlSqlCache())
+
+        probe = client.db.execute_query.call_args_list[0]
+        inspect.signature(DBResource.execute_query).bind(None, *probe.args, **probe.kwargs)
+        assert probe.kwargs == {"query": schema_query("users")}
+        assert schema_query("o'brien") == (
+            "SELECT column_name, data_type FROM information_schema.columns "
+            "WHERE table_name = 'o''brien' ORDER BY column_name"
+        )
+
+    def test_schema_probe_type_error_is_raised(self):
+        """Test that a TypeError from the probe call surfaces instead of silently bypassing the cache."""
+        client = MagicMock()
+        client.db.execute_query.side_effect = TypeError("unexpected keyword argument 'params'")
+
+        with pytest.raises(TypeError):
+            nl_query("How many active users?", "users", client=client, cache=NlSqlCache())
+
+    def test_writes_are_never_replayed(self):
+        """Test that generated non-read SQL isn't cached."""
+        client = sync_client()
+        client.db.process_nl_query.return_value = {"data": [], "sql": "DELETE FROM users"}
+        cache = NlSqlCache()
+
+        nl_query("Remove everyone", "users", client=client, cache=cache)
+
+        assert len(cache) == 0
+
+    def test_failed_replay_falls_back(self):
+        """Test that a failing cached SQL is dropped and the question is re-asked."""
+        client = sync_client()
+        cache = NlSqlCache()
+        nl_query("How many active users?", "users", client=client, cache=cache)
+
+        def execute_query(*, query):
+            if "information_schema" in query:
+                return COLUMNS
+            raise Exception("column does not exist")
+
+        client.db.execute_query.side_effect = execute_query
+        response = nl_query("How many active users?", "users", client=client, cache=cache)
+
+        assert response["sql"] == SQL
+        assert client.db.process_nl_query.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_async_cache(self):
+        """Test the async variant goes through AsyncClient."""
+        client = MagicMock()
+        client.process_nl_query = AsyncMock(return_value={"data": [], "sql": SQL})
+
+        async def execute_query(query, params=None, use_cache=True):
+            return COLUMNS if "information_schema" in query else {"data": [{"count": 1}]}
+
+        client.execute_query = execute_query
+        cache = NlSqlCache()
+
+        await nl_query_async("How many active users?", "users", client=client, cache=cache)
+        result = await nl_query_async("How many active users?", "users", client=client, cache=cache)
+
+        assert result.data == [{"count": 1}]
+        client.process_nl_query.assert_awaited_once()
+
+
+class TestNlWarmup:
+    """Test suite for prewarming the NL cache at startup."""
+
+    def async_client(self, fail_table=None):
+        client = MagicMock()
+
+        async def process_nl_query(question, table):
+            if table == fail_table:
+                raise RuntimeError("generation failed")
+            return {"data": [], "sql": f"SELECT COUNT(*) FROM {table}", "execution_time": 900}
+
+        async def execute_query(query, params=None, use_cache=True):
+            return COLUMNS
+
+        client.process_nl_query = AsyncMock(side_effect=process_nl_query)
+        client.execute_query = AsyncMock(side_effect=execute_query)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_warmup_loads_schema_once_and_fills_cache(self):
+        """Test that each table's schema is read once and every question's SQL is cached."""
+        client = self.async_client()
+        cache = NlSqlCache()
+        questions = [("How many users?", "users"), ("How many active users?", "users"), ("Total sales?", "sales")]
+
+        report = await warm_nl_cache(questions, client=client, cache=cache)
+
+        assert set(report.versions) == {"users", "sales"} and all(report.versions.values())
+        assert report.warmed == 3 and report.cached == 3 and not report.failed
+        schema_calls = [c for c in client.execute_query.await_args_list if "information_schema" in c.args[0]]
+        assert len(schema_calls) == 2
+        assert cache.get("how many users", "users", report.versions["users"]) == "SELECT COUNT(*) FROM users"
+
+    @pytest.mark.asyncio
+    async def test_warmup_reports_failures(self):
+        """Test that a failing question is reported without stopping the others."""
+        report = await warm_nl_cache(
+            [("How many users?", "users"), ("Total sales?", "sales")],
+            client=self.async_client(fail_table="sales"),
+            cache=NlSqlCache(),
+        )
+
+        assert report.warmed == 1
+        assert report.failed == [{"question": "Total sales?", "table": "sales", "error": "generation failed"}]
+
+    @pytest.mark.asyncio
+    async def test_warmup_timeout_keeps_partial_results(self):
+        """Test that hitting the timeout marks the report instead of raising."""
+        client = self.async_client()
+
+        async def slow(question, table):
+            await asyncio.sleep(10)
+
+        client.process_nl_query = AsyncMock(side_effect=slow)
+        report = await warm_nl_cache([("How many users?", "users")], client=client, cache=NlSqlCache(), timeout=0.05)
+
+        assert report.timed_out and report.warmed == 0
+        assert report.versions["users"] is not None
+
+    @pytest.mark.asyncio
+    async def test_warmup_counts_only_questions_the_cache_answers(self):
+        """Test that a question is counted as cached only if the cache serves it afterwards."""
+        report = await warm_nl_cache([("How many users?", "users")], client=self.async_client(), cache=NlSqlCache(ttl=0))
+
+        assert report.warmed == 1 and report.cached == 0
+
+    @pytest.mark.asyncio
+    async def test_warmup_reports_unreadable_question_file(self, tmp_path):
+        """Test that a missing or malformed question file is reported instead of raised."""
+        path = tmp_path / "warmup.json"
+        path.write_text("not json")
+
+        report = await warm_nl_cache(str(path), client=self.async_client(), cache=NlSqlCache())
+        missing = await warm_nl_cache(str(tmp_path / "missing.json"), client=self.async_client(), cache=NlSqlCache())
+
+        assert report.warmed == 0 and len(report.failed) == 1 and "error" in report.failed[0]
+        assert missing.warmed == 0 and len(missing.failed) == 1
+
+    @pytest.mark.asyncio
+    async def test_warmup_reports_client_errors(self):
+        """Test that failing to build the async client is reported instead of raised."""
+        with patch("src.nl_cache.get_async_client", side_effect=ValueError("WORQHAT_API_KEY is not set")):
+            report = await warm_nl_cache([("How many users?", "users")], cache=NlSqlCache())
+
+        assert report.failed == [{"error": "WORQHAT_API_KEY is not set"}]
+
+    @pytest.mark.asyncio
+    async def test_warmup_reads_question_file(self, tmp_path):
+        """Test that a path is read as a JSON question list."""
+        path = tmp_path / "warmup.json"
+        path.write_text('[{"question": "How many users?", "table": "users"}]')
+
+        report = await warm_nl_cache(str(path), client=self.async_client(), cache=NlSqlCache())
+
+        assert report.warmed == 1 and report.cached == 1
+
+    def test_load_warmup_questions(self, tmp_path):
+        """Test reading the question list from JSON objects or pairs."""
+        path = tmp_path / "warmup.json"
+        path.write_text('[{"question": "How many users?", "table": "users"}, ["Total sales?", "sales"]]')
+
+        assert load_warmup_questions(str(path)) == [("How many users?", "users"), ("Total sales?", "sales")]
@@ -0,0 +1,158 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from src.outbox import DEAD, PENDING, SENT, OutboxDispatcher, TriggerOutbox
+from src.trigger_scheduler import get_trigger_scheduler
+
+
+class Throttled(Exception):
+    status_code = 429
+
+
+class BadRequest(Exception):
+    status_code = 400
+
+
+def trigger_client(side_effect):
+    client = MagicMock()
+    client.trigger_with_payload = AsyncMock(side_effect=side_effect)
+    return client
+
+
+class TestOutbox:
+    """Test suite for the SQLite trigger outbox and its dispatcher."""
+
+    def test_enqueue_survives_reopen(self, tmp_path):
+        """Test that queued triggers are still pending after the file is reopened."""
+        path = str(tmp_path / "outbox.db")
+        outbox = TriggerOutbox(path)
+        ids = outbox.enqueue_many([("orders", {"orderId": "ORD-1"}), ("orders", {"orderId": "ORD-2"})])
+        outbox.close()
+
+        reopened = TriggerOutbox(path)
+        assert reopened.stats()[PENDING] == 2
+        assert reopened.get(ids[1]).payload == {"orderId": "ORD-2"}
+        reopened.close()
+
+    def test_claim_leases_entries(self, tmp_path):
+        """Test that claimed triggers are hidden until their lease expires."""
+        now = [1000.0]
+        outbox = TriggerOutbox(str(tmp_path / "outbox.db"), clock=lambda: now[0])
+        outbox.enqueue("orders", {"orderId": "ORD-1"})
+
+        assert len(outbox.claim(10, lease_seconds=60)) == 1
+        assert outbox.claim(10, lease_seconds=60) == []
+        now[0] += 61
+        assert len(outbox.claim(10, lease_seconds=60)) == 1
+        outbox.close()
+
+    @pytest.mark.asyncio
+    async def test_dispatcher_sends_batch(self, tmp_path):
+        """Test that the dispatcher sends due triggers and records their analytics_ids."""
+        outbox = TriggerOutbox(str(tmp_path / "outbox.db"))
+        ids = outbox.enqueue_many([("orders", {"orderId": f"ORD-{n}"}) for n in range(5)])
+        client = trigger_client(lambda workflow_id, body: {"analytics_id": f"wf-{body['orderId']}"})
+        dispatcher = OutboxDispatcher(outbox, client=client, batch_size=2)
+
+        await dispatcher.drain()
+
+        assert outbox.stats()[SENT] == 5 and outbox.stats()[PENDING] == 0
+        assert outbox.get(ids[3]).analytics_id == "wf-ORD-3"
+        assert client.trigger_with_payload.await_count == 5
+        outbox.close()
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_is_rescheduled(self, tmp_path):
+        """Test that a throttled trigger stays pending with backoff and an attempt counted."""
+        now = [1000.0]
+        outbox = TriggerOutbox(str(tmp_path / "outbox.db"), clock=lambda: now[0])
+        id_ = outbox.enqueue("orders", {"orderId": "ORD-1"})
+
+        def throttled(workflow_id, body):
+            raise Throttled("slow down")
+
+        dispatcher = OutboxDispatcher(outbox, client=trigger_client(throttled), retry_delay=10)
+        assert await dispatcher.run_once() == 1
+
+        entry = outbox.get(id_)
+        assert entry.status == PENDING and entry.attempts == 1 and entry.last_error == "slow down"
+        assert await dispatcher.run_once() == 0
+        now[0] += 11
+        assert await dispatcher.run_once() == 1
+        outbox.close()
+
+    @pytest.mark.asyncio
+    async def test_permanent_failure_and_max_attempts_go_dead(self, tmp_path):
+        """Test that 4xx errors and exhausted retries end up dead, and can be requeued."""
+        outbox = TriggerOutbox(str(tmp_path / "outbox.db"))
+        outbox.enqueue("orders", {"kind": "bad"})
+        outbox.enqueue("orders", {"kind": "throttled"})
+
+        def fail(workflow_id, body):
+            raise BadRequest("invalid") if body["kind"] == "bad" else Throttled("slow down")
+
+        dispatcher = OutboxDispatcher(outbox, client=trigger_client(fail), max_attempts=1)
+        await dispatcher.run_once()
+
+        assert outbox.stats()[DEAD] == 2 and dispatcher.dead == 2
+        assert outbox.requeue_dead() == 2
+        assert outbox.stats()[PENDING] == 2
+        outbox.close()
+
+    @pytest.mark.asyncio
+    @patch("src.async_client.AsyncWorqhat")
+    async def test_dispatcher_uses_scheduler_at_low_priority(self, mock_async_worqhat_class, tmp_path):
+        """Test that without a client the dispatcher sends through the shared scheduler as low priority."""
+        sdk = MagicMock()
+        sdk.flows.trigger_with_payload = AsyncMock(return_value={"analytics_id": "wf-1"})
+        mock_async_worqhat_class.return_value = sdk
+        outbox = TriggerOutbox(str(tmp_path / "outbox.db"))
+        outbox.enqueue("orders", {"orderId": "ORD-1", "priority": "high"})
+
+        await OutboxDispatcher(outbox).run_once()
+
+        assert outbox.stats()[SENT] == 1
+        assert get_trigger_scheduler().stats()["started"] == {"high": 0, "normal": 0, "low": 1}
+        outbox.close()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_batch_settles_what_was_sent(self, tmp_path):
+        """Test that shutting down mid-batch still records the triggers that already went out."""
+        outbox = TriggerOutbox(str(tmp_path / "outbox.db"))
+        ids = outbox.enqueue_many([("orders", {"orderId": "ORD-1"}), ("orders", {"orderId": "ORD-2"})])
+
+        async def send(workflow_id, body):
+            if body["orderId"] == "ORD-2":
+                await asyncio.sleep(60)
+            return {"analytics_id": f"wf-{body['orderId']}"}
+
+        dispatcher = OutboxDispatcher(outbox, client=trigger_client(send), batch_size=2, concurrency=2)
+        task = asyncio.ensure_future(dispatcher.run_once())
+        for _ in range(10):
+            await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert outbox.get(ids[0]).status == SENT and outbox.get(ids[0]).analytics_id == "wf-ORD-1"
+        assert outbox.get(ids[1]).status == PENDING
+        assert dispatcher.sent == 1
+        outbox.close()
+
+    @patch("src.async_client.AsyncWorqhat")
+    @patch("src.client_pool.Worqhat")
+    def test_outbox_route_needs_running_dispatcher(self, _mock_worqhat_class, _mock_async_worqhat_class):
+        """Test that queueing through the route is refused while no dispatcher would send it."""
+        from src.app import app
+
+        async def scenario():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as http:
+                return await http.get("http://app/flows/trigger-json/outbox")
+
+        response = asyncio.run(scenario())
+
+        assert response.status_code == 503
+        assert "WORQHAT_OUTBOX_ENABLED" in response.json()["error"]
@@ -0,0 +1,123 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.pagination import aiter_query_pages, iter_query_pages, iter_query_rows
+
+
+def page(*ids):
+    return {"data": [{"id": i} for i in ids]}
+
+
+class TestPagination:
+    """Test suite for paginated query iteration."""
+
+    def test_offset_pages_until_short_page(self):
+        """Test LIMIT/OFFSET paging stops after a short page."""
+        client = MagicMock()
+        client.db.execute_query.side_effect = [page(1, 2), page(3, 4), page(5)]
+
+        pages = list(iter_query_pages("SELECT * FROM users ORDER BY id", page_size=2, client=client))
+
+        assert pages == [[{"id": 1}, {"id": 2}], [{"id": 3}, {"id": 4}], [{"id": 5}]]
+        queries = [call[1]["query"] for call in client.db.execute_query.call_args_list]
+        assert queries == [
+            "SELECT * FROM users ORDER BY id LIMIT 2 OFFSET 0",
+            "SELECT * FROM users ORDER BY id LIMIT 2 OFFSET 2",
+            "SELECT * FROM users ORDER BY id LIMIT 2 OFFSET 4",
+        ]
+
+    @pytest.mark.parametrize("query", [
+        "SELECT * FROM users",
+        "SELECT * FROM (SELECT * FROM users ORDER BY id) AS u",
+        "SELECT * FROM users WHERE note = 'ORDER BY id'",
+        "SELECT * FROM users ORDER BY id LIMIT 10",
+    ])
+    def test_offset_paging_requires_top_level_order(self, query):
+        """Test that OFFSET paging rejects queries without a stable order of their own."""
+        with pytest.raises(ValueError):
+            list(iter_query_pages(query, client=MagicMock()))
+
+    def test_keyset_pages_with_named_params(self):
+        """Test keyset paging carries the last key as a bound param."""
+        client = MagicMock()
+        client.db.execute_query.side_effect = [page(1, 2), page()]
+
+        rows = list(iter_query_rows(
+            "SELECT * FROM users WHERE status = {status}",
+            {"status": "active"},
+            page_size=2,
+            key_column="id",
+            client=client,
+            prefetch=False,
+        ))
+
+        assert rows == [{"id": 1}, {"id": 2}]
+        second = client.db.execute_query.call_args_list[1][1]
+        assert second["query"].endswith('AS _page WHERE "id" > {_page_after} ORDER BY "id" LIMIT 2')
+        assert second["params"] == {"status": "active", "_page_after": 2}
+
+    def test_keyset_pages_with_positional_params(self):
+        """Test keyset paging appends the cursor as the next $N."""
+        client = MagicMock()
+        client.db.execute_query.side_effect = [page(7), page()]
+
+        list(iter_query_pages("SELECT * FROM orders WHERE order_date >= $1", ["2025-01-01"],
+                              page_size=1, key_column="id", client=client, prefetch=False))
+
+        second = client.db.execute_query.call_args_list[1][1]
+        assert second["params"] == ["2025-01-01", 7]
+        assert 'WHERE "id" > $2' in second["query"]
+
+    def test_mixed_case_key_column_is_quoted(self):
+        """Test that a camelCase key survives Postgres identifier folding."""
+        client = MagicMock()
+        client.db.execute_query.side_effect = [{"data": [{"documentId": "a"}]}, page()]
+
+        list(iter_query_pages("SELECT * FROM users", page_size=1, key_column="documentId",
+                              client=client, prefetch=False))
+
+        first, second = (call[1]["query"] for call in client.db.execute_query.call_args_list)
+        assert first == 'SELECT * FROM (SELECT * FROM users) AS _page ORDER BY "documentId" LIMIT 1'
+        assert second == 'SELECT * FROM (SELECT * FROM users) AS _page WHERE "documentId" > {_page_after} ORDER BY "documentId" LIMIT 1'
+
+    def test_invalid_key_column_rejected(self):
+        """Test that the key column can't smuggle SQL."""
+        with pytest.raises(ValueError):
+            list(iter_query_pages("SELECT * FROM users", key_column="id; DROP TABLE users", client=MagicMock()))
+
+    @pytest.mark.asyncio
+    async def test_async_pages_prefetch_next_page(self):
+        """Test the next page is requested before the current one is consumed."""
+        client = MagicMock()
+        client.execute_query = AsyncMock(side_effect=[page(1, 2), page(3)])
+
+        pages = aiter_query_pages("SELECT * FROM users ORDER BY id", page_size=2, client=client)
+        first = await pages.__anext__()
+        # Let the prefetch task start
+        await asyncio.sleep(0)
+
+        assert first == [{"id": 1}, {"id": 2}]
+        assert client.execute_query.await_count == 2
+        assert [p async for p in pages] == [[{"id": 3}]]
+        assert client.execute_query.await_args_list[0][1] == {"use_cache": False}
+
+    @patch('src.async_client.AsyncWorqhat')
+    @patch('src.client_pool.Worqhat')
+    def test_db_query_route_streams_ndjson(self, _mock_worqhat_class, mock_async_worqhat_class):
+        """Test /db/query?stream=true emits one JSON row per line."""
+        from fastapi.testclient import TestClient
+        from src.app import app
+
+        sdk = MagicMock()
+        sdk.db.execute_query = AsyncMock(side_effect=[page(1, 2), page(3)])
+        sdk.close = AsyncMock()
+        mock_async_worqhat_class.return_value = sdk
+
+        with TestClient(app) as client:
+            response = client.get("/db/query?stream=true&page_size=2")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert response.text == '{"id": 1}\n{"id": 2}\n{"id": 3}\n'
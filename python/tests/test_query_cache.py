@@ -0,0 +1,153 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.async_client import AsyncClient
+from src.query_cache import QueryCache, cache_key, normalize_query, parse_tables, tables_in
+from src.returning import update_records
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_client(mock_async_worqhat_class):
+    sdk = MagicMock()
+    sdk.db.execute_query = AsyncMock(return_value={"data": [{"id": 1}]})
+    sdk.db.insert_record = AsyncMock(return_value={"data": {"documentId": "doc_1"}})
+    sdk.db.update_records = AsyncMock(return_value={"count": 1})
+    mock_async_worqhat_class.return_value = sdk
+    return AsyncClient(api_key="test-api-key", environment="test"), sdk
+
+
+class TestQueryCache:
+    """Test suite for the execute_query result cache."""
+
+    def test_cache_key_normalizes_whitespace_and_params(self):
+        """Test that formatting and param order don't create separate entries."""
+        a = cache_key("SELECT *\n   FROM users  WHERE status = {status};", {"status": "active", "limit": 10})
+        b = cache_key("SELECT * FROM users WHERE status = {status}", {"limit": 10, "status": "active"})
+
+        assert a == b
+
+    def test_tables_in_finds_from_and_join(self):
+        """Test table extraction for reads and writes."""
+        assert tables_in("SELECT * FROM orders o JOIN users u ON u.id = o.user_id") == {"orders", "users"}
+        assert tables_in("UPDATE users SET status = 'x'") == {"users"}
+
+    def test_normalize_keeps_literals_verbatim(self):
+        """Test that whitespace inside quoted literals still tells queries apart."""
+        assert normalize_query("SELECT *  FROM users WHERE name = 'a  b';") == "SELECT * FROM users WHERE name = 'a  b'"
+        assert cache_key("SELECT * FROM users WHERE name = 'a  b'") != cache_key("SELECT * FROM users WHERE name = 'a b'")
+
+    def test_tables_in_follows_comma_joins(self):
+        """Test that every table of a comma-separated FROM list is found."""
+        assert tables_in("SELECT * FROM users u, orders o WHERE u.id = o.user_id") == {"users", "orders"}
+        assert tables_in("SELECT * FROM users AS u, (SELECT * FROM refunds) r, orders") == {"users", "refunds", "orders"}
+        assert tables_in("SELECT * FROM users WHERE note = 'from orders'") == {"users"}
+
+    def test_parse_tables_flags_unknown_writes(self):
+        """Test that writes whose tables can't be parsed are marked incomplete."""
+        assert parse_tables("DELETE FROM users WHERE id = 1") == ({"users"}, True)
+        assert parse_tables("TRUNCATE users")[1] is False
+
+    def test_entries_expire_after_ttl(self):
+        """Test that entries are not served past their TTL."""
+        clock = FakeClock()
+        cache = QueryCache(ttl=10, max_entries=10, clock=clock)
+        cache.put("k", "rows", cache.snapshot({"users"}))
+
+        assert cache.get("k") == (True, "rows")
+        clock.now = 10.5
+        assert cache.get("k") == (False, None)
+
+    def test_lru_eviction_keeps_recently_used(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = QueryCache(ttl=60, max_entries=2)
+        cache.put("a", 1, cache.snapshot({"users"}))
+        cache.put("b", 2, cache.snapshot({"users"}))
+        cache.get("a")
+        cache.put("c", 3, cache.snapshot({"users"}))
+
+        assert cache.get("a") == (True, 1)
+        assert cache.get("b") == (False, None)
+        assert len(cache) == 2
+
+    def test_write_during_read_prevents_caching(self):
+        """Test that a read overlapping one of our writes is not stored."""
+        cache = QueryCache(ttl=60, max_entries=10)
+        generations = cache.snapshot({"users"})
+        cache.invalidate("users")
+
+        assert cache.put("k", "stale rows", generations) is False
+        assert cache.get("k") == (False, None)
+
+    @pytest.mark.asyncio
+    @patch('src.async_client.AsyncWorqhat')
+    async def test_repeat_queries_hit_cache(self, mock_async_worqhat_class):
+        """Test that identical reads only go over the wire once."""
+        client, sdk = make_client(mock_async_worqhat_class)
+
+        first = await client.execute_query("SELECT * FROM users WHERE status = {status}", {"status": "active"})
+        second = await client.execute_query("SELECT *  FROM users WHERE status = {status}", {"status": "active"})
+
+        assert first == second
+        assert sdk.db.execute_query.await_count == 1
+
+    @pytest.mark.asyncio
+    @patch('src.async_client.AsyncWorqhat')
+    async def test_writes_invalidate_affected_table(self, mock_async_worqhat_class):
+        """Test that insert/update invalidate only the table they write to."""
+        client, sdk = make_client(mock_async_worqhat_class)
+
+        await client.execute_query("SELECT * FROM users")
+        await client.execute_query("SELECT * FROM products")
+        await client.insert_record("users", {"name": "John Doe"})
+        await client.execute_query("SELECT * FROM users")
+        await client.execute_query("SELECT * FROM products")
+
+        assert sdk.db.execute_query.await_count == 3
+
+        await client.update_records("products", {"id": "1"}, {"price": 1})
+        await client.execute_query("SELECT * FROM products")
+
+        assert sdk.db.execute_query.await_count == 4
+
+    @pytest.mark.asyncio
+    @patch('src.async_client.AsyncWorqhat')
+    async def test_use_cache_false_bypasses_cache(self, mock_async_worqhat_class):
+        """Test that callers can force a fresh read."""
+        client, sdk = make_client(mock_async_worqhat_class)
+
+        await client.execute_query("SELECT * FROM users")
+        await client.execute_query("SELECT * FROM users", use_cache=False)
+
+        assert sdk.db.execute_query.await_count == 2
+
+    @pytest.mark.asyncio
+    @patch('src.async_client.AsyncWorqhat')
+    async def test_unknown_write_invalidates_everything(self, mock_async_worqhat_class):
+        """Test that a write with no parseable table drops every cached read."""
+        client, sdk = make_client(mock_async_worqhat_class)
+
+        await client.execute_query("SELECT * FROM users")
+        await client.execute_query("TRUNCATE users")
+        await client.execute_query("SELECT * FROM users")
+
+        assert sdk.db.execute_query.await_count == 3
+
+    @pytest.mark.asyncio
+    @patch('src.async_client.AsyncWorqhat')
+    async def test_sync_writes_invalidate_async_cache(self, mock_async_worqhat_class):
+        """Test that writes through the sync client drop cached async reads."""
+        client, sdk = make_client(mock_async_worqhat_class)
+        await client.execute_query("SELECT * FROM users u, orders o WHERE u.id = o.user_id")
+
+        update_records("orders", {"id": "1"}, {"status": "shipped"}, client=MagicMock())
+        await client.execute_query("SELECT * FROM users u, orders o WHERE u.id = o.user_id")
+
+        assert sdk.db.execute_query.await_count == 2
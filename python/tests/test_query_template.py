@@ -0,0 +1,102 @@
+import datetime
+
+import pytest
+
+from src.query_template import QueryTemplate, QueryTemplateError, compile_query
+
+
+class TestQueryTemplate:
+    """Test suite for compiled query templates."""
+
+    def test_named_placeholders_bind_in_order(self):
+        """Test named placeholder parsing and binding."""
+        template = QueryTemplate(
+            "SELECT * FROM users WHERE status = {status} LIMIT {limit}",
+            types={"status": str, "limit": int},
+        )
+
+        bound = template.bind({"limit": 10, "status": "active"})
+
+        assert template.style == "named"
+        assert template.names == ("status", "limit")
+        assert bound.query == "SELECT * FROM users WHERE status = {status} LIMIT {limit}"
+        assert bound.params == {"status": "active", "limit": 10}
+        assert bound.fingerprint == template.fingerprint
+
+    def test_positional_placeholders_bind_list(self):
+        """Test $N placeholders and date coercion."""
+        template = QueryTemplate("SELECT * FROM orders WHERE order_date >= $1 AND region = $2")
+
+        bound = template.bind([datetime.date(2025, 1, 1), "EU"])
+
+        assert template.style == "positional"
+        assert template.arity == 2
+        assert bound.params == ["2025-01-01", "EU"]
+
+    def test_placeholders_inside_literals_are_ignored(self):
+        """Test that braces and $N inside quoted strings are not placeholders."""
+        template = QueryTemplate("SELECT * FROM users WHERE note = '{not_a_param} costs $1' AND id = {id}")
+
+        assert template.names == ("id",)
+
+    def test_fingerprint_ignores_formatting(self):
+        """Test that whitespace differences share one fingerprint."""
+        a = QueryTemplate("SELECT *\n    FROM users\n    WHERE id = {id}")
+        b = QueryTemplate("SELECT * FROM users WHERE id = {id};")
+
+        assert a.fingerprint == b.fingerprint
+
+    def test_fingerprint_keeps_literal_whitespace(self):
+        """Test that templates differing only inside a literal get different fingerprints."""
+        a = QueryTemplate("SELECT * FROM users WHERE name = 'a  b' AND id = {id}")
+        b = QueryTemplate("SELECT * FROM users WHERE name = 'a b' AND id = {id}")
+
+        assert a.fingerprint != b.fingerprint
+        assert a.normalized == "SELECT * FROM users WHERE name = 'a  b' AND id = {id}"
+
+    def test_tables_known_for_comma_joins(self):
+        """Test that templates carry every joined table and whether the list is complete."""
+        template = QueryTemplate("SELECT * FROM users u, orders o WHERE u.id = {id}")
+
+        assert template.tables == frozenset({"users", "orders"})
+        assert template.tables_known is True
+        assert QueryTemplate("TRUNCATE users").tables_known is False
+
+    @pytest.mark.parametrize("text", [
+        "SELECT * FROM users WHERE id = {id} AND status = $1",
+        "SELECT * FROM users WHERE id = $1 AND status = $3",
+    ])
+    def test_malformed_templates_rejected(self, text):
+        """Test mixed styles and gaps in $N numbering."""
+        with pytest.raises(QueryTemplateError):
+            QueryTemplate(text)
+
+    @pytest.mark.parametrize("params, message", [
+        ({"status": "active"}, "Missing params"),
+        ({"status": "active", "limit": 10, "extra": 1}, "Unexpected params"),
+        ({"status": "active", "limit": "10"}, "must be int"),
+        ({"status": "active", "limit": True}, "got bool"),
+        (["active", 10], "expects named params"),
+    ])
+    def test_bad_params_rejected_before_sending(self, params, message):
+        """Test that param mistakes surface locally."""
+        template = QueryTemplate(
+            "SELECT * FROM users WHERE status = {status} LIMIT {limit}",
+            types={"limit": int},
+        )
+
+        with pytest.raises(QueryTemplateError, match=message):
+            template.bind(params)
+
+    def test_untyped_params_must_be_scalars(self):
+        """Test that nested values are rejected without a declared type."""
+        template = QueryTemplate("SELECT * FROM users WHERE id = $1")
+
+        with pytest.raises(QueryTemplateError, match="must be a scalar"):
+            template.bind([{"id": 1}])
+        with pytest.raises(QueryTemplateError, match="expects 1 positional params"):
+            template.bind([1, 2])
+
+    def test_compile_query_caches_templates(self):
+        """Test that compiling the same text twice reuses the parsed template."""
+        assert compile_query("SELECT * FROM users WHERE id = {id}") is compile_query("SELECT * FROM users WHERE id = {id}")
@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.mass_delete import DeleteProgress, MassDeleteError
+from src.retention import RetentionPolicy, RetentionScheduler, parse_window, run_policy
+
+POLICY = RetentionPolicy(
+    table="tasks",
+    timestamp_column="completedAt",
+    max_age=timedelta(days=30),
+    where={"status": "completed"},
+)
+NOW = datetime(2024, 6, 1, 2, 0)
+
+
+def fake_mass_delete(deleted=10, error=None):
+    calls = []
+
+    async def mass_delete(table, where, **kwargs):
+        calls.append(dict(kwargs, table=table, where=where))
+        progress = DeleteProgress(table=table, deleted=deleted, batches=2, seconds=0.5)
+        if error:
+            raise MassDeleteError(error, progress)
+        return progress
+
+    return mass_delete, calls
+
+
+class TestRetention:
+    """Test suite for retention policies and the purge scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_policy_uses_cutoff(self):
+        """Test that a run purges rows older than now - max_age."""
+        mass_delete, calls = fake_mass_delete()
+
+        with patch("src.retention.mass_delete", mass_delete):
+            run = await run_policy(POLICY, now=NOW)
+
+        assert calls[0]["where"] == {"status": "completed"}
+        assert calls[0]["condition"] == '"completedAt" < {cutoff}'
+        assert calls[0]["condition_params"] == {"cutoff": datetime(2024, 5, 2, 2, 0)}
+        assert run.deleted == 10 and run.rows_per_second == 20.0
+
+    @pytest.mark.asyncio
+    async def test_failed_run_keeps_partial_stats(self):
+        """Test that a failing purge records the error and what it managed to delete."""
+        mass_delete, _ = fake_mass_delete(deleted=4, error="Request timed out")
+
+        with patch("src.retention.mass_delete", mass_delete):
+            run = await run_policy(POLICY, now=NOW)
+
+        assert run.error == "Request timed out"
+        assert run.deleted == 4
+
+    def test_window(self):
+        """Test plain and midnight-wrapping off-peak windows."""
+        night = RetentionScheduler([], window=parse_window("22-4"))
+        early = RetentionScheduler([], window=(1, 5))
+
+        assert night.in_window(NOW.replace(hour=23)) and night.in_window(NOW.replace(hour=3))
+        assert not night.in_window(NOW.replace(hour=12))
+        assert early.in_window(NOW) and not early.in_window(NOW.replace(hour=5))
+        with pytest.raises(ValueError):
+            parse_window("2-25")
+
+    @pytest.mark.asyncio
+    async def test_scheduler_runs_due_policies_once_per_period(self):
+        """Test that policies only run inside the window and once per `every`."""
+        mass_delete, calls = fake_mass_delete()
+        scheduler = RetentionScheduler([POLICY], window=(1, 5))
+
+        with patch("src.retention.mass_delete", mass_delete):
+            assert await scheduler.run_once(NOW.replace(hour=12)) == []
+            assert len(await scheduler.run_once(NOW)) == 1
+            assert await scheduler.run_once(NOW + timedelta(hours=1)) == []
+            assert len(await scheduler.run_once(NOW + timedelta(days=1))) == 1
+
+        assert len(calls) == 2
+        assert scheduler.stats()["tasks"]["deleted"] == 20
+        assert scheduler.stats()["tasks"]["runs"] == 2
+
+    @pytest.mark.asyncio
+    async def test_policies_on_one_table_are_tracked_separately(self):
+        """Test that two policies on the same table keep their own last-run times."""
+        mass_delete, calls = fake_mass_delete()
+        failed = RetentionPolicy(
+            table="tasks",
+            timestamp_column="completedAt",
+            max_age=timedelta(days=7),
+            where={"status": "failed"},
+            every=timedelta(hours=1),
+        )
+        scheduler = RetentionScheduler([POLICY, failed], window=(1, 5))
+
+        with patch("src.retention.mass_delete", mass_delete):
+            assert len(await scheduler.run_once(NOW)) == 2
+            assert len(await scheduler.run_once(NOW + timedelta(hours=1))) == 1
+            assert len(await scheduler.run_once(NOW + timedelta(days=1))) == 2
+
+        assert len(calls) == 5
+
+    @pytest.mark.asyncio
+    async def test_failed_purge_is_retried_next_tick(self):
+        """Test that a failed run leaves the policy due instead of waiting a full period."""
+        failing, _ = fake_mass_delete(error="Request timed out")
+        working, calls = fake_mass_delete()
+        scheduler = RetentionScheduler([POLICY], window=(1, 5))
+
+        with patch("src.retention.mass_delete", failing):
+            assert (await scheduler.run_once(NOW))[0].error == "Request timed out"
+        with patch("src.retention.mass_delete", working):
+            assert len(await scheduler.run_once(NOW + timedelta(minutes=1))) == 1
+            assert await scheduler.run_once(NOW + timedelta(minutes=2)) == []
+
+        assert len(calls) == 1
+
+    @patch("src.client_pool.Worqhat")
+    @patch("src.async_client.AsyncWorqhat")
+    def test_runs_route(self, _async_worqhat, _worqhat):
+        """Test the route exposing recent retention runs."""
+        from src.app import app, retention
+
+        client = TestClient(app)
+        response = client.get("/retention/runs")
+
+        assert response.status_code == 200
+        assert response.json()["window"] == list(retention.window)
+        assert response.json()["runs"] == []
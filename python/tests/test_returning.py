@@ -0,0 +1,107 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.query_cache import is_read_query
+from src.returning import (
+    delete_records,
+    delete_records_async,
+    delete_statement,
+    update_records,
+    update_records_async,
+    update_statement,
+)
+
+
+class TestReturning:
+    """Test suite for count-only / IDs-only update and delete modes."""
+
+    def test_update_count_statement(self):
+        """Test that count mode wraps the update so only the count comes back."""
+        template, params = update_statement("users", {"status": "inactive"}, {"status": "active", "updatedBy": "system"}, "count")
+
+        assert template.text == (
+            'WITH _changed AS (UPDATE "users" SET "status" = {set_0}, "updatedBy" = {set_1} '
+            'WHERE "status" = {where_0} RETURNING 1) SELECT COUNT(*) AS count FROM _changed'
+        )
+        assert params == {"set_0": "active", "set_1": "system", "where_0": "inactive"}
+        assert not template.is_read
+        assert "users" in template.tables
+
+    def test_delete_ids_statement(self):
+        """Test IDs mode and NULL handling in where conditions."""
+        template, params = delete_statement("tasks", {"status": "completed", "owner": None}, "ids")
+
+        assert template.text == 'DELETE FROM "tasks" WHERE "status" = {where_0} AND "owner" IS NULL RETURNING "documentId"'
+        assert params == {"where_0": "completed"}
+
+    def test_bad_input_is_rejected(self):
+        """Test identifier validation, empty where and unknown modes."""
+        with pytest.raises(ValueError):
+            delete_statement("tasks; DROP TABLE users", {"a": 1}, "ids")
+        with pytest.raises(ValueError):
+            delete_statement("tasks", {}, "count")
+        with pytest.raises(ValueError):
+            delete_records("tasks", {"a": 1}, returning="everything", client=MagicMock())
+
+    def test_rows_mode_uses_sdk_call(self):
+        """Test that the default mode is the plain SDK update."""
+        client = MagicMock()
+
+        update_records("users", {"id": "1"}, {"name": "x"}, client=client)
+
+        client.db.update_records.assert_called_once_with(table="users", where={"id": "1"}, data={"name": "x"})
+        client.db.execute_query.assert_not_called()
+
+    def test_sync_count_and_ids(self):
+        """Test the summaries built from the query responses."""
+        client = MagicMock()
+        client.db.execute_query.return_value = {"data": [{"count": 120000}]}
+
+        assert update_records("users", {"status": "inactive"}, {"status": "active"}, "count", client=client) == {
+            "success": True, "count": 120000,
+        }
+        assert client.db.execute_query.call_args[1]["params"] == {"set_0": "active", "where_0": "inactive"}
+
+        client.db.execute_query.return_value = {"data": [{"documentId": "a"}, {"documentId": "b"}]}
+        assert delete_records("users", {"status": "inactive"}, "ids", client=client) == {
+            "success": True, "deleted_count": 2, "documentIds": ["a", "b"],
+        }
+        client.db.delete_records.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_async_modes(self):
+        """Test the async helpers route through execute_query for the compact modes."""
+        client = MagicMock()
+        client.execute_query = AsyncMock(return_value={"data": [{"count": 3}]})
+        client.update_records = AsyncMock(return_value={"count": 3, "data": []})
+
+        assert await update_records_async("users", {"a": 1}, {"b": 2}, "count", client=client) == {"success": True, "count": 3}
+        assert await update_records_async("users", {"a": 1}, {"b": 2}, client=client) == {"count": 3, "data": []}
+
+        client.execute_query = AsyncMock(return_value={"data": []})
+        assert await delete_records_async("users", {"a": 1}, "count", client=client) == {"success": True, "deleted_count": 0}
+
+    @pytest.mark.asyncio
+    async def test_delete_condition_goes_out_as_sql(self):
+        """Test that a raw condition narrows the delete, even in rows mode."""
+        client = MagicMock()
+        client.execute_query = AsyncMock(return_value={"data": [{"documentId": "t1"}]})
+        client.delete_records = AsyncMock()
+
+        result = await delete_records_async(
+            "tasks", {"status": "completed"}, client=client,
+            condition='"completedAt" < {cutoff}', condition_params={"cutoff": "2024-05-01"},
+        )
+
+        template, params = client.execute_query.await_args[0]
+        assert template.text == 'DELETE FROM "tasks" WHERE "status" = {where_0} AND ("completedAt" < {cutoff}) RETURNING *'
+        assert params == {"where_0": "completed", "cutoff": "2024-05-01"}
+        assert result == {"success": True, "deleted_count": 1, "data": [{"documentId": "t1"}]}
+        client.delete_records.assert_not_called()
+
+    def test_write_cte_is_not_a_read(self):
+        """Test that data-modifying WITH statements are never cached as reads."""
+        assert is_read_query("WITH t AS (SELECT 1) SELECT * FROM t")
+        assert not is_read_query("WITH t AS (DELETE FROM users RETURNING 1) SELECT COUNT(*) FROM t")
+        assert is_read_query("SELECT * FROM audit WHERE action = 'update'")
@@ -0,0 +1,112 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.nl_cache import CachedNlResult, NlSqlCache, nl_query
+from src.semantic_cache import HashingVectorizer, SemanticIndex
+
+SQL = "SELECT COUNT(*) as count FROM users WHERE status = 'active'"
+
+
+class TestSemanticCache:
+    """Test suite for the near-duplicate question index."""
+
+    def test_vectors_are_normalized(self):
+        """Test that question vectors have unit length and ignore filler words."""
+        vectorizer = HashingVectorizer()
+        vector = vectorizer.transform("How many active users do we have?")
+
+        assert vector @ vector == pytest.approx(1.0)
+        assert vectorizer.transform("how many active users") @ vector == pytest.approx(1.0)
+
+    def test_near_duplicate_hits_and_different_question_misses(self):
+        """Test the threshold separates rephrasings from different questions."""
+        index = SemanticIndex(threshold=0.85, capacity=8)
+        index.add("How many active users do we have?", "users", SQL, "v1")
+
+        sql, similarity = index.lookup("how many users are active right now", "users", "v1")
+
+        assert sql == SQL and similarity >= 0.85
+        assert index.lookup("How many inactive users do we have?", "users", "v1") is None
+        assert index.lookup("how many users are active right now", "orders", "v1") is None
+        assert index.lookup("how many users are active right now", "users", "v2") is None
+
+    def test_added_filter_word_misses(self):
+        """Test that a question narrowed by an extra word never reuses the broader SQL."""
+        index = SemanticIndex(threshold=0.85, capacity=8)
+        index.add("How many active users do we have?", "users", SQL, "v1")
+
+        assert index.lookup("How many active users do we have in Germany?", "users", "v1") is None
+        assert index.lookup("How many users do we have?", "users", "v1") is None
+        assert index.lookup("how many users are active right now", "users", "v1") is not None
+
+    def test_numbers_must_match(self):
+        """Test that questions differing only in a number never share SQL."""
+        index = SemanticIndex(threshold=0.5, capacity=8)
+        index.add("Top 3 product categories by revenue", "sales", "SELECT ... LIMIT 3", "v1")
+
+        assert index.lookup("Top 5 product categories by revenue", "sales", "v1") is None
+        assert index.lookup("top 3 categories of product by revenue", "sales", "v1") is not None
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test the index stays bounded and keeps recently used entries."""
+        index = SemanticIndex(threshold=0.9, capacity=2)
+        index.add("active users count", "users", "SQL A", "v1")
+        index.add("orders shipped yesterday", "orders", "SQL B", "v1")
+        index.lookup("active users count", "users", "v1")
+
+        index.add("revenue by region", "sales", "SQL C", "v1")
+
+        assert len(index) == 2
+        assert index.lookup("active users count", "users", "v1") is not None
+        assert index.lookup("orders shipped yesterday", "orders", "v1") is None
+
+    def test_nl_query_reuses_sql_for_rephrased_question(self):
+        """Test that a rephrased question skips process_nl_query entirely."""
+        client = MagicMock()
+        client.db.process_nl_query.return_value = {"data": [{"count": 157}], "sql": SQL}
+        client.db.execute_query.return_value = {"data": [{"count": 157}]}
+        cache = NlSqlCache(semantic=SemanticIndex(capacity=8))
+
+        nl_query("How many active users do we have?", "users", client=client, cache=cache)
+        result = nl_query("how many users are active right now", "users", client=client, cache=cache)
+
+        assert isinstance(result, CachedNlResult) and result.sql == SQL
+        assert client.db.process_nl_query.call_count == 1
+
+    def test_failed_replay_drops_near_duplicates(self):
+        """Test that SQL failing on replay is dropped for every question mapped to it."""
+        cache = NlSqlCache(semantic=SemanticIndex(capacity=8))
+        cache.put("How many active users do we have?", "users", SQL, "v1")
+
+        cache.discard("how many users are active right now", "users", SQL)
+
+        assert cache.get("How many active users do we have?", "users", "v1") is None
+        assert cache.get("how many users are active", "users", "v1") is None
+
+    def test_time_words_must_match(self):
+        """Test that questions about different periods never share SQL, however similar."""
+        index = SemanticIndex(threshold=0.5, capacity=8)
+        index.add("What was our revenue last quarter?", "sales", "SELECT ... last quarter", "v1")
+
+        assert index.lookup("What was our revenue this quarter?", "sales", "v1") is None
+        assert index.lookup("what was revenue last quarter", "sales", "v1") is not None
+
+    def test_semantic_hit_respects_ttl(self):
+        """Test that a near-duplicate isn't served once the exact entry has expired."""
+        now = [0.0]
+        cache = NlSqlCache(ttl=60, clock=lambda: now[0], semantic=SemanticIndex(capacity=8))
+        cache.put("How many active users do we have?", "users", SQL, "v1")
+
+        assert cache.get("how many users are active right now", "users", "v1") == SQL
+        now[0] = 61
+        assert cache.get("how many users are active right now", "users", "v1") is None
+
+    def test_semantic_entries_follow_exact_eviction(self):
+        """Test that entries evicted from the exact cache are no longer served semantically."""
+        cache = NlSqlCache(max_entries=1, semantic=SemanticIndex(capacity=8))
+        cache.put("How many active users do we have?", "users", SQL, "v1")
+        cache.put("Orders shipped yesterday", "orders", "SELECT ... shipped", "v1")
+
+        assert len(cache.semantic) == 1
+        assert cache.get("how many users are active right now", "users", "v1") is None
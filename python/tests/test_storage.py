@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import MagicMock, patch, mock_open
 import os
-from endpoints.storage import upload_document, upload_invoice, fetch_file_by_id, fetch_file_by_path, delete_file_by_id
+from src.endpoints.storage import upload_document, upload_invoice, fetch_file_by_id, fetch_file_by_path, delete_file_by_id
 
 
 class TestStorage:
@@ -11,7 +11,7 @@ class TestStorage:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.storage.Worqhat')
+    @patch('src.client_pool.Worqhat')
     @patch('builtins.open', new_callable=mock_open, read_data=b"fake file content")
     def test_upload_document_success(self, mock_file_open, mock_worqhat_class):
         """Test successful document upload."""
@@ -41,7 +41,7 @@ class TestStorage:
         # Verify the call was made with correct parameters
         mock_worqhat_class.assert_called_once_with(
             api_key="test-api-key",
-            environment="test"
+            base_url=None
         )
 
         mock_client.storage.upload_file.assert_called_once()
@@ -54,7 +54,7 @@ class TestStorage:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.storage.Worqhat')
+    @patch('src.client_pool.Worqhat')
     @patch('builtins.open', new_callable=mock_open, read_data=b"fake invoice content")
     def test_upload_invoice_success(self, mock_file_open, mock_worqhat_class):
         """Test successful invoice upload to organized path."""
@@ -92,7 +92,7 @@ class TestStorage:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.storage.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_fetch_file_by_id_success(self, mock_worqhat_class):
         """Test successful file retrieval by ID."""
         mock_client = MagicMock()
@@ -118,7 +118,7 @@ class TestStorage:
         # Verify the call was made with correct parameters
         mock_worqhat_class.assert_called_once_with(
             api_key="test-api-key",
-            environment="test"
+            base_url=None
         )
 
         mock_client.storage.retrieve_file_by_id.assert_called_once_with("a1b2c3d4-e5f6-7890-abcd-ef1234567890")
@@ -126,7 +126,7 @@ class TestStorage:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.storage.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_fetch_file_by_id_file_not_found_error(self, mock_worqhat_class):
         """Test file not found error handling."""
         mock_client = MagicMock()
@@ -139,7 +139,7 @@ class TestStorage:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.storage.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_fetch_file_by_id_api_error_handling(self, mock_worqhat_class):
         """Test API error handling in fetch_file_by_id."""
         mock_client = MagicMock()
@@ -153,7 +153,7 @@ class TestStorage:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.storage.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_fetch_file_by_path_success(self, mock_worqhat_class):
         """Test successful file retrieval by path."""
         mock_client = MagicMock()
@@ -179,7 +179,7 @@ class TestStorage:
         # Verify the call was made with correct parameters
         mock_worqhat_class.assert_called_once_with(
             api_key="test-api-key",
-            environment="test"
+            base_url=None
         )
 
         mock_client.storage.retrieve_file_by_path.assert_called_once_with(filepath="documents/invoices/invoice_2025.pdf")
@@ -187,7 +187,7 @@ class TestStorage:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.storage.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_fetch_file_by_path_file_not_found_error(self, mock_worqhat_class):
         """Test file not found error handling."""
         mock_client = MagicMock()
@@ -200,7 +200,7 @@ class TestStorage:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.storage.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_fetch_file_by_path_api_error_handling(self, mock_worqhat_class):
         """Test API error handling in fetch_file_by_path."""
         mock_client = MagicMock()
@@ -214,7 +214,7 @@ class TestStorage:
         "WORQHAT_API_KEY": "test-api-key",
         "WORQHAT_ENVIRONMENT": "test"
     })
-    @patch('endpoints.storage.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_delete_file_by_id_success(self, mock_worqhat_class):
         """Test successful file deletion by ID."""
         mock_client = MagicMock()
@@ -233,7 +233,7 @@ class TestStorage:
         # Verify the call was made with correct parameters
         mock_worqhat_class.assert_called_once_with(
             api_key="test-api-key",
-            environment="test"
+            base_url=None
         )
 
         mock_client.storage.delete_file_by_id.assert_called_once_with("a1b2c3d4-e5f6-7890-abcd-ef1234567890")
@@ -241,7 +241,7 @@ class TestStorage:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.storage.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_delete_file_by_id_file_not_found_error(self, mock_worqhat_class):
         """Test file not found error handling."""
         mock_client = MagicMock()
@@ -254,7 +254,7 @@ class TestStorage:
     @patch.dict(os.environ, {
         "WORQHAT_API_KEY": "test-api-key"
     })
-    @patch('endpoints.storage.Worqhat')
+    @patch('src.client_pool.Worqhat')
     def test_delete_file_by_id_api_error_handling(self, mock_worqhat_class):
         """Test API error handling in delete_file_by_id."""
         mock_client = MagicMock()
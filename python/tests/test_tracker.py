@@ -0,0 +1,194 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from src.async_client import close_async_clients, get_async_client
+
+from src.tracker import COMPLETED, FAILED, IN_PROGRESS, TIMED_OUT, WorkflowTracker, metrics_status_fetcher
+
+
+class FakeStatuses:
+    """Status source that records each batch it is asked about."""
+
+    def __init__(self):
+        self.statuses = {}
+        self.batches = []
+
+    async def __call__(self, runs):
+        self.batches.append([run.analytics_id for run in runs])
+        return {run.analytics_id: {"id": run.analytics_id, "status": self.statuses[run.analytics_id]}
+                for run in runs if run.analytics_id in self.statuses}
+
+
+class TestWorkflowTracker:
+    """Test suite for the batched analytics_id status tracker."""
+
+    def tracker(self, **kwargs):
+        now = [0.0]
+        fetch = FakeStatuses()
+        tracker = WorkflowTracker(fetch=fetch, initial_interval=1, max_interval=8, clock=lambda: now[0], **kwargs)
+        return tracker, fetch, now
+
+    @pytest.mark.asyncio
+    async def test_due_runs_are_polled_in_one_batch(self):
+        """Test that every due run is looked up with a single status call."""
+        tracker, fetch, now = self.tracker()
+        for n in range(3):
+            tracker.track(f"wf-{n}")
+
+        assert await tracker.poll_once() == 0
+        now[0] = 1
+        assert await tracker.poll_once() == 3
+
+        assert fetch.batches == [["wf-0", "wf-1", "wf-2"]]
+        assert tracker.status_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_batches_are_capped(self):
+        """Test that due runs are split into batches of batch_size."""
+        tracker, fetch, now = self.tracker(batch_size=2)
+        for n in range(5):
+            tracker.track(f"wf-{n}")
+        now[0] = 1
+
+        await tracker.poll_once()
+
+        assert [len(batch) for batch in fetch.batches] == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_poll_interval_backs_off(self):
+        """Test that unfinished runs are polled less and less often, up to max_interval."""
+        tracker, fetch, now = self.tracker()
+        run = tracker.track("wf-1")
+        intervals = []
+        for _ in range(5):
+            now[0] = run.next_poll_at
+            before = now[0]
+            await tracker.poll_once()
+            intervals.append(run.next_poll_at - before)
+
+        assert intervals == [2, 4, 8, 8, 8]
+        assert run.status == IN_PROGRESS and run.polls == 5
+
+    @pytest.mark.asyncio
+    async def test_completion_resolves_waiters_and_callbacks(self):
+        """Test that a finished run wakes awaiting callers and runs its callbacks once."""
+        tracker, fetch, now = self.tracker()
+        seen = []
+        tracker.track("wf-1", callback=lambda run: seen.append(run.status))
+        waiter = asyncio.ensure_future(tracker.wait("wf-1"))
+        await asyncio.sleep(0)
+
+        fetch.statuses["wf-1"] = FAILED
+        now[0] = 1
+        await tracker.poll_once()
+        run = await waiter
+
+        assert run.status == FAILED and run.details["status"] == FAILED
+        assert seen == [FAILED]
+        assert not tracker.resolve("wf-1", COMPLETED)
+
+    @pytest.mark.asyncio
+    async def test_async_callback_and_late_registration(self):
+        """Test that coroutine callbacks run, and callbacks added after completion fire at once."""
+        tracker, fetch, now = self.tracker()
+        seen = []
+
+        async def notify(run):
+            seen.append(("async", run.analytics_id))
+
+        tracker.track("wf-1", callback=notify)
+        tracker.resolve("wf-1", COMPLETED)
+        tracker.add_callback("wf-1", lambda run: seen.append(("late", run.analytics_id)))
+        await asyncio.sleep(0)
+
+        assert sorted(seen) == [("async", "wf-1"), ("late", "wf-1")]
+
+    @pytest.mark.asyncio
+    async def test_runs_time_out(self):
+        """Test that a run past its deadline ends as timed_out without another lookup."""
+        tracker, fetch, now = self.tracker(timeout=5)
+        run = tracker.track("wf-1")
+        now[0] = 6
+
+        await tracker.poll_once()
+
+        assert run.status == TIMED_OUT
+        assert fetch.batches == []
+
+    @pytest.mark.asyncio
+    async def test_wait_timeout(self):
+        """Test that wait() gives up after its timeout while tracking continues."""
+        tracker, _, _ = self.tracker()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await tracker.wait("wf-1", timeout=0.01)
+
+        assert tracker.get("wf-1").status == IN_PROGRESS
+
+    @pytest.mark.asyncio
+    async def test_metrics_status_fetcher(self):
+        """Test that the default source maps the metrics workflow list by id."""
+        client = MagicMock()
+        client.get_metrics = AsyncMock(return_value={"workflows": [
+            {"id": "wf-1", "status": "completed"},
+            {"id": "wf-other", "status": "failed"},
+        ]})
+        tracker = WorkflowTracker(fetch=metrics_status_fetcher(client), initial_interval=0)
+        tracker.track("wf-1")
+        tracker.track("wf-2")
+
+        await tracker.poll_once()
+
+        assert tracker.get("wf-1").status == COMPLETED
+        assert tracker.get("wf-2").status == IN_PROGRESS
+        client.get_metrics.assert_awaited_once()
+        assert "start_date" in client.get_metrics.await_args.kwargs
+
+    @pytest.mark.asyncio
+    async def test_metrics_status_fetcher_uses_sdk_flows(self):
+        """Test that the default source calls flows.get_metrics with arguments the real SDK accepts."""
+        from worqhat.resources.flows import AsyncFlowsResource
+
+        client = get_async_client(api_key="test-api-key")
+        with patch.object(AsyncFlowsResource, "get_metrics", autospec=True,
+                          return_value={"workflows": [{"id": "wf-1", "status": "completed"}]}) as get_metrics:
+            tracker = WorkflowTracker(fetch=metrics_status_fetcher(client), initial_interval=0)
+            tracker.track("wf-1")
+            await tracker.poll_once()
+
+        assert tracker.get("wf-1").status == COMPLETED
+        get_metrics.assert_awaited_once()
+        await close_async_clients()
+
+    @patch("src.async_client.AsyncWorqhat")
+    @patch("src.client_pool.Worqhat")
+    def test_track_route_only_looks_up_tracked_runs(self, _mock_worqhat_class, _mock_async_worqhat_class):
+        """Test that unknown ids get a 404 without being registered, and wait is clamped."""
+        from src import app as app_module
+
+        async def scenario():
+            app_module.tracker.track("wf-known")
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app_module.app)) as http:
+                unknown = await http.get("http://app/flows/track/wf-unknown")
+                with patch.object(app_module, "MAX_TRACK_WAIT", 0.01):
+                    known = await http.get("http://app/flows/track/wf-known?wait=3600")
+            return unknown, known
+
+        unknown, known = asyncio.run(scenario())
+
+        assert unknown.status_code == 404
+        assert app_module.tracker.get("wf-unknown") is None
+        assert known.status_code == 200 and known.json()["status"] == IN_PROGRESS
+
+    def test_finished_runs_are_bounded(self):
+        """Test that only the last keep_finished finished runs are kept."""
+        tracker, _, _ = self.tracker(keep_finished=2)
+        for n in range(3):
+            tracker.track(f"wf-{n}")
+            tracker.resolve(f"wf-{n}", COMPLETED)
+
+        assert tracker.get("wf-0") is None
+        assert tracker.get("wf-2").status == COMPLETED
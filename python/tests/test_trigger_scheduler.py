@@ -0,0 +1,221 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.trigger_scheduler import PriorityClient, TriggerScheduler, priority_of
+
+
+class GatedClient:
+    """Async client double whose triggers finish only when released, recording start order."""
+
+    def __init__(self):
+        self.started = []
+        self.gates = []
+
+    async def trigger_with_payload(self, workflow_id, body):
+        gate = asyncio.Event()
+        self.started.append((workflow_id, body.get("n")))
+        self.gates.append(gate)
+        await gate.wait()
+        return {"analytics_id": f"{workflow_id}-{body.get('n')}"}
+
+    async def release_all(self):
+        # Release one at a time so each completion dispatches the next trigger
+        while True:
+            for _ in range(5):
+                await asyncio.sleep(0)
+            waiting = [gate for gate in self.gates if not gate.is_set()]
+            if not waiting:
+                return
+            waiting[0].set()
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+class TestTriggerScheduler:
+    """Test suite for the priority-aware workflow trigger scheduler."""
+
+    def test_priority_of_payload(self):
+        """Test that the payload's priority field picks the class when it names one."""
+        assert priority_of({"priority": "high"}) == "high"
+        assert priority_of({"priority": "urgent"}) == "normal"
+        assert priority_of({}, default="low") == "low"
+
+    @pytest.mark.asyncio
+    async def test_high_priority_goes_before_queued_low(self):
+        """Test that a high-priority trigger overtakes low-priority ones queued before it."""
+        client = GatedClient()
+        scheduler = TriggerScheduler(client=client, concurrency=1)
+
+        futures = [scheduler.submit("analysis", {"n": n}, "low") for n in range(3)]
+        futures.append(scheduler.submit("onboarding", {"n": 0}, "high"))
+        await client.release_all()
+        await asyncio.gather(*futures)
+
+        assert client.started == [("analysis", 0), ("onboarding", 0), ("analysis", 1), ("analysis", 2)]
+        assert scheduler.stats()["started"] == {"high": 1, "normal": 0, "low": 3}
+
+    @pytest.mark.asyncio
+    async def test_fair_queuing_between_workflows(self):
+        """Test that workflows in one class alternate instead of draining the first backlog."""
+        client = GatedClient()
+        scheduler = TriggerScheduler(client=client, concurrency=1)
+
+        futures = [scheduler.submit("bulk", {"n": n}) for n in range(4)]
+        futures += [scheduler.submit("orders", {"n": n}) for n in range(2)]
+        await client.release_all()
+        await asyncio.gather(*futures)
+
+        assert [workflow_id for workflow_id, _ in client.started] == ["bulk", "orders", "bulk", "orders", "bulk", "bulk"]
+
+    @pytest.mark.asyncio
+    async def test_idle_workflows_are_forgotten(self):
+        """Test that finish tags are dropped once a workflow has nothing queued or in flight."""
+        client = GatedClient()
+        scheduler = TriggerScheduler(client=client, concurrency=1)
+
+        futures = [scheduler.submit(f"workflow-{n}", {"n": n}, "low") for n in range(5)]
+        futures.append(scheduler.submit("orders", {"n": 0}))
+        futures[-2].cancel()
+        await client.release_all()
+        await asyncio.gather(*futures, return_exceptions=True)
+
+        assert scheduler._last_finish == {}
+        # A workflow coming back after going idle still gets its turn
+        futures = [scheduler.submit("bulk", {"n": n}) for n in range(2)] + [scheduler.submit("orders", {"n": 1})]
+        assert ("normal", "orders") in scheduler._last_finish
+        await client.release_all()
+        await asyncio.gather(*futures)
+        assert scheduler._last_finish == {}
+
+    @pytest.mark.asyncio
+    async def test_weights_share_capacity(self):
+        """Test that a workflow with twice the weight gets two turns for each of another's."""
+        client = GatedClient()
+        scheduler = TriggerScheduler(client=client, concurrency=1, weights={"orders": 2})
+
+        futures = [scheduler.submit("bulk", {"n": n}) for n in range(3)]
+        futures += [scheduler.submit("orders", {"n": n}) for n in range(4)]
+        await client.release_all()
+        await asyncio.gather(*futures)
+
+        # bulk's first trigger went out before orders queued; after that orders gets two turns per bulk turn
+        assert [workflow_id for workflow_id, _ in client.started] == [
+            "bulk", "orders", "orders", "orders", "bulk", "orders", "bulk"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_per_workflow_cap(self):
+        """Test that a workflow never has more than its max_in_flight triggers running."""
+        client = GatedClient()
+        scheduler = TriggerScheduler(client=client, concurrency=4, max_in_flight={"analysis": 1})
+
+        futures = [scheduler.submit("analysis", {"n": n}, "low") for n in range(3)]
+        futures.append(scheduler.submit("onboarding", {"n": 0}, "high"))
+        await asyncio.sleep(0)
+
+        assert scheduler.stats()["in_flight"] == {"analysis": 1, "onboarding": 1}
+        assert scheduler.stats()["queued"]["low"] == 2
+        await client.release_all()
+        assert [future.result()["analytics_id"] for future in futures] == [
+            "analysis-0", "analysis-1", "analysis-2", "onboarding-0"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_overdue_trigger_is_not_starved(self):
+        """Test that a low-priority trigger waiting past max_wait goes before newer high ones."""
+        now = [0.0]
+        client = GatedClient()
+        scheduler = TriggerScheduler(client=client, concurrency=1, max_wait=10, clock=lambda: now[0])
+
+        futures = [scheduler.submit("onboarding", {"n": 0}, "high"), scheduler.submit("analysis", {"n": 0}, "low")]
+        now[0] = 11
+        futures.append(scheduler.submit("onboarding", {"n": 1}, "high"))
+        await client.release_all()
+        await asyncio.gather(*futures)
+
+        assert client.started == [("onboarding", 0), ("analysis", 0), ("onboarding", 1)]
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_halves_capacity(self):
+        """Test that a 429 halves capacity and successes grow it back."""
+        client = MagicMock()
+        client.trigger_with_payload = AsyncMock(side_effect=RateLimited("Too many requests"))
+        scheduler = TriggerScheduler(client=client, concurrency=8)
+
+        with pytest.raises(RateLimited):
+            await scheduler.trigger("analysis", {"n": 0})
+        assert scheduler.capacity == 4
+        assert scheduler.throttled == 1
+
+        client.trigger_with_payload = AsyncMock(return_value={"analytics_id": "wf-1"})
+        for _ in range(4):
+            await scheduler.trigger("analysis", {"n": 0})
+        assert scheduler.capacity == 4
+        for _ in range(20):
+            await scheduler.trigger("analysis", {"n": 0})
+        assert scheduler.capacity == 8
+
+    @pytest.mark.asyncio
+    async def test_file_triggers_use_trigger_with_file(self):
+        """Test that file triggers are sent with trigger_with_file and take the payload's priority."""
+        client = MagicMock()
+        client.trigger_with_file = AsyncMock(return_value={"analytics_id": "wf-file"})
+        scheduler = TriggerScheduler(client=client)
+
+        response = await scheduler.trigger_with_file("documents", {"url": "https://x", "priority": "high"})
+
+        assert response == {"analytics_id": "wf-file"}
+        client.trigger_with_file.assert_awaited_once_with("documents", {"url": "https://x", "priority": "high"})
+        assert scheduler.stats()["started"]["high"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_trigger_is_skipped(self):
+        """Test that a trigger cancelled while queued is never sent."""
+        client = GatedClient()
+        scheduler = TriggerScheduler(client=client, concurrency=1)
+
+        first = scheduler.submit("analysis", {"n": 0})
+        second = scheduler.submit("analysis", {"n": 1})
+        second.cancel()
+        await client.release_all()
+        await first
+
+        assert client.started == [("analysis", 0)]
+        assert scheduler.stats()["queued"] == {"high": 0, "normal": 0, "low": 0}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_run_cancels_future_and_frees_slot(self):
+        """Test that cancelling an in-flight trigger's task cancels its future and releases capacity."""
+        client = GatedClient()
+        scheduler = TriggerScheduler(client=client, concurrency=1)
+
+        first = scheduler.submit("analysis", {"n": 0})
+        second = scheduler.submit("analysis", {"n": 1})
+        await asyncio.sleep(0)
+        for task in list(scheduler._running):
+            task.cancel()
+        await asyncio.sleep(0)
+
+        assert first.cancelled()
+        await client.release_all()
+        assert (await second)["analytics_id"] == "analysis-1"
+        assert client.started == [("analysis", 0), ("analysis", 1)]
+        assert scheduler.stats()["in_flight"] == {}
+
+    @pytest.mark.asyncio
+    async def test_priority_client_pins_class(self):
+        """Test that the priority view submits every trigger in its class, whatever the payload says."""
+        client = MagicMock()
+        client.trigger_with_payload = AsyncMock(return_value={"analytics_id": "wf-1"})
+        scheduler = TriggerScheduler(client=client)
+        low = scheduler.with_priority("low")
+
+        assert isinstance(low, PriorityClient)
+        assert await low.trigger_with_payload("bulk", {"priority": "high"}) == {"analytics_id": "wf-1"}
+        assert scheduler.stats()["started"] == {"high": 0, "normal": 0, "low": 1}
+        with pytest.raises(ValueError):
+            scheduler.with_priority("urgent")
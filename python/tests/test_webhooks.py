@@ -0,0 +1,109 @@
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from src.tracker import COMPLETED, FAILED, WorkflowTracker
+from src.webhooks import (
+    SIGNATURE_HEADER,
+    TIMESTAMP_HEADER,
+    InvalidCallbackError,
+    WebhookVerificationError,
+    handle_completion,
+    post_sample_callbacks,
+    sample_completion,
+    sign,
+    verify_signature,
+)
+
+SECRET = "test-secret"
+
+
+def signed(body: bytes, timestamp=None):
+    timestamp = timestamp or str(int(time.time()))
+    return {SIGNATURE_HEADER: sign(body, SECRET, timestamp), TIMESTAMP_HEADER: timestamp}
+
+
+class TestWebhooks:
+    """Test suite for workflow-completion webhooks."""
+
+    def test_verify_signature(self):
+        """Test that only a matching, recent signature is accepted."""
+        body = b'{"analytics_id": "wf-1"}'
+        headers = signed(body, "1000")
+
+        verify_signature(body, SECRET, headers[SIGNATURE_HEADER], "1000", now=1100)
+        with pytest.raises(WebhookVerificationError, match="mismatch"):
+            verify_signature(body + b" ", SECRET, headers[SIGNATURE_HEADER], "1000", now=1100)
+        with pytest.raises(WebhookVerificationError, match="window"):
+            verify_signature(body, SECRET, headers[SIGNATURE_HEADER], "1000", now=2000)
+        with pytest.raises(WebhookVerificationError, match="Missing"):
+            verify_signature(body, SECRET, None, "1000", now=1100)
+
+    def test_handle_completion_resolves_tracked_run(self):
+        """Test that a verified callback settles the run with its details."""
+        tracker = WorkflowTracker(fetch=AsyncMock(), poll=False)
+        tracker.track("wf-1")
+        body = json.dumps(sample_completion("wf-1", "failed")).encode()
+
+        assert handle_completion(body, signed(body), SECRET, tracker)
+
+        run = tracker.get("wf-1")
+        assert run.status == FAILED and run.details["error"] == "Sample failure"
+        assert not handle_completion(body, signed(body), SECRET, tracker)
+
+    def test_handle_completion_before_tracking(self):
+        """Test that a push arriving before anyone waits is kept for later waiters."""
+        tracker = WorkflowTracker(fetch=AsyncMock(), poll=False)
+        body = json.dumps(sample_completion("wf-early")).encode()
+
+        handle_completion(body, signed(body), SECRET, tracker)
+
+        assert asyncio.run(tracker.wait("wf-early", timeout=0.01)).status == COMPLETED
+
+    def test_invalid_body(self):
+        """Test that a verified body with an unknown status is rejected."""
+        tracker = WorkflowTracker(fetch=AsyncMock(), poll=False)
+        body = json.dumps({"analytics_id": "wf-1", "status": "exploded"}).encode()
+
+        with pytest.raises(InvalidCallbackError):
+            handle_completion(body, signed(body), SECRET, tracker)
+
+    @pytest.mark.asyncio
+    async def test_no_polling_without_fetch(self):
+        """Test that a push-only tracker never calls its status source."""
+        fetch = AsyncMock()
+        tracker = WorkflowTracker(fetch=fetch, poll=False, initial_interval=0)
+        tracker.track("wf-1")
+
+        assert await tracker.poll_once() == 0
+        fetch.assert_not_awaited()
+
+    @patch.dict("os.environ", {"WORQHAT_WEBHOOK_SECRET": SECRET})
+    @patch("src.async_client.AsyncWorqhat")
+    @patch("src.client_pool.Worqhat")
+    def test_route_wakes_waiter_via_local_stand_in(self, _mock_worqhat_class, _mock_async_worqhat_class):
+        """Test that sample callbacks posted to the route resolve an in-process waiter."""
+        from src.app import app, tracker
+
+        async def scenario():
+            waiter = asyncio.ensure_future(tracker.wait("wf-push", timeout=5))
+            await asyncio.sleep(0)
+            transport = httpx.ASGITransport(app=app)
+            codes = await post_sample_callbacks(
+                ["wf-push"], SECRET, url="http://app/webhooks/workflow-complete", transport=transport
+            )
+            async with httpx.AsyncClient(transport=transport) as http:
+                bad = await http.post(
+                    "http://app/webhooks/workflow-complete", content=b"{}", headers={TIMESTAMP_HEADER: "1"}
+                )
+            return codes, bad.status_code, await waiter
+
+        codes, bad_code, run = asyncio.run(scenario())
+
+        assert codes == [200]
+        assert bad_code == 401
+        assert run.status == COMPLETED and run.details["output"] == {"message": "Sample output"}